@@ -0,0 +1,141 @@
+"""
+Semantic answer cache
+======================
+Answers are cached per scope - (video_id, index parameters, embedding
+model, LLM model, temperature, retrieval mode, index type, context token
+budget) - and matched first by a hash of the
+normalized question, then by embedding similarity so paraphrases of a
+question already answered for the same video are served without an LLM call.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_SIMILARITY_THRESHOLD = float(os.getenv("YT_RAG_ANSWER_CACHE_THRESHOLD", "0.92"))
+DEFAULT_TTL_SECONDS = float(os.getenv("YT_RAG_ANSWER_CACHE_TTL_HOURS", "24")) * 3600
+DEFAULT_MAX_ENTRIES = int(os.getenv("YT_RAG_ANSWER_CACHE_MAX_ENTRIES", "2000"))
+
+
+def make_answer_scope(video_id, chunk_size, chunk_overlap, embedding_model, model_name, temperature,
+                      retrieval_mode="dense", index_type="auto", max_context_tokens=None):
+    """Build the cache scope string for one video + index + LLM configuration"""
+    return json.dumps(
+        [video_id, chunk_size, chunk_overlap, embedding_model, model_name, round(float(temperature), 3),
+         retrieval_mode, index_type, max_context_tokens],
+        separators=(",", ":")
+    )
+
+
+def normalize_question(question):
+    """Lower-case, collapse whitespace and drop trailing punctuation"""
+    question = re.sub(r"\s+", " ", question.strip().lower())
+    return question.rstrip(" ?!.")
+
+
+class SemanticAnswerCache:
+    """
+    TTL + LRU answer cache with exact and embedding-similarity matching
+    A similarity_threshold above 1.0 disables paraphrase matching
+    """
+
+    def __init__(self, embeddings, similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD,
+                 ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # (scope, question hash) -> (created_at, answer, unit vector)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'exact_hits': 0, 'semantic_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def _embed(self, question):
+        vector = np.asarray(self.embeddings.embed_query(question), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _expired(self, created_at):
+        return time.time() - created_at >= self.ttl_seconds
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def lookup(self, scope, question):
+        """
+        Find a cached answer for question within scope
+        Returns: (answer, match_type, similarity) or None, match_type is 'exact' or 'semantic'
+        """
+        normalized = normalize_question(question)
+        key = (scope, hashlib.sha256(normalized.encode("utf-8")).hexdigest())
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._counters['exact_hits'] += 1
+                return entry[1], 'exact', 1.0
+            candidates = [
+                (k, e) for k, e in self._entries.items()
+                if k[0] == scope and not self._expired(e[0])
+            ]
+
+        if not candidates or self.similarity_threshold > 1.0:
+            self._count('misses')
+            return None
+
+        # Paraphrase match: cosine similarity against this scope's questions
+        vector = self._embed(normalized)
+        similarities = np.stack([e[2] for _, e in candidates]) @ vector
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+        if similarity < self.similarity_threshold:
+            self._count('misses')
+            return None
+
+        best_key, best_entry = candidates[best]
+        with self._lock:
+            if best_key in self._entries:
+                self._entries.move_to_end(best_key)
+            self._counters['semantic_hits'] += 1
+        return best_entry[1], 'semantic', similarity
+
+    def store(self, scope, question, answer):
+        """Cache a freshly generated answer"""
+        normalized = normalize_question(question)
+        key = (scope, hashlib.sha256(normalized.encode("utf-8")).hexdigest())
+        vector = self._embed(normalized)
+
+        with self._lock:
+            self._entries[key] = (time.time(), answer, vector)
+            self._entries.move_to_end(key)
+            self._counters['stores'] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def invalidate(self, scope):
+        """Drop every answer cached for a scope"""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == scope]:
+                del self._entries[key]
+
+    def stats(self):
+        """Return hit/miss counters, hit rate and entry count"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+        hits = stats['exact_hits'] + stats['semantic_hits']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = hits / lookups if lookups else 0.0
+        return stats
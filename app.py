@@ -11,8 +11,29 @@ SETUP INSTRUCTIONS:
 """
 
 import streamlit as st
+import os
+import re
+import statistics
 import time
-from youtube_processor import process_video, extract_video_id_from_url
+from youtube_processor import (
+    extract_video_id_from_url,
+    stream_answer,
+    answer_questions,
+    DEFAULT_MAX_CONCURRENCY,
+    warm_up_embedding_model,
+    get_embedding_model_stats,
+    get_job_manager,
+    submit_process_video,
+    get_speculator,
+    speculate_answers,
+    DEFAULT_RETRIEVAL_MODE,
+    DEFAULT_PRECOMPUTE_SUMMARY,
+    RETRIEVAL_MODES,
+)
+from job_queue import CANCELLED, DONE, FAILED, JobQueueFull
+from progressive_index import DEFAULT_PROGRESSIVE_INGEST
+from speculative import DEFAULT_SPECULATIVE_ANSWERS
+from summary_tree import format_time, summary_answer
 
 # ============================================================================
 # CONFIGURATION
@@ -23,6 +44,23 @@ DEVELOPER_TITLE = "Computer Science Graduate"
 GITHUB_URL = "https://github.com/AUSAF-AHMAD-ANSARI"
 LINKEDIN_URL = "https://www.linkedin.com/in/ausafahmadansari/"
 
+# Quick action buttons: (label, question, precomputed summary kind or None)
+QUICK_ACTIONS = [
+    ("📝 Complete Summary", "Provide a comprehensive and detailed summary of this video, covering all major points",
+     "summary"),
+    ("🔑 Key Insights", "What are the most important key takeaways and insights from this video?", "insights"),
+    ("👤 Speaker Analysis", "Who is the speaker and what are the main topics they discuss in this video?", None),
+    ("💡 Core Concepts", "What are the fundamental concepts and main ideas presented in this video?", None),
+]
+
+# Seconds between status checks of a background processing job
+JOB_POLL_SECONDS = 0.5
+
+# Chat turns shown at once; older ones are loaded a page at a time
+CHAT_PAGE_SIZE = int(os.getenv("YT_RAG_CHAT_PAGE_SIZE", "10"))
+# Chat render times kept for the median shown under the chat
+CHAT_RENDER_SAMPLES = 50
+
 # ============================================================================
 # PAGE SETUP
 # ============================================================================
@@ -34,11 +72,17 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Start loading the embedding model in the background (once per process)
+# so the first "Process Video" click doesn't pay for the model load;
+# BM25-only deployments never need it
+if DEFAULT_RETRIEVAL_MODE != "bm25":
+    warm_up_embedding_model()
+
 # ============================================================================
 # ADVANCED STYLING
 # ============================================================================
 
-st.markdown("""
+APP_STYLESHEET = """
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
     
@@ -271,7 +315,7 @@ st.markdown("""
     }
     
     /* Chat Messages */
-    .chat-message {
+    [data-testid="stChatMessage"] {
         padding: 1.5rem;
         border-radius: 16px;
         margin: 1rem 0;
@@ -280,26 +324,26 @@ st.markdown("""
         transition: all 0.3s ease;
     }
     
-    .chat-message:hover {
+    [data-testid="stChatMessage"]:hover {
         border-color: rgba(255, 255, 255, 0.2);
         transform: translateX(4px);
     }
     
-    .user-message {
+    [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatarUser"]) {
         background: linear-gradient(135deg, 
             rgba(102, 126, 234, 0.1) 0%, 
             rgba(102, 126, 234, 0.05) 100%);
         border-left: 4px solid #667eea;
     }
     
-    .ai-message {
+    [data-testid="stChatMessage"]:has([data-testid="stChatMessageAvatarAssistant"]) {
         background: linear-gradient(135deg, 
             rgba(168, 85, 247, 0.1) 0%, 
             rgba(168, 85, 247, 0.05) 100%);
         border-left: 4px solid #a855f7;
     }
     
-    .chat-message strong {
+    [data-testid="stChatMessage"] strong {
         color: rgba(255, 255, 255, 0.9);
         font-weight: 600;
         font-size: 1.05rem;
@@ -487,31 +531,145 @@ st.markdown("""
         border-right-color: transparent !important;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+
+def minify_css(style_block):
+    """Drop comments and indentation from a <style> block"""
+    style_block = re.sub(r"/\*.*?\*/", "", style_block, flags=re.S)
+    style_block = re.sub(r"\s+", " ", style_block)
+    return re.sub(r"\s*([{};,>])\s*", r"\1", style_block).strip()
+
+
+@st.cache_resource
+def load_stylesheet():
+    """The minified stylesheet, built once per process instead of on every rerun"""
+    return minify_css(APP_STYLESHEET)
+
+
+st.markdown(load_stylesheet(), unsafe_allow_html=True)
 
 # ============================================================================
 # SESSION STATE
 # ============================================================================
 
+# main_chain and its index are shared with every session on the same video;
+# the session only keeps a reference plus its lease on the shared index
 if 'main_chain' not in st.session_state:
     st.session_state.main_chain = None
+if 'index_lease' not in st.session_state:
+    st.session_state.index_lease = None
 if 'processed' not in st.session_state:
     st.session_state.processed = False
 if 'video_info' not in st.session_state:
     st.session_state.video_info = {}
 if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
+if 'processing_job' not in st.session_state:
+    st.session_state.processing_job = None
+if 'process_error' not in st.session_state:
+    st.session_state.process_error = None
+if 'speculation' not in st.session_state:
+    st.session_state.speculation = None
+if 'chat_turns_shown' not in st.session_state:
+    st.session_state.chat_turns_shown = CHAT_PAGE_SIZE
+if 'chat_render_ms' not in st.session_state:
+    st.session_state.chat_render_ms = []
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def release_index():
+    """Give this session's hold on the shared index back to the registry"""
+    if st.session_state.index_lease is not None:
+        st.session_state.index_lease.release()
+        st.session_state.index_lease = None
+
+
+def cancel_speculation():
+    """Stop background answers for the video this session is leaving"""
+    if st.session_state.speculation is not None:
+        st.session_state.speculation.cancel()
+        st.session_state.speculation = None
+
+
+def take_speculative_answer(question):
+    """
+    The answer generated in the background for question, or None
+    Waits for it if it is still being generated
+    Returns: (answer, timings) or None
+    """
+    if st.session_state.speculation is None:
+        return None
+    return st.session_state.speculation.take(question)
+
+
+def discard_processing_job():
+    """
+    Cancel this session's processing job
+    One that already finished is collected instead, and its index lease
+    released right away rather than whenever the job record expires
+    """
+    job = st.session_state.processing_job
+    if job is None:
+        return
+    st.session_state.processing_job = None
+    jobs = get_job_manager()
+    if jobs.cancel(job['id']):
+        return
+    result = jobs.result(job['id'], pop=True)
+    if result is not None and result[2].get('index_lease') is not None:
+        result[2]['index_lease'].release()
+
+
 def reset_app():
     """Reset application state"""
+    release_index()
+    cancel_speculation()
+    discard_processing_job()
     st.session_state.main_chain = None
     st.session_state.processed = False
     st.session_state.video_info = {}
     st.session_state.chat_history = []
+    st.session_state.chat_turns_shown = CHAT_PAGE_SIZE
+    st.session_state.process_error = None
+
+
+def queue_question(question, summary_kind=None):
+    """
+    Add a question to the chat history
+    Summary-type questions are answered right away from the precomputed
+    summary tree when the video has one; everything else waits for the LLM
+    """
+    tree = st.session_state.video_info.get('summary_tree')
+    answer = summary_answer(tree, summary_kind) if summary_kind else None
+    chat = {'question': question, 'answer': answer}
+    if answer is not None:
+        chat['timings'] = {'precomputed_sections': len(tree['levels'][0])}
+    st.session_state.chat_history.append(chat)
+
+
+def queue_all_quick_actions():
+    for _, question, summary_kind in QUICK_ACTIONS:
+        queue_question(question, summary_kind)
+
+
+def submit_custom_question():
+    """Form callback: queue the typed question before the chat reruns"""
+    question = st.session_state.custom_question.strip()
+    if question:
+        queue_question(question)
+
+
+def clear_chat():
+    """Drop the chat history and go back to the first page"""
+    st.session_state.chat_history = []
+    st.session_state.chat_turns_shown = CHAT_PAGE_SIZE
+
+
+def show_older_turns():
+    st.session_state.chat_turns_shown += CHAT_PAGE_SIZE
 
 # ============================================================================
 # HEADER
@@ -577,6 +735,58 @@ with st.sidebar:
         }
         selected_model_name = st.selectbox("LLM Model", list(model_options.keys()))
         model_name = model_options[selected_model_name]
+        
+        retrieval_labels = {
+            "dense": "🧠 Semantic (FAISS)",
+            "bm25": "🔤 Keyword (BM25, no embeddings)",
+            "hybrid": "🔀 Hybrid (BM25 + FAISS)"
+        }
+        retrieval_mode = st.selectbox(
+            "Retrieval Mode",
+            RETRIEVAL_MODES,
+            index=RETRIEVAL_MODES.index(DEFAULT_RETRIEVAL_MODE),
+            format_func=retrieval_labels.get,
+            help="Keyword mode skips the embedding model and is fastest to set up for short videos"
+        )
+        
+        precompute_summary = st.checkbox(
+            "Precompute Summaries",
+            value=DEFAULT_PRECOMPUTE_SUMMARY,
+            help="Summarize the whole video while processing so Summary and Key Insights answer instantly"
+        )
+        
+        progressive = st.checkbox(
+            "Progressive Ingestion",
+            value=DEFAULT_PROGRESSIVE_INGEST,
+            help="Index long videos in batches and start answering as soon as the first part is searchable"
+        )
+        
+        speculate = st.checkbox(
+            "Speculative Quick Actions",
+            value=DEFAULT_SPECULATIVE_ANSWERS,
+            help="Start answering the quick actions in the background as soon as a video is ready"
+        )
+        
+        max_concurrency = st.slider("Parallel Questions", 1, 8, DEFAULT_MAX_CONCURRENCY, 1,
+                                    help="How many queued questions are answered at the same time")
+        
+        embedding_stats = get_embedding_model_stats()
+        if 'warmup_seconds' in embedding_stats:
+            st.caption(
+                f"🔥 Embedding model ready on {embedding_stats.get('backend', 'torch')} "
+                f"(load {embedding_stats['load_seconds']:.1f}s, "
+                f"warm-up {embedding_stats['warmup_seconds']:.2f}s)"
+            )
+        else:
+            st.caption("⏳ Embedding model loading in background...")
+        
+        speculation_stats = get_speculator().stats()
+        if speculation_stats['submitted']:
+            st.caption(
+                f"🔮 Speculative answers: {speculation_stats['hit_rate']:.0%} used · "
+                f"{speculation_stats['wasted']} wasted · {speculation_stats['aborted']} aborted · "
+                f"budget {speculation_stats['budget_used']}/{speculation_stats['budget_per_hour']} per hour"
+            )
     
     st.markdown("---")
     
@@ -661,75 +871,165 @@ with col2:
 # PROCESS VIDEO
 # ============================================================================
 
-if process_btn and video_input:
-    video_id = extract_video_id_from_url(video_input)
+# Progress bar range (start %, end %) and label for each process_video stage
+STAGE_PROGRESS = {
+    'loading': (0, 10, "📦 Checking index cache..."),
+    'fetching': (10, 20, "📝 Fetching transcript..."),
+    'chunking': (20, 25, "✂️ Splitting transcript into chunks..."),
+    'embedding': (25, 75, "🧠 Generating embeddings..."),
+    'indexing': (75, 82, "🗄️ Building vector database with FAISS..."),
+    'chain': (82, 85, "🔗 Finalizing RAG pipeline..."),
+    'summarizing': (85, 100, "📚 Summarizing the whole video..."),
+    'done': (100, 100, "🎉 Processing complete!"),
+}
+
+# What done/total count in each stage that reports them
+STAGE_UNITS = {'embedding': "chunks", 'summarizing': "LLM calls"}
+
+def show_progress(progress_bar, status_text, event):
+    """Render one process_video progress event"""
+    low, high, label = STAGE_PROGRESS[event['stage']]
+    detail = f"{event['elapsed']:.1f}s"
+    fraction = 0.0
+    if event['total']:
+        fraction = event['done'] / event['total']
+        detail = f"{event['done']}/{event['total']} {STAGE_UNITS.get(event['stage'], '')} · {detail}"
+    progress_bar.progress(int(low + (high - low) * fraction))
+    status_text.markdown(f"**{label}** ({detail})")
+
+
+def finish_job(job):
+    """Move a finished processing job's result into this session"""
+    success, main_chain, metadata, error = get_job_manager().result(job['id'], pop=True)
+    if not success:
+        st.session_state.process_error = error
+        return
+    release_index()
+    cancel_speculation()
+    st.session_state.index_lease = metadata.get('index_lease')
+    st.session_state.main_chain = main_chain
+    st.session_state.processed = True
+    st.session_state.video_info = {
+        'video_id': job['video_id'],
+        'segments': metadata.get('segments', 0),
+        'words': metadata.get('total_words', 0),
+        'chunks': metadata.get('chunks', 0),
+        'duration': metadata.get('duration', 0),
+        'answer_cache_scope': metadata.get('answer_cache_scope'),
+        'cache_hit': metadata.get('cache_hit', False),
+        'shared_index': metadata.get('shared_index', False),
+        'retrieval_mode': metadata.get('retrieval_mode', "dense"),
+        'stage_seconds': metadata.get('stage_seconds', {}),
+        'summary_tree': metadata.get('summary_tree')
+    }
+    if metadata.get('summary_error'):
+        st.toast(f"⚠️ Summary precompute failed, summaries will use retrieval: {metadata['summary_error']}")
+    if job.get('speculate'):
+        # Start on the quick actions the summary tree doesn't already answer
+        st.session_state.speculation = speculate_answers(
+            main_chain,
+            [question for _, question, summary_kind in QUICK_ACTIONS
+             if not (summary_kind and summary_answer(metadata.get('summary_tree'), summary_kind))],
+            cache_scope=metadata.get('answer_cache_scope')
+        )
+    total_seconds = sum(metadata.get('stage_seconds', {}).values())
+    st.toast(f"🎉 Video ready for analysis in {total_seconds:.1f}s")
+
+
+def start_preview(job, preview):
+    """Open the Q&A on the partial index of a progressive job while it keeps indexing"""
+    release_index()
+    cancel_speculation()
+    st.session_state.main_chain = preview['main_chain']
+    st.session_state.processed = True
+    # Partial answers must not land in the answer cache
+    st.session_state.video_info = {'video_id': job['video_id'], 'partial': True, 'answer_cache_scope': None}
+    job['preview'] = True
+    st.toast("💬 The first part of the video is indexed - ask away while the rest is processed")
+
+
+def coverage_note(coverage):
+    return (
+        f"the first {format_time(coverage['covered_seconds'])} of {format_time(coverage['duration'])} "
+        f"({coverage['fraction']:.0%})"
+    )
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def poll_processing_job():
+    """Poll the background job without blocking the rest of the page"""
+    job = st.session_state.processing_job
+    if job is None:
+        return
+    status = get_job_manager().status(job['id'])
+    
+    if status is None or status['state'] in (DONE, FAILED, CANCELLED):
+        st.session_state.processing_job = None
+        if status is None:
+            st.session_state.process_error = "The processing job expired before it finished"
+        elif status['state'] == DONE:
+            finish_job(job)
+        elif status['state'] == FAILED:
+            st.session_state.process_error = status['error']
+        st.rerun(scope="app")
+    
+    event = status['progress']
+    if event is not None and 'preview' in event and not job.get('preview'):
+        start_preview(job, event['preview'])
+        st.rerun(scope="app")
     
     progress_bar = st.progress(0)
     status_text = st.empty()
-    
+    if event is not None:
+        show_progress(progress_bar, status_text, event)
+        if job.get('preview'):
+            st.caption(
+                f"💬 Answers cover {coverage_note(event['preview']['coverage']())} "
+                f"of the video until indexing finishes"
+            )
+    else:
+        status_text.markdown("**⏳ Waiting for a free worker...**")
+    if st.button("✖️ Cancel Processing"):
+        discard_processing_job()
+        st.rerun(scope="app")
+
+
+if process_btn and video_input:
+    discard_processing_job()
+    cancel_speculation()
+    video_id = extract_video_id_from_url(video_input)
+    st.session_state.process_error = None
     try:
-        status_text.markdown("**🎬 Initializing video processor...**")
-        progress_bar.progress(20)
-        time.sleep(0.5)
-        
-        status_text.markdown("**📝 Extracting transcript and generating embeddings...**")
-        progress_bar.progress(40)
-        
-        status_text.markdown("**🧠 Building vector database with FAISS...**")
-        progress_bar.progress(60)
-        
-        success, main_chain, metadata, error = process_video(
-            video_id=video_id,
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            model_name=model_name,
-            temperature=temperature
-        )
-        
-        progress_bar.progress(80)
-        status_text.markdown("**✅ Finalizing RAG pipeline...**")
-        time.sleep(0.3)
-        
-        progress_bar.progress(100)
-        
-        if success:
-            status_text.markdown("**🎉 Processing complete!**")
-            time.sleep(0.8)
-            
-            st.session_state.main_chain = main_chain
-            st.session_state.processed = True
-            st.session_state.video_info = {
-                'video_id': video_id,
-                'segments': metadata.get('segments', 0),
-                'words': metadata.get('total_words', 0),
-                'chunks': metadata.get('chunks', 0),
-                'duration': metadata.get('duration', 0)
-            }
-            
-            progress_bar.empty()
-            status_text.empty()
-            
-            st.success("🎉 Video successfully processed and ready for analysis!")
-            st.balloons()
-            time.sleep(1)
-            st.rerun()
-        else:
-            st.error(f"❌ Processing Error: {error}")
-            st.info("💡 **Troubleshooting:** Ensure the video has captions enabled and your API key is correctly configured.")
-            
-    except Exception as e:
-        st.error(f"❌ Unexpected Error: {str(e)}")
-        st.info("💡 Please check your internet connection and try again.")
-    
-    finally:
-        progress_bar.empty()
-        status_text.empty()
+        st.session_state.processing_job = {
+            'id': submit_process_video(
+                video_id,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                model_name=model_name,
+                temperature=temperature,
+                retrieval_mode=retrieval_mode,
+                summarize=precompute_summary,
+                progressive=progressive
+            ),
+            'video_id': video_id,
+            'speculate': speculate
+        }
+    except JobQueueFull:
+        st.session_state.processing_job = None
+        st.warning("⏳ Too many videos are being processed right now. Please try again in a moment.")
+
+if st.session_state.processing_job is not None:
+    poll_processing_job()
+
+if st.session_state.process_error:
+    st.error(f"❌ Processing Error: {st.session_state.process_error}")
+    st.info("💡 **Troubleshooting:** Ensure the video has captions enabled and your API key is correctly configured.")
 
 # ============================================================================
 # STATISTICS DASHBOARD
 # ============================================================================
 
-if st.session_state.processed and st.session_state.video_info:
+if st.session_state.processed and st.session_state.video_info and not st.session_state.video_info.get('partial'):
     st.markdown("---")
     st.markdown('<p class="section-header">📊 Video Analytics Dashboard</p>', unsafe_allow_html=True)
     
@@ -767,6 +1067,20 @@ if st.session_state.processed and st.session_state.video_info:
                 <p class="stat-label">Duration (min)</p>
             </div>
         """, unsafe_allow_html=True)
+    
+    stage_seconds = st.session_state.video_info.get('stage_seconds')
+    if stage_seconds:
+        if st.session_state.video_info.get('shared_index'):
+            source = "shared with other sessions"
+        elif st.session_state.video_info.get('cache_hit'):
+            source = "cached index"
+        else:
+            source = "built from transcript"
+        st.caption(
+            f"⏱️ Processed in {sum(stage_seconds.values()):.1f}s "
+            f"({source}, {st.session_state.video_info.get('retrieval_mode', 'dense')} retrieval): "
+            + " · ".join(f"{stage} {seconds:.2f}s" for stage, seconds in stage_seconds.items())
+        )
 
 # ============================================================================
 # QUICK ACTIONS
@@ -776,90 +1090,167 @@ if st.session_state.processed:
     st.markdown("---")
     st.markdown('<p class="section-header">🎯 Quick Action Prompts</p>', unsafe_allow_html=True)
     
-    quick_col1, quick_col2, quick_col3, quick_col4 = st.columns(4)
-    
-    with quick_col1:
-        if st.button("📝 Complete Summary", use_container_width=True):
-            st.session_state.chat_history.append({
-                'question': "Provide a comprehensive and detailed summary of this video, covering all major points",
-                'answer': None
-            })
-            st.rerun()
-    
-    with quick_col2:
-        if st.button("🔑 Key Insights", use_container_width=True):
-            st.session_state.chat_history.append({
-                'question': "What are the most important key takeaways and insights from this video?",
-                'answer': None
-            })
-            st.rerun()
-    
-    with quick_col3:
-        if st.button("👤 Speaker Analysis", use_container_width=True):
-            st.session_state.chat_history.append({
-                'question': "Who is the speaker and what are the main topics they discuss in this video?",
-                'answer': None
-            })
-            st.rerun()
-    
-    with quick_col4:
-        if st.button("💡 Core Concepts", use_container_width=True):
-            st.session_state.chat_history.append({
-                'question': "What are the fundamental concepts and main ideas presented in this video?",
-                'answer': None
-            })
-            st.rerun()
+    quick_cols = st.columns(len(QUICK_ACTIONS))
+    
+    for quick_col, (label, question, summary_kind) in zip(quick_cols, QUICK_ACTIONS):
+        with quick_col:
+            st.button(label, use_container_width=True, on_click=queue_question, args=(question, summary_kind))
+    
+    st.button("⚡ Run All Quick Actions", use_container_width=True, on_click=queue_all_quick_actions)
 
 # ============================================================================
 # CHAT INTERFACE
 # ============================================================================
 
-if st.session_state.processed:
-    st.markdown("---")
-    st.markdown('<p class="section-header">💬 Intelligent Q&A Interface</p>', unsafe_allow_html=True)
+def timing_caption(timings):
+    """One-line note under an answer on where it came from and how long it took"""
+    prompt_note = ""
+    if 'prompt_tokens' in timings:
+        prompt_note = (
+            f" · ~{timings['prompt_tokens']:,} prompt tokens "
+            f"({timings.get('context_chunks', 0)} chunks in {timings.get('context_spans', 0)} spans)"
+        )
+    if 'coverage' in timings:
+        # Asked while the video was still being indexed
+        prompt_note += f" · 🧩 based on {coverage_note(timings['coverage'])} indexed at the time"
+    if 'precomputed_sections' in timings:
+        return f"📚 Served instantly from the precomputed summary of all {timings['precomputed_sections']} sections"
+    if 'cache_hit' in timings:
+        return f"♻️ Served from answer cache ({timings['cache_hit']} match)"
+    if timings.get('speculative'):
+        return (
+            f"🔮 Prepared in the background before you asked "
+            f"(generation took {timings.get('total_seconds', 0):.2f}s){prompt_note}"
+        )
+    if 'batch_size' in timings:
+        return (
+            f"⚡ Answered in a batch of {timings['batch_size']} · "
+            f"Total {timings.get('total_seconds', 0):.2f}s{prompt_note}"
+        )
+    return (
+        f"⚡ First token {timings.get('time_to_first_token', 0):.2f}s · "
+        f"Total {timings.get('total_seconds', 0):.2f}s{prompt_note}"
+    )
+
+
+def show_turn(idx, chat):
+    """Render one answered question"""
+    with st.chat_message("user", avatar="🙋"):
+        st.markdown(f"**Question {idx + 1}:** {chat['question']}")
+    with st.chat_message("assistant", avatar="🤖"):
+        st.markdown(chat['answer'])
+        if chat.get('timings'):
+            st.caption(timing_caption(chat['timings']))
+
+
+def answer_pending(pending, max_concurrency):
+    """
+    Fill in answers for the pending turns (indexes into chat_history)
+    Speculative answers are handed over first; the rest are answered in one
+    concurrent batch. A single remaining question is left for streaming.
+    Returns: the still pending indexes
+    """
+    if st.session_state.speculation is not None:
+        with st.spinner("🔮 Collecting answers prepared in the background..."):
+            for idx in pending:
+                chat = st.session_state.chat_history[idx]
+                speculated = take_speculative_answer(chat['question'])
+                if speculated is not None:
+                    chat['answer'], chat['timings'] = speculated
+        pending = [idx for idx in pending if st.session_state.chat_history[idx]['answer'] is None]
+    
+    if len(pending) <= 1:
+        return pending
+    
+    with st.spinner(f"🤔 Answering {len(pending)} questions in parallel..."):
+        start = time.perf_counter()
+        cache_hits = []
+        usage = []
+        results = answer_questions(
+            st.session_state.main_chain,
+            [st.session_state.chat_history[idx]['question'] for idx in pending],
+            max_concurrency=max_concurrency,
+            cache_scope=st.session_state.video_info.get('answer_cache_scope'),
+            cache_hits=cache_hits,
+            usage=usage
+        )
+        batch_seconds = time.perf_counter() - start
+    
+    for idx, (success, answer, error), cache_hit, stats in zip(pending, results, cache_hits, usage):
+        chat = st.session_state.chat_history[idx]
+        chat['answer'] = answer if success else f"Error: {error}"
+        chat['timings'] = dict(stats, total_seconds=batch_seconds, batch_size=len(pending))
+        if cache_hit:
+            chat['timings']['cache_hit'] = cache_hit
+    return []
+
+
+def stream_turn(idx, chat):
+    """Render a pending question and stream its answer in place"""
+    with st.chat_message("user", avatar="🙋"):
+        st.markdown(f"**Question {idx + 1}:** {chat['question']}")
+    with st.chat_message("assistant", avatar="🤖"):
+        # Stream tokens as Gemini produces them
+        try:
+            timings = {}
+            chat['answer'] = st.write_stream(
+                stream_answer(
+                    st.session_state.main_chain,
+                    chat['question'],
+                    timings,
+                    cache_scope=st.session_state.video_info.get('answer_cache_scope')
+                )
+            )
+            chat['timings'] = timings
+            st.caption(timing_caption(timings))
+        except Exception as e:
+            st.error(f"Error generating response: {str(e)}")
+            chat['answer'] = f"Error: {str(e)}"
+
+
+@st.fragment
+def chat_section(max_concurrency):
+    """
+    Chat history, pending answers and the question form
+    Runs as a fragment: asking a question reruns only this section, and only
+    the latest CHAT_PAGE_SIZE turns (more on request) are rendered
+    """
+    start = time.perf_counter()
+    generation_seconds = 0.0
+    history = st.session_state.chat_history
+    
+    pending = [idx for idx, chat in enumerate(history) if chat['answer'] is None]
+    if pending:
+        generation_start = time.perf_counter()
+        pending = answer_pending(pending, max_concurrency)
+        generation_seconds += time.perf_counter() - generation_start
+    
+    # Only the latest page of turns is rendered; pending ones are always last
+    first_shown = max(0, len(history) - st.session_state.chat_turns_shown)
+    if first_shown:
+        st.button(
+            f"⬆️ Show {min(CHAT_PAGE_SIZE, first_shown)} older questions ({first_shown} hidden)",
+            on_click=show_older_turns,
+            use_container_width=True
+        )
     
-    # Display chat history
-    if st.session_state.chat_history:
-        st.markdown('<div class="main-card">', unsafe_allow_html=True)
-        
-        for idx, chat in enumerate(st.session_state.chat_history):
-            # Question
-            st.markdown(f"""
-                <div class="chat-message user-message">
-                    <strong>🙋 Question {idx + 1}:</strong><br>
-                    <span style='color: rgba(255, 255, 255, 0.85); font-size: 1rem; line-height: 1.6;'>{chat['question']}</span>
-                </div>
-            """, unsafe_allow_html=True)
-            
-            # Answer
-            if chat['answer'] is None:
-                with st.spinner("🤔 Analyzing content with RAG pipeline..."):
-                    try:
-                        answer = st.session_state.main_chain.invoke(chat['question'])
-                        st.session_state.chat_history[idx]['answer'] = answer
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Error generating response: {str(e)}")
-                        st.session_state.chat_history[idx]['answer'] = f"Error: {str(e)}"
-            else:
-                st.markdown(f"""
-                    <div class="chat-message ai-message">
-                        <strong>🤖 AI Response:</strong><br>
-                        <span style='color: rgba(255, 255, 255, 0.85); font-size: 1rem; line-height: 1.7;'>{chat['answer']}</span>
-                    </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("<br>", unsafe_allow_html=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+    for idx in range(first_shown, len(history)):
+        chat = history[idx]
+        if chat['answer'] is None:
+            generation_start = time.perf_counter()
+            stream_turn(idx, chat)
+            generation_seconds += time.perf_counter() - generation_start
+        else:
+            show_turn(idx, chat)
     
     # New question input
     st.markdown('<div class="main-card" style="margin-top: 2rem;">', unsafe_allow_html=True)
     st.markdown("#### ✍️ Ask Your Custom Question")
     
     with st.form(key="question_form", clear_on_submit=True):
-        user_question = st.text_area(
+        st.text_area(
             "Your question about the video",
+            key="custom_question",
             placeholder="e.g., What are the main arguments? Can you explain the concept discussed at 5:30? What examples are provided?",
             height=120,
             label_visibility="collapsed"
@@ -868,21 +1259,29 @@ if st.session_state.processed:
         col_submit1, col_submit2 = st.columns([3, 1])
         
         with col_submit1:
-            submit_question = st.form_submit_button("🚀 Submit Question", use_container_width=True, type="primary")
+            st.form_submit_button("🚀 Submit Question", use_container_width=True, type="primary",
+                                  on_click=submit_custom_question)
         
         with col_submit2:
-            if st.form_submit_button("🗑️ Clear History", use_container_width=True):
-                st.session_state.chat_history = []
-                st.rerun()
-        
-        if submit_question and user_question.strip():
-            st.session_state.chat_history.append({
-                'question': user_question,
-                'answer': None
-            })
-            st.rerun()
+            st.form_submit_button("🗑️ Clear History", use_container_width=True, on_click=clear_chat)
     
     st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Server time spent building this section, without waiting on the LLM
+    render_ms = (time.perf_counter() - start - generation_seconds) * 1000
+    samples = st.session_state.chat_render_ms
+    samples.append(render_ms)
+    del samples[:-CHAT_RENDER_SAMPLES]
+    st.caption(
+        f"🖥️ Chat rendered in {render_ms:.0f} ms ({len(history) - first_shown} of {len(history)} turns) · "
+        f"median {statistics.median(samples):.0f} ms over the last {len(samples)} interactions"
+    )
+
+
+if st.session_state.processed:
+    st.markdown("---")
+    st.markdown('<p class="section-header">💬 Intelligent Q&A Interface</p>', unsafe_allow_html=True)
+    chat_section(max_concurrency)
 
 # ============================================================================
 # FOOTER
@@ -0,0 +1,91 @@
+"""
+Chat render benchmark
+======================
+Server time to render the chat section as the session's history grows,
+with the paginated history (YT_RAG_CHAT_PAGE_SIZE turns) against rendering
+every turn. Each run replays one interaction of app.py in Streamlit's
+AppTest harness with an already answered history, so no LLM or embedding
+model is involved; the chat section measures itself (the caption under
+the chat), the whole script run is timed around it.
+
+USAGE:
+    python benchmarks/chat_render.py --turns 10 100 500 --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Keep app.py from loading the embedding model in the background
+os.environ.setdefault("YT_RAG_RETRIEVAL_MODE", "bm25")
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+ANSWER = (
+    "The speaker explains the main idea with **two examples** and a short list:\n\n"
+    "- the first point, with some detail\n- the second point, with more detail\n\n"
+) * 4
+
+
+def make_history(n_turns):
+    return [
+        {'question': f"Question number {i} about the video?", 'answer': ANSWER,
+         'timings': {'time_to_first_token': 0.4, 'total_seconds': 2.1, 'prompt_tokens': 1200,
+                     'context_chunks': 6, 'context_spans': 4}}
+        for i in range(n_turns)
+    ]
+
+
+def bench(n_turns, page_size, runs):
+    """Median (chat section ms, whole script run ms) over runs"""
+    os.environ["YT_RAG_CHAT_PAGE_SIZE"] = str(page_size)
+    app = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    app.session_state.processed = True
+    app.session_state.chat_history = make_history(n_turns)
+    app.run()  # warm-up: imports and the cached stylesheet
+
+    script_ms = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        app.run()
+        script_ms.append((time.perf_counter() - start) * 1000)
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    chat_ms = app.session_state.chat_render_ms[-runs:]
+    return statistics.median(chat_ms), statistics.median(script_ms)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chat section render time vs history length")
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--page-size", type=int, default=int(os.getenv("YT_RAG_CHAT_PAGE_SIZE", "10")))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for n_turns in args.turns:
+        paged = bench(n_turns, args.page_size, args.runs)
+        full = bench(n_turns, max(n_turns, 1), args.runs)
+        results.append({'turns': n_turns, 'paged_ms': paged, 'all_turns_ms': full})
+
+    print(f"page size {args.page_size}, median of {args.runs} reruns (chat section / whole script)\n")
+    print(f"{'turns':>6} | {'paged chat':>10} {'script':>8} | {'all turns chat':>14} {'script':>8}")
+    for row in results:
+        (paged_chat, paged_script), (full_chat, full_script) = row['paged_ms'], row['all_turns_ms']
+        print(f"{row['turns']:>6} | {paged_chat:>7.1f} ms {paged_script:>5.0f} ms | "
+              f"{full_chat:>11.1f} ms {full_script:>5.0f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
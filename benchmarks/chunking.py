@@ -0,0 +1,80 @@
+"""
+Chunking throughput benchmark
+==============================
+Compares the segment-aligned single-pass chunker (create_segment_chunks)
+with the RecursiveCharacterTextSplitter path (create_chunks) on synthetic
+transcripts of increasing length.
+
+USAGE:
+    python benchmarks/chunking.py --words 1000 10000 100000 500000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_segments  # noqa: E402
+from youtube_processor import create_chunks, create_segment_chunks  # noqa: E402
+
+
+def best_of(fn, repeats):
+    """Fastest wall time of several runs, plus the last result"""
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(word_counts, chunk_size, chunk_overlap, repeats):
+    results = []
+    for n_words in word_counts:
+        segments = make_segments(n_words)
+        transcript = " ".join(s['text'] for s in segments)
+        # The splitter also needs the joined string, so that cost is charged to it
+        splitter_seconds, splitter_chunks = best_of(
+            lambda: create_chunks(" ".join(s['text'] for s in segments), chunk_size, chunk_overlap), repeats
+        )
+        segment_seconds, segment_chunks = best_of(
+            lambda: create_segment_chunks(segments, chunk_size, chunk_overlap), repeats
+        )
+        results.append({
+            'words': n_words,
+            'characters': len(transcript),
+            'splitter': {'seconds': splitter_seconds, 'chunks': len(splitter_chunks)},
+            'segment': {'seconds': segment_seconds, 'chunks': len(segment_chunks)},
+            'speedup': splitter_seconds / segment_seconds if segment_seconds else 0.0,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Segment chunker vs RecursiveCharacterTextSplitter")
+    parser.add_argument("--words", type=int, nargs="+", default=[1000, 10000, 100000, 500000])
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--chunk-overlap", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.words, args.chunk_size, args.chunk_overlap, args.repeats)
+
+    print(f"{'words':>8} {'splitter':>10} {'segment':>10} {'speedup':>8} {'chunks (split/seg)':>20}")
+    for row in results:
+        print(f"{row['words']:>8,} {row['splitter']['seconds'] * 1000:>8.1f}ms "
+              f"{row['segment']['seconds'] * 1000:>8.1f}ms {row['speedup']:>7.1f}x "
+              f"{row['splitter']['chunks']:>9} / {row['segment']['chunks']:<8}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
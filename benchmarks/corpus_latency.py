@@ -0,0 +1,146 @@
+"""
+Corpus query latency benchmark
+===============================
+Measures CorpusIndex query latency as the corpus grows, for whole-corpus,
+single-video and 10-video scopes. Runs fully offline on random vectors.
+
+--crossover also times both scoped search paths - exact search over the
+scope's own vectors and the FAISS ID-selector search - on the largest corpus
+for growing scope sizes, to check where BRUTE_FORCE_MAX_VECTORS should sit.
+
+USAGE:
+    python benchmarks/corpus_latency.py --videos 100 1000 5000 --chunks-per-video 40
+    python benchmarks/corpus_latency.py --videos 5000 --crossover 500 1000 2000 4000 16000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus_index import BRUTE_FORCE_MAX_VECTORS, CorpusIndex  # noqa: E402
+
+DIM = 384
+
+
+class RandomEmbeddings(Embeddings):
+    """Deterministic random vectors - only the index is being measured"""
+
+    def __init__(self, seed=0):
+        self.rng = np.random.default_rng(seed)
+
+    def embed_documents(self, texts):
+        return self.rng.standard_normal((len(texts), DIM), dtype=np.float32).tolist()
+
+    def embed_query(self, text):
+        return self.rng.standard_normal(DIM, dtype=np.float32).tolist()
+
+
+def time_queries(fn, queries):
+    """Median and p95 latency in milliseconds"""
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'median_ms': statistics.median(samples),
+        'p95_ms': samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+def crossover(corpus, scope_sizes, queries, k, seed=0):
+    """Exact vs selector search latency for random scopes of each size"""
+    rng = np.random.default_rng(seed)
+    total = corpus.stats()['vectors']
+    results = []
+    for size in scope_sizes:
+        if size > total:
+            continue
+        rows = np.sort(rng.choice(total, size=size, replace=False)).astype(np.int64)
+        results.append({
+            'scope_vectors': size,
+            'exact': time_queries(lambda q: corpus._exact_search(q.reshape(1, -1), rows, k), queries),
+            'selector': time_queries(lambda q: corpus._selector_search(q.reshape(1, -1), rows, k), queries),
+        })
+    return results
+
+
+def run(video_counts, chunks_per_video, queries_per_scope, k, seed=0, scope_sizes=()):
+    rng = np.random.default_rng(seed)
+    corpus = CorpusIndex(RandomEmbeddings(seed))
+    results = []
+    added = 0
+
+    for target in sorted(video_counts):
+        build_start = time.perf_counter()
+        while added < target:
+            video_id = f"video{added:06d}"
+            chunks = [
+                Document(page_content=f"{video_id} chunk {i}", metadata={'start_index': i * 700})
+                for i in range(chunks_per_video)
+            ]
+            vectors = rng.standard_normal((chunks_per_video, DIM), dtype=np.float32)
+            corpus.add_video(video_id, chunks, vectors)
+            added += 1
+        build_seconds = time.perf_counter() - build_start
+
+        queries = rng.standard_normal((queries_per_scope, DIM), dtype=np.float32)
+        one_video = [f"video{rng.integers(target):06d}"]
+        ten_videos = [f"video{v:06d}" for v in rng.choice(target, size=min(10, target), replace=False)]
+
+        results.append({
+            'videos': target,
+            'vectors': corpus.stats()['vectors'],
+            'incremental_build_seconds': build_seconds,
+            'whole_corpus': time_queries(lambda q: corpus.search_by_vector(q, k), queries),
+            'one_video': time_queries(lambda q: corpus.search_by_vector(q, k, one_video), queries),
+            'ten_videos': time_queries(lambda q: corpus.search_by_vector(q, k, ten_videos), queries),
+        })
+    return results, crossover(corpus, scope_sizes, queries, k, seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Corpus query latency vs corpus size")
+    parser.add_argument("--videos", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--chunks-per-video", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--crossover", type=int, nargs="*", default=[],
+                        help="scope sizes (vectors) to time exact vs selector search for")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    results, scopes = run(args.videos, args.chunks_per_video, args.queries, args.k, scope_sizes=args.crossover)
+
+    print(f"{'videos':>8} {'vectors':>10} {'corpus p50':>11} {'1 video p50':>12} {'10 videos p50':>14}")
+    for row in results:
+        print(f"{row['videos']:>8} {row['vectors']:>10,} "
+              f"{row['whole_corpus']['median_ms']:>9.2f}ms "
+              f"{row['one_video']['median_ms']:>10.2f}ms "
+              f"{row['ten_videos']['median_ms']:>12.2f}ms")
+
+    if scopes:
+        print(f"\nscoped search on {results[-1]['vectors']:,} vectors "
+              f"(exact up to {BRUTE_FORCE_MAX_VECTORS:,} scope vectors)")
+        print(f"{'scope':>8} {'exact p50':>10} {'selector p50':>13}")
+        for row in scopes:
+            print(f"{row['scope_vectors']:>8,} {row['exact']['median_ms']:>8.2f}ms "
+                  f"{row['selector']['median_ms']:>11.2f}ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'results': results, 'crossover': scopes}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Embedding backend benchmark
+============================
+Measures chunks/sec of every embedding backend configuration on synthetic
+transcript chunks, and checks each one's vectors against the default torch
+backend (per-chunk cosine similarity must stay >= --min-cosine).
+
+Needs the real model in the local HF cache (and onnxruntime for onnx-int8;
+the first onnx-int8 run also exports the model, which is timed separately).
+
+USAGE:
+    python benchmarks/embedding_backends.py --words 100000 --batch-sizes 16 32 64 --processes 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+from benchmarks.synthetic import make_segments  # noqa: E402
+from embedding_backends import DEFAULT_MIN_COSINE, check_tolerance, load_embeddings  # noqa: E402
+from youtube_processor import EMBEDDING_MODEL_NAME, create_segment_chunks  # noqa: E402
+
+
+def configurations(batch_sizes, processes, skip_onnx):
+    """(label, load kwargs) for every backend setting to measure"""
+    configs = [(f"torch bs={bs}", {'backend': "torch", 'batch_size': bs}) for bs in batch_sizes]
+    if processes > 1:
+        configs.append((f"torch bs={batch_sizes[-1]} x{processes} proc",
+                        {'backend': "torch", 'batch_size': batch_sizes[-1], 'processes': processes}))
+    if not skip_onnx:
+        configs += [(f"onnx-int8 bs={bs}", {'backend': "onnx-int8", 'batch_size': bs}) for bs in batch_sizes]
+    return configs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput and accuracy of embedding backends")
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME)
+    parser.add_argument("--words", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--chunk-overlap", type=int, default=100)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 32, 64])
+    parser.add_argument("--processes", type=int, default=0, help="also measure a torch process pool of this size")
+    parser.add_argument("--skip-onnx", action="store_true")
+    parser.add_argument("--min-cosine", type=float, default=DEFAULT_MIN_COSINE)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    chunks = create_segment_chunks(make_segments(args.words, seed=args.words), args.chunk_size, args.chunk_overlap)
+    texts = [chunk.page_content for chunk in chunks]
+    reference = load_embeddings(args.model, backend="torch")
+    print(f"{len(texts):,} chunks from {args.words:,} synthetic words, model {args.model}\n")
+    print(f"{'configuration':<28} {'load s':>8} {'chunks/s':>10} {'min cos':>8} {'tolerance':>10}")
+
+    results = []
+    for label, kwargs in configurations(args.batch_sizes, args.processes, args.skip_onnx):
+        start = time.perf_counter()
+        embeddings = load_embeddings(args.model, **kwargs)
+        load_seconds = time.perf_counter() - start
+
+        embeddings.embed_documents(texts[:8])  # warm up (and start the process pool)
+        start = time.perf_counter()
+        embeddings.embed_documents(texts)
+        seconds = time.perf_counter() - start
+
+        tolerance = check_tolerance(reference, embeddings, texts, min_cosine=args.min_cosine)
+        results.append(dict(kwargs, label=label, load_seconds=load_seconds,
+                            chunks_per_second=len(texts) / seconds, tolerance=tolerance))
+        print(f"{label:<28} {load_seconds:>8.2f} {len(texts) / seconds:>10.1f} "
+              f"{tolerance['min_cosine']:>8.4f} {'ok' if tolerance['ok'] else 'FAILED':>10}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'model': args.model, 'chunks': len(texts), 'results': results}, f, indent=2)
+
+    return 0 if all(row['tolerance']['ok'] for row in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
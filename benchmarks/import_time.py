@@ -0,0 +1,117 @@
+"""
+Import-time budget check
+=========================
+Measures the cold import of the modules app.py needs before its first paint
+(python -X importtime in a fresh interpreter, median of --runs) and checks:
+
+- the cumulative import time stays within --budget-ms
+- none of the heavy dependencies that are only needed later (FAISS, the
+  Gemini client, the embedding stack) got imported along the way
+
+Exits non-zero when either check fails, so it can run in CI next to the
+other benchmarks. The slowest imports are listed to show what to defer next.
+
+USAGE:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 800 --runs 5 --json import_time.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What app.py imports before rendering anything (besides streamlit itself)
+APP_MODULES = ("youtube_processor", "job_queue", "speculative", "summary_tree")
+
+# Only imported on first use (see lazy_imports.py)
+DEFERRED_MODULES = (
+    "faiss", "langchain_community", "langchain_google_genai", "langchain_text_splitters",
+    "langchain_huggingface", "sentence_transformers", "torch", "transformers", "onnxruntime",
+)
+
+DEFAULT_BUDGET_MS = 1500
+
+
+def run_import(modules):
+    """
+    Import modules in a fresh interpreter with -X importtime
+    Returns: (total ms, {module: cumulative ms} of what modules import directly, loaded deferred modules)
+    """
+    code = (
+        f"import json, sys\n"
+        f"for name in {list(modules)!r}: __import__(name)\n"
+        # lazy_module() placeholders sit in sys.modules with _deferred set until first used
+        f"print(json.dumps(sorted(m for m in {list(DEFERRED_MODULES)!r}\n"
+        f"                        if m in sys.modules and not getattr(sys.modules[m], '_deferred', False))))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if total.strip().isdigit():
+            # Nesting is two spaces per level after the separator's own space;
+            # keep the outermost entry per module
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            name = name.strip()
+            if name not in cumulative or depth < cumulative[name][1]:
+                cumulative[name] = (int(total) / 1000, depth)
+
+    # Modules imported by an earlier one in the list have no line of their own
+    total_ms = sum(cumulative[name][0] for name in modules if name in cumulative)
+    direct = {name: ms for name, (ms, depth) in cumulative.items() if depth == 1}
+    return total_ms, direct, json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold import time of the app's modules, checked against a budget")
+    parser.add_argument("--modules", nargs="+", default=list(APP_MODULES))
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="how many of the slowest imports to list")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    run_import(args.modules)  # warm-up: compile .pyc files
+    runs = [run_import(args.modules) for _ in range(args.runs)]
+    totals = [total for total, _, _ in runs]
+    total_ms = statistics.median(totals)
+    _, direct, loaded = runs[totals.index(total_ms)] if total_ms in totals else runs[0]
+
+    print(f"import {', '.join(args.modules)}: {total_ms:.0f} ms (median of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    print("\nslowest imports they pull in:")
+    for name, ms in sorted(direct.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"   {name:<36} {ms:>8.1f} ms")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+    if loaded:
+        failures.append(f"deferred modules imported eagerly: {', '.join(loaded)}")
+    print()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'modules': args.modules, 'runs_ms': totals, 'median_ms': total_ms,
+                       'budget_ms': args.budget_ms, 'direct_imports_ms': direct,
+                       'deferred_loaded': loaded, 'ok': not failures}, f, indent=2)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
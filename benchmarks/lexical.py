@@ -0,0 +1,131 @@
+"""
+Lexical vs dense ingest benchmark
+==================================
+Compares what it costs to make a video searchable with the BM25 index and
+with the dense path (embedding model load + embedding + FAISS build), plus
+the per-query latency of bm25, dense and hybrid retrieval.
+
+Runs offline on synthetic transcripts with the hashing embedder unless
+--real-embeddings is given (then the model load time is included too, as
+it is what a BM25-only deployment saves at startup).
+
+USAGE:
+    python benchmarks/lexical.py --words 2000 20000 200000
+    python benchmarks/lexical.py --real-embeddings --json lexical.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.pipeline import HASHING_MODEL_NAME, QUESTIONS, HashingEmbeddings  # noqa: E402
+from benchmarks.synthetic import make_segments  # noqa: E402
+from index_factory import build_vector_store, describe_index  # noqa: E402
+from lexical_index import HybridRetriever  # noqa: E402
+import youtube_processor as yp  # noqa: E402
+
+
+def measure(fn):
+    """Run fn once; returns (result, seconds)"""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def query_median_ms(retriever, questions):
+    samples = []
+    for question in questions:
+        start = time.perf_counter()
+        retriever.invoke(question)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_size(n_words, embedding_model, chunk_size, chunk_overlap, n_queries):
+    chunks = yp.create_segment_chunks(make_segments(n_words, seed=n_words), chunk_size, chunk_overlap)
+    texts = [chunk.page_content for chunk in chunks]
+    questions = [QUESTIONS[i % len(QUESTIONS)] + f" ({i})" for i in range(n_queries)]
+
+    (lexical, bm25_index), bm25_seconds = measure(lambda: yp.create_bm25_retriever(chunks))
+
+    embeddings = yp.get_embedding_model(embedding_model)
+    vectors, embed_seconds = measure(lambda: embeddings.embed_documents(texts))
+    vector_store, faiss_seconds = measure(
+        lambda: build_vector_store(texts, vectors, embeddings, metadatas=[c.metadata for c in chunks])
+    )
+    dense = yp.create_retriever(vector_store, embedding_model)
+    # Fresh retriever per mode so memoized results don't flatter later modes
+    hybrid = HybridRetriever(lexical=yp.create_bm25_retriever(chunks)[0],
+                             dense=yp.create_retriever(vector_store, embedding_model))
+
+    return {
+        'words': n_words,
+        'chunks': len(chunks),
+        'bm25': {
+            'ingest_seconds': bm25_seconds,
+            'index_memory_bytes': bm25_index.memory_bytes(),
+            'query_median_ms': query_median_ms(lexical, questions),
+        },
+        'dense': {
+            'ingest_seconds': embed_seconds + faiss_seconds,
+            'embedding_seconds': embed_seconds,
+            'index_memory_bytes': describe_index(vector_store.index)['index_memory_bytes'],
+            'query_median_ms': query_median_ms(dense, questions),
+        },
+        'hybrid': {
+            'query_median_ms': query_median_ms(hybrid, questions),
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BM25 vs dense ingest cost and query latency")
+    parser.add_argument("--words", type=int, nargs="+", default=[2000, 20000, 200000])
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--chunk-overlap", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--real-embeddings", action="store_true",
+                        help=f"use {yp.EMBEDDING_MODEL_NAME} (must already be in the local HF cache)")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    model_load_seconds = 0.0
+    if args.real_embeddings:
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        embedding_model = yp.EMBEDDING_MODEL_NAME
+        start = time.perf_counter()
+        yp.get_embedding_model(embedding_model)
+        model_load_seconds = time.perf_counter() - start
+    else:
+        yp.register_embedding_model(HASHING_MODEL_NAME, HashingEmbeddings())
+        embedding_model = HASHING_MODEL_NAME
+
+    results = [
+        bench_size(n_words, embedding_model, args.chunk_size, args.chunk_overlap, args.queries)
+        for n_words in args.words
+    ]
+
+    print(f"embeddings: {embedding_model} (model load {model_load_seconds:.2f}s, paid once per dense process)")
+    print(f"{'words':>8} {'chunks':>7} | {'bm25 ingest':>11} {'index KB':>9} {'query':>8} | "
+          f"{'dense ingest':>12} {'index KB':>9} {'query':>8} | {'hybrid query':>12}")
+    for row in results:
+        bm25, dense = row['bm25'], row['dense']
+        print(f"{row['words']:>8,} {row['chunks']:>7,} | "
+              f"{bm25['ingest_seconds'] * 1000:>9.1f}ms {bm25['index_memory_bytes'] / 1024:>9.1f} "
+              f"{bm25['query_median_ms']:>6.2f}ms | "
+              f"{dense['ingest_seconds'] * 1000:>10.1f}ms {dense['index_memory_bytes'] / 1024:>9.1f} "
+              f"{dense['query_median_ms']:>6.2f}ms | {row['hybrid']['query_median_ms']:>10.2f}ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'embedding_model': embedding_model, 'model_load_seconds': model_load_seconds,
+                       'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
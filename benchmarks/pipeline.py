@@ -0,0 +1,266 @@
+"""
+Stage-level pipeline benchmark
+===============================
+Times every ingestion and query stage separately on synthetic transcripts,
+fully offline: YouTubeTranscriptApi is replaced by a local stub, the LLM by
+a fake chat model and (unless --real-embeddings) the MiniLM encoder by a
+deterministic hashing embedder.
+
+Stages: get_transcript (cold and cached), create_chunks (splitter and
+segment chunker), embedding, FAISS build, retrieval (cold and memoized),
+context assembly (assemble_context within --context-tokens, as the chain
+does), prompt assembly and a full chain call with the fake LLM.
+
+The report is JSON so runs can be compared between commits:
+
+USAGE:
+    python benchmarks/pipeline.py --json before.json
+    python benchmarks/pipeline.py --json after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+# Keep every cache of this run in a throwaway directory
+os.environ["YT_RAG_CACHE_DIR"] = tempfile.mkdtemp(prefix="yt-rag-bench-")
+
+import numpy as np  # noqa: E402
+from langchain_core.embeddings import Embeddings  # noqa: E402
+from langchain_core.language_models.fake_chat_models import FakeListChatModel  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import transcript_cache  # noqa: E402
+import youtube_processor as yp  # noqa: E402
+from benchmarks.synthetic import make_segments  # noqa: E402
+from context_builder import DEFAULT_CONTEXT_TOKENS, assemble_context  # noqa: E402
+from index_factory import build_vector_store, describe_index  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+HASHING_MODEL_NAME = "hashing-384"
+DIM = 384
+
+QUESTIONS = [
+    "What is the main topic of this video?",
+    "Summarize the key points about the training data",
+    "How does the search index work?",
+    "What examples does the speaker give?",
+    "Explain the attention mechanism discussed",
+    "What problems are mentioned with memory?",
+    "What are the results of the experiment?",
+    "Which method is recommended and why?",
+]
+
+
+class HashingEmbeddings(Embeddings):
+    """Bag-of-words hashed into DIM buckets - cheap, deterministic, offline"""
+
+    def _embed(self, text):
+        vector = np.zeros(DIM, dtype=np.float32)
+        for word in text.lower().split():
+            vector[zlib.crc32(word.encode("utf-8")) % DIM] += 1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+class _Snippet:
+    def __init__(self, segment):
+        self.text = segment['text']
+        self.start = segment['start']
+        self.duration = segment['duration']
+
+
+class StubTranscriptApi:
+    """Drop-in for YouTubeTranscriptApi serving registered synthetic transcripts"""
+
+    transcripts = {}
+
+    def fetch(self, video_id, languages=None):
+        return [_Snippet(s) for s in self.transcripts[video_id]]
+
+
+def peak_rss_mb():
+    """Process peak resident set size so far (high-water mark)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def timed(stages, name, fn, repeat=1):
+    """Run fn, record mean seconds and peak RSS under stages[name], return its result"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    stages[name] = {
+        'seconds': (time.perf_counter() - start) / repeat,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    return result
+
+
+def bench_size(n_words, embedding_model, chunk_size, chunk_overlap, queries, max_context_tokens):
+    video_id = f"synthetic-{n_words}"
+    segments = make_segments(n_words, seed=n_words)
+    StubTranscriptApi.transcripts[video_id] = segments
+    stages = {}
+
+    # Ingestion
+    timed(stages, 'get_transcript_cold', lambda: yp.get_transcript(video_id))
+    success, transcript, _ = timed(stages, 'get_transcript_cached', lambda: yp.get_transcript(video_id), repeat=5)
+    assert success, transcript
+
+    timed(stages, 'create_chunks_splitter', lambda: yp.create_chunks(transcript, chunk_size, chunk_overlap))
+    chunks = timed(
+        stages, 'create_chunks_segment',
+        lambda: yp.create_segment_chunks(segments, chunk_size, chunk_overlap, video_id=video_id)
+    )
+
+    embeddings = yp.get_embedding_model(embedding_model)
+    texts = [chunk.page_content for chunk in chunks]
+    vectors, _ = timed(
+        stages, 'embedding',
+        lambda: yp.get_embedding_store(embedding_model).get_or_embed(texts, embeddings)
+    )
+    vector_store = timed(
+        stages, 'faiss_build',
+        lambda: build_vector_store(texts, vectors, embeddings, metadatas=[c.metadata for c in chunks])
+    )
+
+    # Query path
+    questions = [QUESTIONS[i % len(QUESTIONS)] + f" ({i})" for i in range(queries)]
+    retriever = yp.create_retriever(vector_store, embedding_model)
+    start = time.perf_counter()
+    docs = [retriever.invoke(q) for q in questions]
+    stages['retrieval_cold'] = {'seconds': (time.perf_counter() - start) / queries, 'peak_rss_mb': peak_rss_mb()}
+    start = time.perf_counter()
+    for q in questions:
+        retriever.invoke(q)
+    stages['retrieval_memoized'] = {'seconds': (time.perf_counter() - start) / queries, 'peak_rss_mb': peak_rss_mb()}
+
+    contexts = timed(stages, 'context_assembly', lambda: [assemble_context(d, max_context_tokens)[0] for d in docs])
+    stages['context_assembly']['seconds'] /= queries
+    prompt = yp.create_prompt()
+    prompts = timed(
+        stages, 'prompt_assembly',
+        lambda: [prompt.invoke({'context': c, 'question': q}) for c, q in zip(contexts, questions)]
+    )
+    stages['prompt_assembly']['seconds'] /= queries
+
+    llm = FakeListChatModel(responses=["This is a synthetic answer."])
+    chain = yp.create_rag_chain(
+        yp.create_retriever(vector_store, embedding_model), llm=llm, max_context_tokens=max_context_tokens
+    )
+    timed(stages, 'chain_invoke_fake_llm', lambda: chain.invoke(questions[0]))
+
+    return {
+        'words': n_words,
+        'segments': len(segments),
+        'chunks': len(chunks),
+        'prompt_chars': sum(len(p.to_string()) for p in prompts) // max(1, queries),
+        'index': describe_index(vector_store.index),
+        'stages': stages,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    """Print per-stage time ratios against a previous report"""
+    before = {row['words']: row['stages'] for row in baseline['results']}
+    print(f"\nCompared with {baseline['meta'].get('git_commit')} (ratio < 1.0 is faster):")
+    for row in report['results']:
+        old = before.get(row['words'])
+        if old is None:
+            continue
+        ratios = [
+            f"{name}={stage['seconds'] / old[name]['seconds']:.2f}"
+            for name, stage in row['stages'].items()
+            if name in old and old[name]['seconds'] > 0
+        ]
+        print(f"  {row['words']:>8,} words: " + ", ".join(ratios))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline stage-level benchmark of the RAG pipeline")
+    parser.add_argument("--words", type=int, nargs="+", default=[1000, 10000, 100000, 500000])
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--chunk-overlap", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--context-tokens", type=int, default=DEFAULT_CONTEXT_TOKENS,
+                        help="prompt context budget, as in the chain")
+    parser.add_argument("--real-embeddings", action="store_true",
+                        help=f"use {yp.EMBEDDING_MODEL_NAME} (must already be in the local HF cache)")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--compare", help="previous report to compare against")
+    args = parser.parse_args(argv)
+
+    transcript_cache.YouTubeTranscriptApi = StubTranscriptApi
+    if args.real_embeddings:
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        embedding_model = yp.EMBEDDING_MODEL_NAME
+    else:
+        yp.register_embedding_model(HASHING_MODEL_NAME, HashingEmbeddings())
+        embedding_model = HASHING_MODEL_NAME
+
+    report = {
+        'meta': {
+            'git_commit': git_commit(),
+            'timestamp': time.time(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'embedding_model': embedding_model,
+            'chunk_size': args.chunk_size,
+            'chunk_overlap': args.chunk_overlap,
+            'queries': args.queries,
+            'context_tokens': args.context_tokens,
+        },
+        'results': [],
+    }
+
+    for n_words in args.words:
+        row = bench_size(
+            n_words, embedding_model, args.chunk_size, args.chunk_overlap, args.queries, args.context_tokens
+        )
+        report['results'].append(row)
+        print(f"\n{n_words:,} words -> {row['chunks']:,} chunks ({row['index']['index_type']} index)")
+        for name, stage in row['stages'].items():
+            print(f"   {name:<24} {stage['seconds'] * 1000:>10.3f} ms   peak RSS {stage['peak_rss_mb'] or 0:>7.1f} MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Progressive ingestion benchmark
+================================
+How long a user waits before the first question can be answered, building
+the index in one go (create_vector_store) vs batch by batch
+(create_progressive_vector_store), plus what streaming costs in total build
+time and saves in peak memory:
+
+- first query: seconds until a retriever is searchable (the whole build
+  for the one-shot path, the first batch for the progressive one)
+- total: seconds until the whole video is indexed
+- peak memory: tracemalloc peak during the build (Python and numpy
+  allocations; FAISS's own buffers are not traced)
+
+The embedder is the offline hashing one, slowed down by --embed-ms per
+chunk to stand in for the real encoder. Every build starts from an empty
+embedding store so nothing is served from the cache.
+
+USAGE:
+    python benchmarks/progressive_ingest.py --words 20000 100000 300000 --batch 64 --embed-ms 2
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.pipeline import HASHING_MODEL_NAME, HashingEmbeddings  # noqa: E402
+from benchmarks.synthetic import make_segments  # noqa: E402
+from embedding_backends import embedding_model_id  # noqa: E402
+from embedding_cache import EmbeddingStore  # noqa: E402
+from progressive_index import DEFAULT_INGEST_BATCH_CHUNKS  # noqa: E402
+import youtube_processor as yp  # noqa: E402
+
+
+class SlowHashingEmbeddings(HashingEmbeddings):
+    """Hashing embedder that takes embed_ms per text, like a real encoder would"""
+
+    def __init__(self, embed_ms):
+        self.embed_ms = embed_ms
+
+    def embed_documents(self, texts):
+        time.sleep(len(texts) * self.embed_ms / 1000)
+        return super().embed_documents(texts)
+
+
+def fresh_embedding_store():
+    """Start from an empty embedding store so every chunk is really embedded"""
+    yp._embedding_stores[HASHING_MODEL_NAME] = EmbeddingStore(
+        embedding_model_id(HASHING_MODEL_NAME), cache_dir=tempfile.mkdtemp(prefix="yt-rag-bench-")
+    )
+
+
+def timed_build(build):
+    """Run build(on_progress); returns (first query seconds, total seconds, peak bytes)"""
+    first_query = []
+    start = time.perf_counter()
+
+    def on_progress(stage, done=None, total=None, partial=None):
+        if partial is not None and not first_query:
+            first_query.append(time.perf_counter() - start)
+
+    fresh_embedding_store()
+    tracemalloc.start()
+    build(on_progress)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total = time.perf_counter() - start
+    return (first_query[0] if first_query else total), total, peak
+
+
+def bench_size(n_words, chunk_size, chunk_overlap, batch_size, index_type):
+    segments = make_segments(n_words, seed=n_words)
+    chunks = yp.create_segment_chunks(segments, chunk_size, chunk_overlap, video_id=f"synthetic-{n_words}")
+
+    one_shot = timed_build(lambda on_progress: yp.create_vector_store(
+        chunks, HASHING_MODEL_NAME, index_type=index_type, on_progress=on_progress
+    ))
+    progressive = timed_build(lambda on_progress: yp.create_progressive_vector_store(
+        chunks, HASHING_MODEL_NAME, index_type=index_type, on_progress=on_progress, batch_size=batch_size
+    ))
+    return {
+        'words': n_words,
+        'chunks': len(chunks),
+        'video_minutes': segments[-1]['start'] / 60,
+        'one_shot': dict(zip(('first_query_seconds', 'total_seconds', 'peak_bytes'), one_shot)),
+        'progressive': dict(zip(('first_query_seconds', 'total_seconds', 'peak_bytes'), progressive)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time to first answerable question, one-shot vs progressive indexing")
+    parser.add_argument("--words", type=int, nargs="+", default=[20000, 100000, 300000])
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--chunk-overlap", type=int, default=100)
+    parser.add_argument("--batch", type=int, default=DEFAULT_INGEST_BATCH_CHUNKS, help="chunks per progressive batch")
+    parser.add_argument("--embed-ms", type=float, default=2.0, help="simulated encoder time per chunk")
+    parser.add_argument("--index-type", default="flat")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    yp.register_embedding_model(HASHING_MODEL_NAME, SlowHashingEmbeddings(args.embed_ms))
+    results = [
+        bench_size(n_words, args.chunk_size, args.chunk_overlap, args.batch, args.index_type)
+        for n_words in args.words
+    ]
+
+    print(f"{args.embed_ms:.1f} ms per chunk, batches of {args.batch}, {args.index_type} index\n")
+    print(f"{'words':>8} {'chunks':>7} {'video':>8} | {'one-shot first/total':>20} {'peak':>8} | "
+          f"{'progressive first/total':>23} {'peak':>8}")
+    for row in results:
+        one, prog = row['one_shot'], row['progressive']
+        print(f"{row['words']:>8,} {row['chunks']:>7,} {row['video_minutes']:>6.0f} m | "
+              f"{one['first_query_seconds']:>9.2f} / {one['total_seconds']:>6.2f} s {one['peak_bytes'] / 2**20:>6.1f}MB | "
+              f"{prog['first_query_seconds']:>12.2f} / {prog['total_seconds']:>6.2f} s {prog['peak_bytes'] / 2**20:>6.1f}MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Quantized index benchmark
+==========================
+Compares every index type against the exact float32 flat index on chunk
+vectors of synthetic benchmark transcripts: recall@k, index memory (as
+serialized) and single-query search latency.
+
+Queries are short word windows taken from random chunks, embedded with the
+same model as the chunks. Runs offline with the deterministic hashing
+embedder unless --real-embeddings is given.
+
+USAGE:
+    python benchmarks/quantization.py --words 10000 100000 500000
+    python benchmarks/quantization.py --real-embeddings --json quantization.json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import faiss
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.pipeline import HASHING_MODEL_NAME, HashingEmbeddings  # noqa: E402
+from benchmarks.synthetic import make_segments  # noqa: E402
+from index_factory import create_index, describe_index  # noqa: E402
+import youtube_processor as yp  # noqa: E402
+
+INDEX_TYPES = ("flat", "sq8", "pq", "hnsw", "ivfpq")
+
+
+def make_queries(texts, n_queries, window=12, seed=0):
+    """Short word windows from random chunks, like a question about one passage"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n_queries):
+        words = rng.choice(texts).split()
+        start = rng.randrange(max(1, len(words) - window))
+        queries.append(" ".join(words[start:start + window]))
+    return queries
+
+
+def recall_at_k(found, truth):
+    """Fraction of the exact top-k that the index also returned"""
+    hits = sum(len(set(f[f >= 0]) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def bench_type(index_type, vectors, queries, truth, k):
+    start = time.perf_counter()
+    index, resolved = create_index(vectors, index_type=index_type)
+    build_seconds = time.perf_counter() - start
+
+    samples = []
+    found = []
+    for query in queries:
+        start = time.perf_counter()
+        _, rows = index.search(query.reshape(1, -1), k)
+        samples.append((time.perf_counter() - start) * 1000)
+        found.append(rows[0])
+
+    return {
+        'index_type': resolved,
+        'recall_at_k': recall_at_k(np.array(found), truth),
+        'serialized_bytes': int(faiss.serialize_index(index).nbytes),
+        'estimated_bytes': describe_index(index)['index_memory_bytes'],
+        'build_seconds': build_seconds,
+        'query_median_ms': statistics.median(samples),
+    }
+
+
+def run(word_counts, embedding_model, chunk_size, chunk_overlap, n_queries, k):
+    embeddings = yp.get_embedding_model(embedding_model)
+    results = []
+    for n_words in word_counts:
+        chunks = yp.create_segment_chunks(make_segments(n_words, seed=n_words), chunk_size, chunk_overlap)
+        texts = [chunk.page_content for chunk in chunks]
+        vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+        queries = np.asarray(embeddings.embed_documents(make_queries(texts, n_queries)), dtype=np.float32)
+
+        exact = faiss.IndexFlatL2(vectors.shape[1])
+        exact.add(vectors)
+        _, truth = exact.search(queries, k)
+
+        results.append({
+            'words': n_words,
+            'chunks': len(chunks),
+            # Chunk text held by the LangChain docstore next to the index
+            'text_bytes': sum(len(text.encode("utf-8")) for text in texts),
+            'types': {index_type: bench_type(index_type, vectors, queries, truth, k) for index_type in INDEX_TYPES},
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recall vs memory/latency of quantized FAISS indexes")
+    parser.add_argument("--words", type=int, nargs="+", default=[10000, 100000, 500000])
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--chunk-overlap", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--real-embeddings", action="store_true",
+                        help=f"use {yp.EMBEDDING_MODEL_NAME} (must already be in the local HF cache)")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.real_embeddings:
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        embedding_model = yp.EMBEDDING_MODEL_NAME
+    else:
+        yp.register_embedding_model(HASHING_MODEL_NAME, HashingEmbeddings())
+        embedding_model = HASHING_MODEL_NAME
+
+    results = run(args.words, embedding_model, args.chunk_size, args.chunk_overlap, args.queries, args.k)
+
+    for row in results:
+        print(f"\n{row['words']:,} words -> {row['chunks']:,} chunks "
+              f"(chunk text {row['text_bytes'] / 1024:.0f} KB, embeddings: {embedding_model})")
+        print(f"   {'type':<8} {'recall@' + str(args.k):>10} {'index KB':>10} {'vs flat':>8} {'query p50':>10}")
+        flat_bytes = row['types']['flat']['serialized_bytes']
+        for requested, stats in row['types'].items():
+            label = requested if stats['index_type'] == requested else f"{requested}*"
+            print(f"   {label:<8} {stats['recall_at_k']:>10.3f} {stats['serialized_bytes'] / 1024:>10.1f} "
+                  f"{stats['serialized_bytes'] / flat_bytes:>8.2f} {stats['query_median_ms']:>8.3f}ms")
+    print("\n* fell back to another type (too few vectors to train it)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'embedding_model': embedding_model, 'k': args.k, 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
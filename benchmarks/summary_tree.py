@@ -0,0 +1,148 @@
+"""
+Precomputed summary tree benchmark
+===================================
+What building the map-reduce summary tree at ingest costs, against what it
+saves every time a summary quick action is clicked:
+
+- ingest: wall time, LLM calls and prompt tokens of build_summary_tree
+- query:  a summary question through the RAG chain (retrieval + one LLM
+          call over the top-k context) vs reading the precomputed answer
+- coverage: share of the transcript the answer was based on
+
+The LLM is a fake chat model that sleeps --llm-latency seconds per call, so
+the numbers show the orchestration (parallelism, call counts) rather than
+Gemini's speed; prompt tokens are estimated as everywhere else (chars / 4).
+Runs offline with the hashing embedder.
+
+USAGE:
+    python benchmarks/summary_tree.py --words 5000 50000 200000 --llm-latency 0.5
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel  # noqa: E402
+
+from benchmarks.pipeline import HASHING_MODEL_NAME, HashingEmbeddings  # noqa: E402
+from benchmarks.synthetic import make_segments  # noqa: E402
+from context_builder import CHARS_PER_TOKEN, estimate_tokens  # noqa: E402
+from index_factory import build_vector_store  # noqa: E402
+from summary_tree import (  # noqa: E402
+    DEFAULT_FANOUT, DEFAULT_GROUP_TOKENS, DEFAULT_SUMMARY_CONCURRENCY, build_summary_tree, summary_answer
+)
+import youtube_processor as yp  # noqa: E402
+
+_meter_lock = threading.Lock()
+
+SUMMARY_QUESTION = "Provide a comprehensive and detailed summary of this video, covering all major points"
+
+
+class MeteredChatModel(FakeListChatModel):
+    """Fake chat model that counts calls and estimated prompt tokens"""
+
+    calls: int = 0
+    prompt_tokens: int = 0
+
+    def _call(self, messages, *args, **kwargs):
+        with _meter_lock:
+            self.calls += 1
+            self.prompt_tokens += sum(estimate_tokens(str(message.content)) for message in messages)
+        return super()._call(messages, *args, **kwargs)
+
+
+def make_llm(latency):
+    return MeteredChatModel(responses=["A short synthetic summary of the given text. " * 8], sleep=latency)
+
+
+def bench_size(n_words, chunk_size, chunk_overlap, latency, group_tokens, fanout, concurrency):
+    segments = make_segments(n_words, seed=n_words)
+    transcript_chars = len(" ".join(segment['text'] for segment in segments))
+    chunks = yp.create_segment_chunks(segments, chunk_size, chunk_overlap, video_id=f"synthetic-{n_words}")
+
+    # Ingest: the summary tree
+    llm = make_llm(latency)
+    start = time.perf_counter()
+    tree = build_summary_tree(chunks, llm, group_tokens=group_tokens, fanout=fanout, max_concurrency=concurrency)
+    build_seconds = time.perf_counter() - start
+    build_calls, build_tokens = llm.calls, llm.prompt_tokens
+
+    # Query: one summary click through the RAG chain...
+    texts = [chunk.page_content for chunk in chunks]
+    embeddings = yp.get_embedding_model(HASHING_MODEL_NAME)
+    vectors = embeddings.embed_documents(texts)
+    vector_store = build_vector_store(texts, vectors, embeddings, metadatas=[c.metadata for c in chunks])
+    llm = make_llm(latency)
+    chain = yp.create_rag_chain(yp.create_retriever(vector_store, HASHING_MODEL_NAME), llm=llm)
+    usage = {}
+    start = time.perf_counter()
+    chain.invoke(SUMMARY_QUESTION, config={'configurable': {'usage': usage}})
+    rag_seconds = time.perf_counter() - start
+    rag_context_chars = usage.get('context_tokens', 0) * CHARS_PER_TOKEN
+
+    # ...vs reading the precomputed answer
+    start = time.perf_counter()
+    summary_answer(tree, "summary")
+    served_seconds = time.perf_counter() - start
+
+    saved = rag_seconds - served_seconds
+    return {
+        'words': n_words,
+        'chunks': len(chunks),
+        'levels': [len(level) for level in tree['levels']],
+        'ingest': {'seconds': build_seconds, 'llm_calls': build_calls, 'prompt_tokens': build_tokens},
+        'rag_query': {'seconds': rag_seconds, 'llm_calls': llm.calls, 'prompt_tokens': llm.prompt_tokens,
+                      'coverage': min(1.0, rag_context_chars / transcript_chars)},
+        'precomputed_query': {'seconds': served_seconds, 'llm_calls': 0, 'prompt_tokens': 0, 'coverage': 1.0},
+        # Summary clicks after which the tree has paid for its build time / tokens
+        'break_even_clicks': {
+            'seconds': build_seconds / saved if saved > 0 else None,
+            'tokens': build_tokens / llm.prompt_tokens if llm.prompt_tokens else None,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summary tree ingest overhead vs query-time savings")
+    parser.add_argument("--words", type=int, nargs="+", default=[5000, 50000, 200000])
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--chunk-overlap", type=int, default=100)
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="simulated seconds per LLM call")
+    parser.add_argument("--group-tokens", type=int, default=DEFAULT_GROUP_TOKENS)
+    parser.add_argument("--fanout", type=int, default=DEFAULT_FANOUT)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_SUMMARY_CONCURRENCY)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    yp.register_embedding_model(HASHING_MODEL_NAME, HashingEmbeddings())
+    results = [
+        bench_size(n_words, args.chunk_size, args.chunk_overlap, args.llm_latency,
+                   args.group_tokens, args.fanout, args.concurrency)
+        for n_words in args.words
+    ]
+
+    print(f"LLM latency {args.llm_latency:.2f}s/call, {args.concurrency} concurrent calls, "
+          f"sections of ~{args.group_tokens} tokens, fanout {args.fanout}\n")
+    print(f"{'words':>8} {'levels':<16} | {'ingest s':>8} {'calls':>6} {'tokens':>8} | "
+          f"{'RAG click s':>11} {'tokens':>7} {'coverage':>8} | {'tree click':>10} | {'break-even clicks':>17}")
+    for row in results:
+        ingest, rag = row['ingest'], row['rag_query']
+        even = row['break_even_clicks']
+        print(f"{row['words']:>8,} {'/'.join(map(str, row['levels'])):<16} | "
+              f"{ingest['seconds']:>8.2f} {ingest['llm_calls']:>6} {ingest['prompt_tokens']:>8,} | "
+              f"{rag['seconds']:>11.2f} {rag['prompt_tokens']:>7,} {rag['coverage']:>8.1%} | "
+              f"{row['precomputed_query']['seconds'] * 1e6:>8.1f}us | "
+              f"{even['seconds'] or 0:>7.1f} s {even['tokens'] or 0:>6.1f} tok")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Synthetic transcripts for offline benchmarks
+=============================================
+Generates caption-like segments (a few words each, ~3 seconds apart) so the
+pipeline can be timed without touching YouTube.
+"""
+
+import random
+
+VOCABULARY = (
+    "the a of and to in is that it for on with as this was you we are be at "
+    "model data network training learning vector index query answer video "
+    "lecture example problem result function system memory search embedding "
+    "transformer attention token context summary chapter concept method"
+).split()
+
+
+def make_segments(n_words, words_per_segment=(6, 14), seconds_per_segment=3.0, seed=0):
+    """Return transcript segments totalling n_words words"""
+    rng = random.Random(seed)
+    segments = []
+    remaining = n_words
+    while remaining > 0:
+        count = min(remaining, rng.randint(*words_per_segment))
+        segments.append({
+            'text': " ".join(rng.choice(VOCABULARY) for _ in range(count)),
+            'start': len(segments) * seconds_per_segment,
+            'duration': seconds_per_segment,
+        })
+        remaining -= count
+    return segments
@@ -0,0 +1,140 @@
+"""
+Token-budgeted context assembly
+================================
+Turns the retrieved chunks into the prompt context:
+
+1. Near-duplicates are dropped and the rest re-ranked by maximal marginal
+   relevance (retrieval rank vs shared phrases with chunks already picked),
+   so ten chunks that say the same thing don't crowd out everything else.
+2. Chunks are added in that order while the context fits the token budget.
+3. Picked chunks that touch or overlap in the transcript are merged into one
+   contiguous span, so the chunk_overlap text appears only once.
+
+Token counts are estimated (about 4 characters per token for Gemini), which
+is good enough for budgeting and reporting without a tokenizer call.
+"""
+
+import os
+import re
+
+DEFAULT_CONTEXT_TOKENS = int(os.getenv("YT_RAG_CONTEXT_TOKENS", "1500"))
+CHARS_PER_TOKEN = 4
+
+# MMR trade-off: 1.0 keeps retrieval order, 0.0 only maximizes diversity
+DEFAULT_MMR_LAMBDA = 0.7
+# Jaccard similarity of word 3-gram sets above which a chunk is a duplicate
+NEAR_DUPLICATE_THRESHOLD = 0.6
+SHINGLE_WORDS = 3
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def estimate_tokens(text):
+    """Approximate LLM token count of a text"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _shingles(text):
+    """Set of word n-grams - unlike single words, these only match shared phrasing"""
+    words = _WORD_RE.findall(text.lower())
+    return frozenset(zip(*(words[i:] for i in range(SHINGLE_WORDS))))
+
+
+def _jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def rerank_mmr(docs, lambda_=DEFAULT_MMR_LAMBDA, duplicate_threshold=NEAR_DUPLICATE_THRESHOLD):
+    """
+    Order docs by maximal marginal relevance, dropping near-duplicates
+    Relevance is the retrieval rank (docs arrive best first)
+    Returns: (reranked docs, number of duplicates dropped)
+    """
+    shingles = [_shingles(doc.page_content) for doc in docs]
+    relevance = [1 - i / len(docs) for i in range(len(docs))]
+    remaining = list(range(len(docs)))
+    picked = []
+    dropped = 0
+    while remaining:
+        best, best_score = None, None
+        for i in list(remaining):
+            redundancy = max((_jaccard(shingles[i], shingles[j]) for j in picked), default=0.0)
+            if redundancy >= duplicate_threshold:
+                remaining.remove(i)
+                dropped += 1
+                continue
+            score = lambda_ * relevance[i] - (1 - lambda_) * redundancy
+            if best_score is None or score > best_score:
+                best, best_score = i, score
+        if best is None:
+            break
+        picked.append(best)
+        remaining.remove(best)
+    return [docs[i] for i in picked], dropped
+
+
+def merge_spans(docs):
+    """
+    Merge docs that touch or overlap in their transcript into contiguous spans
+    Docs need 'start_index' metadata (character offset) to be merged; spans
+    are returned in transcript order per video, other docs are kept as-is
+    Returns: list of span texts
+    """
+    positioned = [doc for doc in docs if doc.metadata.get('start_index') is not None]
+    others = [doc.page_content for doc in docs if doc.metadata.get('start_index') is None]
+    positioned.sort(key=lambda doc: (str(doc.metadata.get('video_id', "")), doc.metadata['start_index']))
+
+    spans = []
+    current = None
+    for doc in positioned:
+        video_id = doc.metadata.get('video_id')
+        start = doc.metadata['start_index']
+        text = doc.page_content
+        if current is not None and current['video_id'] == video_id and start <= current['end'] + 1:
+            overlap = current['end'] - start
+            if overlap >= len(text):
+                continue  # already inside the current span
+            if overlap <= 0:
+                # Adjacent chunks: at most the joining space lies between them
+                current['text'] += " " + text
+                current['end'] = start + len(text)
+                continue
+            if current['text'].endswith(text[:overlap]):
+                current['text'] += text[overlap:]
+                current['end'] = start + len(text)
+                continue
+        current = {'video_id': video_id, 'end': start + len(text), 'text': text}
+        spans.append(current)
+    return [span['text'] for span in spans] + others
+
+
+def assemble_context(docs, max_tokens=DEFAULT_CONTEXT_TOKENS, lambda_=DEFAULT_MMR_LAMBDA):
+    """
+    Build the context text for retrieved docs within max_tokens
+    The most relevant chunk is always included (cut to the budget if needed)
+    Returns: (context text, stats dict)
+    """
+    stats = {'retrieved_chunks': len(docs), 'duplicates_dropped': 0, 'context_chunks': 0,
+             'context_spans': 0, 'context_tokens': 0, 'raw_tokens': 0}
+    if not docs:
+        return "", stats
+
+    ranked, stats['duplicates_dropped'] = rerank_mmr(docs, lambda_=lambda_)
+    stats['raw_tokens'] = estimate_tokens("\n\n".join(doc.page_content for doc in docs))
+
+    chosen = [ranked[0]]
+    context = "\n\n".join(merge_spans(chosen))
+    for doc in ranked[1:]:
+        candidate = "\n\n".join(merge_spans(chosen + [doc]))
+        if estimate_tokens(candidate) <= max_tokens:
+            chosen.append(doc)
+            context = candidate
+    if estimate_tokens(context) > max_tokens:
+        context = context[:max_tokens * CHARS_PER_TOKEN]
+
+    stats['context_chunks'] = len(chosen)
+    stats['context_spans'] = len(merge_spans(chosen))
+    stats['context_tokens'] = estimate_tokens(context)
+    return context, stats
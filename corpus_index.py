@@ -0,0 +1,178 @@
+"""
+Multi-video corpus index
+=========================
+Chunks from many videos share one FAISS index. Every chunk is tagged with
+its video_id (plus segment offsets), and queries can be scoped to one video,
+a set of videos or the whole corpus.
+
+Scoped queries don't post-filter a global top-k (which misses results once
+the corpus is large). Small scopes are searched exactly over just their own
+vectors; large scopes use a FAISS ID selector.
+"""
+
+import json
+import os
+from collections import defaultdict
+from typing import Any, Optional
+
+import numpy as np
+from langchain_core.retrievers import BaseRetriever
+
+from index_factory import create_index, describe_index, search_parameters
+from lazy_imports import lazy_module
+
+faiss = lazy_module("faiss")
+
+# Scopes up to this many vectors are searched exactly with numpy. Gathering
+# the scope's vectors costs about as much as a selector search over a
+# 200k-vector corpus at ~1-2k rows (benchmarks/corpus_latency.py --crossover),
+# and small scopes keep exact results on HNSW/IVF indexes
+BRUTE_FORCE_MAX_VECTORS = 2_000
+
+VIDEO_ROWS_FILE = "video_rows.json"
+
+
+class CorpusIndex:
+    """
+    One FAISS index over many videos with per-video row bookkeeping
+    Build first, then serve: add_video must not run concurrently with searches
+    """
+
+    def __init__(self, embeddings, vector_store=None, video_rows=None):
+        self.embeddings = embeddings
+        self.vector_store = vector_store
+        self._video_rows = defaultdict(list)
+        for video_id, rows in (video_rows or {}).items():
+            self._video_rows[video_id] = list(rows)
+
+    def add_video(self, video_id, chunks, vectors):
+        """
+        Add one video's chunks with their precomputed vectors
+        Any previous copy of the video is not removed - call has_video first
+        """
+        if not chunks:
+            return
+        texts = [chunk.page_content for chunk in chunks]
+        metadatas = [dict(chunk.metadata, video_id=video_id) for chunk in chunks]
+        vectors = np.asarray(vectors, dtype=np.float32).tolist()
+
+        if self.vector_store is None:
+            from langchain_community.vectorstores import FAISS
+            self.vector_store = FAISS.from_embeddings(list(zip(texts, vectors)), self.embeddings, metadatas=metadatas)
+            start = 0
+        else:
+            start = self.vector_store.index.ntotal
+            self.vector_store.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas)
+        self._video_rows[video_id].extend(range(start, start + len(chunks)))
+
+    def has_video(self, video_id):
+        return video_id in self._video_rows
+
+    def video_ids(self):
+        return list(self._video_rows)
+
+    def _rows_for(self, video_ids):
+        rows = []
+        for video_id in video_ids:
+            rows.extend(self._video_rows.get(video_id, ()))
+        return np.asarray(rows, dtype=np.int64)
+
+    def _to_documents(self, rows):
+        store = self.vector_store
+        return [
+            store.docstore.search(store.index_to_docstore_id[int(row)])
+            for row in rows if row >= 0
+        ]
+
+    def search_by_vector(self, vector, k=10, video_ids=None):
+        """Top-k documents for a query vector, optionally limited to some videos"""
+        if self.vector_store is None:
+            return []
+        query = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        index = self.vector_store.index
+
+        if video_ids is None:
+            _, found = index.search(query, k)
+            return self._to_documents(found[0])
+
+        rows = self._rows_for(video_ids)
+        if len(rows) == 0:
+            return []
+
+        if len(rows) <= BRUTE_FORCE_MAX_VECTORS:
+            return self._to_documents(self._exact_search(query, rows, k))
+        return self._to_documents(self._selector_search(query, rows, k))
+
+    def _exact_search(self, query, rows, k):
+        """Top-k of rows by L2 distance (like the index), computed over just their vectors"""
+        candidates = self.vector_store.index.reconstruct_batch(rows)
+        distances = ((candidates - query) ** 2).sum(axis=1)
+        return rows[np.argsort(distances)[:k]]
+
+    def _selector_search(self, query, rows, k):
+        """Top-k of rows from the index itself, restricted by an ID selector"""
+        index = self.vector_store.index
+        selector = faiss.IDSelectorBatch(len(rows), faiss.swig_ptr(rows))
+        _, found = index.search(query, k, params=search_parameters(index, selector))
+        return found[0]
+
+    def optimize(self, index_type="auto", **index_kwargs):
+        """
+        Rebuild the index with the type suited to the current corpus size
+        (e.g. flat -> HNSW once it has grown); row numbers stay the same
+        Returns: description of the new index
+        """
+        old_index = self.vector_store.index
+        vectors = old_index.reconstruct_n(0, old_index.ntotal)
+        index, _ = create_index(vectors, index_type=index_type, **index_kwargs)
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            # Needed for reconstruct_batch in scoped searches
+            ivf.make_direct_map()
+        self.vector_store.index = index
+        return describe_index(index)
+
+    def search(self, query, k=10, video_ids=None):
+        """Top-k documents for a question, optionally limited to some videos"""
+        return self.search_by_vector(self.embeddings.embed_query(query), k=k, video_ids=video_ids)
+
+    def as_retriever(self, video_ids=None, k=10):
+        """Retriever for the RAG chain; video_ids=None searches the whole corpus"""
+        return CorpusRetriever(
+            corpus=self,
+            video_ids=list(video_ids) if video_ids is not None else None,
+            k=k
+        )
+
+    def save(self, folder):
+        """Persist the index, docstore and per-video rows"""
+        self.vector_store.save_local(folder)
+        with open(os.path.join(folder, VIDEO_ROWS_FILE), "w", encoding="utf-8") as f:
+            json.dump(self._video_rows, f)
+
+    @classmethod
+    def load(cls, folder, embeddings):
+        from langchain_community.vectorstores import FAISS
+        vector_store = FAISS.load_local(folder, embeddings, allow_dangerous_deserialization=True)
+        with open(os.path.join(folder, VIDEO_ROWS_FILE), encoding="utf-8") as f:
+            video_rows = json.load(f)
+        return cls(embeddings, vector_store, video_rows)
+
+    def stats(self):
+        stats = {'videos': len(self._video_rows), 'vectors': 0}
+        if self.vector_store is not None:
+            stats.update(describe_index(self.vector_store.index))
+            stats['vectors'] = self.vector_store.index.ntotal
+        return stats
+
+
+class CorpusRetriever(BaseRetriever):
+    """Retriever over a CorpusIndex scoped to a fixed set of videos"""
+
+    corpus: Any
+    video_ids: Optional[list] = None
+    k: int = 10
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        return self.corpus.search(query, k=self.k, video_ids=self.video_ids)
+
@@ -0,0 +1,246 @@
+"""
+Embedding backends
+==================
+How chunk texts are turned into vectors, chosen per deployment:
+
+- torch      sentence-transformers on PyTorch (default, same vectors as before)
+- onnx-int8  the same model exported once to ONNX, dynamically quantized to
+             int8 and run with ONNX Runtime on CPU (optional `onnxruntime`,
+             see requirement-onnx.txt)
+
+Both encode in batches of a tunable size; torch can also spread large
+encode calls over a pool of worker processes. Vectors from different
+backends never share a cache entry (see embedding_model_id), and
+check_tolerance compares a backend against the torch reference before a
+deployment switches over.
+
+    YT_RAG_EMBEDDING_BACKEND     torch | onnx-int8 (default torch)
+    YT_RAG_EMBEDDING_BATCH_SIZE  texts per forward pass (default 32)
+    YT_RAG_EMBEDDING_PROCESSES   torch encode processes, 0 = in-process (default 0)
+    YT_RAG_EMBEDDING_DEVICE      torch device, e.g. cpu or cuda:1 (default: CUDA or MPS when present)
+"""
+
+import atexit
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+EMBEDDING_BACKENDS = ("torch", "onnx-int8")
+
+DEFAULT_BACKEND = os.getenv("YT_RAG_EMBEDDING_BACKEND", "torch")
+DEFAULT_BATCH_SIZE = int(os.getenv("YT_RAG_EMBEDDING_BATCH_SIZE", "32"))
+DEFAULT_PROCESSES = int(os.getenv("YT_RAG_EMBEDDING_PROCESSES", "0"))
+# None lets sentence-transformers pick CUDA, then MPS, then CPU
+DEFAULT_DEVICE = os.getenv("YT_RAG_EMBEDDING_DEVICE") or None
+
+# Starting worker processes only pays off for large encode calls
+MULTI_PROCESS_MIN_TEXTS = 256
+
+ONNX_CACHE_DIR = os.path.join(os.getenv("YT_RAG_CACHE_DIR", ".cache"), "onnx")
+ONNX_MODEL_FILE = "model-int8.onnx"
+ONNX_CONFIG_FILE = "embedding_config.json"
+
+# Lowest per-text cosine similarity to the reference a backend may produce
+DEFAULT_MIN_COSINE = 0.99
+
+
+def embedding_model_id(model_name, backend=DEFAULT_BACKEND):
+    """Name used in cache keys, so vectors from different backends never mix"""
+    return model_name if backend == "torch" else f"{model_name}+{backend}"
+
+
+def _clean(texts):
+    # Same preprocessing as langchain's HuggingFaceEmbeddings
+    return [text.replace("\n", " ") for text in texts]
+
+
+class SentenceTransformerEmbeddings(Embeddings):
+    """
+    sentence-transformers model with a fixed batch size and optional process pool
+    The pool runs processes CPU workers, or one worker per GPU on CUDA hosts;
+    on other accelerators (MPS) encoding stays in-process
+    """
+
+    def __init__(self, model_name, batch_size=DEFAULT_BATCH_SIZE, processes=DEFAULT_PROCESSES, device=DEFAULT_DEVICE):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device=device)
+        self.batch_size = batch_size
+        self.processes = processes
+        self._pool = None
+
+    def _use_pool(self, n_texts):
+        if self.processes <= 1 or n_texts < MULTI_PROCESS_MIN_TEXTS:
+            return False
+        return self.model.device.type in ("cpu", "cuda")
+
+    def _get_pool(self):
+        if self._pool is None:
+            # target_devices=None starts one worker per visible GPU
+            devices = ["cpu"] * self.processes if self.model.device.type == "cpu" else None
+            self._pool = self.model.start_multi_process_pool(target_devices=devices)
+            atexit.register(self.model.stop_multi_process_pool, self._pool)
+        return self._pool
+
+    def embed_documents(self, texts):
+        texts = _clean(texts)
+        if self._use_pool(len(texts)):
+            vectors = self.model.encode_multi_process(texts, self._get_pool(), batch_size=self.batch_size)
+        else:
+            vectors = self.model.encode(texts, batch_size=self.batch_size, show_progress_bar=False)
+        return np.asarray(vectors, dtype=np.float32).tolist()
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def export_onnx_int8(model_name, cache_dir=ONNX_CACHE_DIR):
+    """
+    Export a sentence-transformers model to int8 ONNX (once per cache_dir)
+    Needs torch and sentence-transformers for the export only
+    Returns: folder holding the model, tokenizer and pooling config
+    """
+    folder = os.path.join(cache_dir, model_name.replace("/", "--"))
+    if os.path.exists(os.path.join(folder, ONNX_MODEL_FILE)):
+        return folder
+
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    # Traced on CPU: the int8 model runs on ONNX Runtime's CPU provider
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0]
+    pooling = next((module for module in st_model if hasattr(module, "pooling_mode_cls_token")), None)
+    config = {
+        'model_name': model_name,
+        'max_seq_length': transformer.max_seq_length,
+        'pooling': "cls" if pooling is not None and pooling.pooling_mode_cls_token else "mean",
+        'normalize': any(type(module).__name__ == "Normalize" for module in st_model),
+    }
+
+    sample = transformer.tokenizer(["warm up"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+
+    class TokenEmbeddings(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs))).last_hidden_state
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=cache_dir)
+    try:
+        fp32_path = os.path.join(tmp_dir, "model-fp32.onnx")
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names + ["token_embeddings"]}
+        torch.onnx.export(
+            TokenEmbeddings(transformer.auto_model.eval()),
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14
+        )
+        quantize_dynamic(fp32_path, os.path.join(tmp_dir, ONNX_MODEL_FILE), weight_type=QuantType.QInt8)
+        os.remove(fp32_path)
+        transformer.tokenizer.save_pretrained(tmp_dir)
+        with open(os.path.join(tmp_dir, ONNX_CONFIG_FILE), "w", encoding="utf-8") as f:
+            json.dump(config, f)
+        try:
+            os.rename(tmp_dir, folder)
+        except OSError:
+            # Another process exported it first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return folder
+
+
+class OnnxInt8Embeddings(Embeddings):
+    """int8-quantized ONNX export of a sentence-transformers model"""
+
+    def __init__(self, model_name, batch_size=DEFAULT_BATCH_SIZE, cache_dir=ONNX_CACHE_DIR):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError(
+                "The onnx-int8 embedding backend needs onnxruntime: pip install -r requirement-onnx.txt"
+            ) from e
+        from transformers import AutoTokenizer
+
+        folder = export_onnx_int8(model_name, cache_dir)
+        with open(os.path.join(folder, ONNX_CONFIG_FILE), encoding="utf-8") as f:
+            self.config = json.load(f)
+        self.tokenizer = AutoTokenizer.from_pretrained(folder)
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(folder, ONNX_MODEL_FILE), providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [node.name for node in self.session.get_inputs()]
+        self.batch_size = batch_size
+
+    def _encode_batch(self, texts):
+        encoded = self.tokenizer(
+            texts, padding=True, truncation=True, max_length=self.config['max_seq_length'], return_tensors="np"
+        )
+        inputs = {name: encoded[name].astype(np.int64) for name in self.input_names}
+        token_embeddings = self.session.run(["token_embeddings"], inputs)[0]
+        if self.config['pooling'] == "cls":
+            vectors = token_embeddings[:, 0]
+        else:
+            mask = encoded['attention_mask'][..., None].astype(np.float32)
+            vectors = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.config['normalize']:
+            vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        return vectors
+
+    def embed_documents(self, texts):
+        texts = _clean(texts)
+        if not texts:
+            return []
+        # Batch texts of similar length together to keep padding small
+        order = np.argsort([len(text) for text in texts])
+        batches = [order[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        encoded = [self._encode_batch([texts[i] for i in rows]) for rows in batches]
+        vectors = np.empty((len(texts), encoded[0].shape[1]), dtype=np.float32)
+        for rows, batch in zip(batches, encoded):
+            vectors[rows] = batch
+        return vectors.tolist()
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def load_embeddings(model_name, backend=DEFAULT_BACKEND, batch_size=DEFAULT_BATCH_SIZE, processes=DEFAULT_PROCESSES,
+                    device=DEFAULT_DEVICE):
+    """Construct the Embeddings object for a backend (device only applies to torch)"""
+    if backend == "torch":
+        return SentenceTransformerEmbeddings(model_name, batch_size=batch_size, processes=processes, device=device)
+    if backend == "onnx-int8":
+        return OnnxInt8Embeddings(model_name, batch_size=batch_size)
+    raise ValueError(f"Unknown embedding backend: {backend} (expected one of {', '.join(EMBEDDING_BACKENDS)})")
+
+
+def check_tolerance(reference, candidate, texts, min_cosine=DEFAULT_MIN_COSINE):
+    """
+    Compare a candidate backend's vectors with the reference backend's
+    Returns: dict with min/mean cosine similarity, max abs difference and 'ok'
+    """
+    expected = np.asarray(reference.embed_documents(texts), dtype=np.float32)
+    actual = np.asarray(candidate.embed_documents(texts), dtype=np.float32)
+    norms = np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1)
+    cosine = (expected * actual).sum(axis=1) / np.clip(norms, 1e-12, None)
+    return {
+        'texts': len(texts),
+        'min_cosine': float(cosine.min()),
+        'mean_cosine': float(cosine.mean()),
+        'max_abs_diff': float(np.abs(expected - actual).max()),
+        'ok': bool(cosine.min() >= min_cosine),
+    }
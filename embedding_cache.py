@@ -0,0 +1,209 @@
+"""
+Content-addressed embedding store
+==================================
+Chunk vectors are keyed by (model, hash of chunk text), so identical text is
+never embedded twice - across re-processing, re-uploads under another video
+ID or LLM-only setting changes. Vectors live in one append-only float32 or
+float16 file that is memory-mapped for reads; a parallel keys file holds the
+16-byte text digests in row order.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+DEFAULT_CACHE_DIR = os.path.join(os.getenv("YT_RAG_CACHE_DIR", ".cache"), "embeddings")
+DEFAULT_DTYPE = os.getenv("YT_RAG_EMBEDDING_CACHE_DTYPE", "float32")
+DEFAULT_BATCH_SIZE = 64
+
+KEY_BYTES = 16
+META_FILE = "meta.json"
+KEYS_FILE = "keys.bin"
+VECTORS_FILE = "vectors.bin"
+LOCK_FILE = ".lock"
+
+
+def text_digest(text):
+    """Content address of a chunk"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=KEY_BYTES).digest()
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    """Exclusive cross-process lock (no-op where fcntl is unavailable)"""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class EmbeddingStore:
+    """Append-only, memory-mapped vector store for one embedding model"""
+
+    def __init__(self, model_name, cache_dir=DEFAULT_CACHE_DIR, dtype=DEFAULT_DTYPE):
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported embedding cache dtype: {dtype}")
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.model_name = model_name
+        self.dtype = np.dtype(dtype)
+        self.dir = os.path.join(cache_dir, f"{slug}-{dtype}")
+        self._rows = {}
+        self._count = 0
+        self._dim = None
+        self._vectors = None
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0}
+        os.makedirs(self.dir, exist_ok=True)
+        with self._lock:
+            self._refresh()
+
+    def _path(self, name):
+        return os.path.join(self.dir, name)
+
+    def _refresh(self):
+        """Pick up rows appended by this or other processes (caller holds the lock)"""
+        if self._dim is None:
+            try:
+                with open(self._path(META_FILE), encoding="utf-8") as f:
+                    self._dim = json.load(f)['dim']
+            except (OSError, ValueError, KeyError):
+                return
+
+        row_bytes = self._dim * self.dtype.itemsize
+        try:
+            vector_rows = os.path.getsize(self._path(VECTORS_FILE)) // row_bytes
+            with open(self._path(KEYS_FILE), "rb") as f:
+                f.seek(self._count * KEY_BYTES)
+                new_keys = f.read()
+        except OSError:
+            return
+
+        # A row only counts once both its vector and its key are on disk
+        available = min(vector_rows, self._count + len(new_keys) // KEY_BYTES)
+        for row in range(self._count, available):
+            offset = (row - self._count) * KEY_BYTES
+            self._rows.setdefault(new_keys[offset:offset + KEY_BYTES], row)
+
+        if available != self._count or self._vectors is None:
+            self._count = available
+            self._vectors = np.memmap(
+                self._path(VECTORS_FILE), dtype=self.dtype, mode="r", shape=(available, self._dim)
+            ) if available else None
+
+    def _drop_torn_rows(self):
+        """
+        Cut both files back to the rows they have in common (caller holds both locks)
+        An append interrupted between (or during) the two writes leaves vectors
+        without keys or a partial row; appending after them would pair every
+        later key with the wrong vector
+        """
+        row_bytes = self._dim * self.dtype.itemsize
+        sizes = {}
+        for name in (VECTORS_FILE, KEYS_FILE):
+            try:
+                sizes[name] = os.path.getsize(self._path(name))
+            except FileNotFoundError:
+                sizes[name] = 0
+        rows = min(sizes[VECTORS_FILE] // row_bytes, sizes[KEYS_FILE] // KEY_BYTES)
+        for name, size in ((VECTORS_FILE, rows * row_bytes), (KEYS_FILE, rows * KEY_BYTES)):
+            if sizes[name] != size:
+                os.truncate(self._path(name), size)
+
+    def _append(self, digests, vectors):
+        """Append new rows: vectors first, then keys (caller holds both locks)"""
+        if self._dim is None:
+            self._dim = int(vectors.shape[1])
+            with open(self._path(META_FILE), "w", encoding="utf-8") as f:
+                json.dump({'model': self.model_name, 'dim': self._dim, 'dtype': self.dtype.name}, f)
+        self._drop_torn_rows()
+        with open(self._path(VECTORS_FILE), "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=self.dtype).tobytes())
+        with open(self._path(KEYS_FILE), "ab") as f:
+            f.write(b"".join(digests))
+
+    def get_or_embed(self, texts, embeddings, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+        """
+        Return vectors for texts, embedding only the ones not stored yet
+        Misses are embedded and stored batch_size at a time; progress(done, total)
+        is called after each batch (cache hits count as done)
+        Returns: (float32 array of shape (len(texts), dim), number of cache hits)
+        """
+        digests = [text_digest(t) for t in texts]
+        with self._lock:
+            self._refresh()
+            missing = {}
+            for digest, text in zip(digests, texts):
+                if digest not in self._rows:
+                    missing.setdefault(digest, text)
+        hits = sum(1 for d in digests if d not in missing)
+        if progress is not None:
+            progress(hits, len(texts))
+
+        missing_digests = list(missing)
+        missing_texts = list(missing.values())
+        for start in range(0, len(missing_digests), batch_size):
+            batch_digests = missing_digests[start:start + batch_size]
+            # Embed outside the lock so other sessions can keep reading
+            new_vectors = np.asarray(
+                embeddings.embed_documents(missing_texts[start:start + batch_size]), dtype=np.float32
+            )
+            with self._lock, _file_lock(self._path(LOCK_FILE)):
+                self._refresh()
+                keep = [i for i, d in enumerate(batch_digests) if d not in self._rows]
+                if keep:
+                    self._append([batch_digests[i] for i in keep], new_vectors[keep])
+                    self._refresh()
+            if progress is not None:
+                last_batch = start + batch_size >= len(missing_digests)
+                progress(len(texts) if last_batch else hits + start + len(batch_digests), len(texts))
+
+        with self._lock:
+            self._counters['hits'] += hits
+            self._counters['misses'] += len(texts) - hits
+            rows = [self._rows[d] for d in digests]
+            if rows:
+                vectors = np.asarray(self._vectors[rows], dtype=np.float32)
+            else:
+                vectors = np.zeros((0, self._dim or 0), dtype=np.float32)
+        return vectors, hits
+
+    def stats(self):
+        """Return hit/miss counters, hit rate and stored row count"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['rows'] = self._count
+            stats['bytes'] = self._count * (self._dim or 0) * self.dtype.itemsize
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain Embeddings that read document vectors through an EmbeddingStore"""
+
+    def __init__(self, embeddings, store):
+        self.embeddings = embeddings
+        self.store = store
+
+    def embed_documents(self, texts):
+        vectors, _ = self.store.get_or_embed(texts, self.embeddings)
+        return vectors.tolist()
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
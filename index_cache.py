@@ -0,0 +1,217 @@
+"""
+Persistent on-disk cache of built FAISS indexes
+================================================
+Each entry is a directory holding the FAISS index, its docstore and a small
+metadata.json, keyed by (video_id, chunk_size, chunk_overlap, embedding
+model, cache version, index type). Entries are written to a temporary directory and
+renamed into place, so concurrent workers never see a half-written index.
+Results derived from an index (e.g. its summary tree) can be stored in the
+entry as JSON artifacts and are evicted together with it.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+
+from index_factory import DEFAULT_INDEX_TYPE
+
+# Bump whenever chunking or embedding code changes so old indexes are ignored
+CACHE_VERSION = "4"
+
+DEFAULT_CACHE_DIR = os.path.join(os.getenv("YT_RAG_CACHE_DIR", ".cache"), "indexes")
+DEFAULT_MAX_BYTES = int(os.getenv("YT_RAG_INDEX_CACHE_MB", "1024")) * 1024 * 1024
+
+METADATA_FILE = "metadata.json"
+
+# What loading a truncated, hand-copied or foreign entry can raise
+CORRUPT_ENTRY_ERRORS = (ValueError, RuntimeError, EOFError, KeyError, pickle.UnpicklingError)
+
+
+def make_index_key(video_id, chunk_size, chunk_overlap, embedding_model, version=CACHE_VERSION,
+                   index_type=DEFAULT_INDEX_TYPE):
+    """Build a stable cache key for an index"""
+    raw = json.dumps(
+        [video_id, chunk_size, chunk_overlap, embedding_model, version, index_type],
+        separators=(",", ":")
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _dir_size(path):
+    """Total size in bytes of all files under path"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class IndexCache:
+    """Size-bounded LRU cache of FAISS indexes on disk"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0, 'corrupt': 0}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def contains(self, key):
+        """True if a complete entry exists for key (does not count as a hit)"""
+        return os.path.exists(os.path.join(self._entry_dir(key), METADATA_FILE))
+
+    def load(self, key, embeddings):
+        """
+        Load a cached index
+        Returns: (vector_store, metadata) or None on a miss
+        """
+        from langchain_community.vectorstores import FAISS
+
+        entry_dir = self._entry_dir(key)
+        try:
+            with open(os.path.join(entry_dir, METADATA_FILE), encoding="utf-8") as f:
+                metadata = json.load(f)
+            # The docstore is a pickle we wrote ourselves
+            vector_store = FAISS.load_local(
+                entry_dir, embeddings, allow_dangerous_deserialization=True
+            )
+        except OSError:
+            # Missing or being evicted
+            self._count('misses')
+            return None
+        except CORRUPT_ENTRY_ERRORS:
+            # Corrupt: a miss, and the entry is dropped so it gets rebuilt
+            self._count('misses')
+            self._count('corrupt')
+            self.remove(key)
+            return None
+
+        # Touch the entry so LRU eviction sees it as recently used
+        try:
+            os.utime(os.path.join(entry_dir, METADATA_FILE))
+        except OSError:
+            pass
+
+        self._count('hits')
+        return vector_store, metadata
+
+    def save(self, key, vector_store, metadata):
+        """Atomically write an index to the cache, then evict down to max_bytes"""
+        entry_dir = self._entry_dir(key)
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir)
+        try:
+            vector_store.save_local(tmp_dir)
+            # metadata.json is written last: its presence marks a complete entry
+            with open(os.path.join(tmp_dir, METADATA_FILE), "w", encoding="utf-8") as f:
+                json.dump(metadata, f)
+            try:
+                os.rename(tmp_dir, entry_dir)
+            except OSError:
+                # Another worker already stored this key
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                return False
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        self._count('writes')
+        self.evict()
+        return True
+
+    def _artifact_path(self, key, name):
+        return os.path.join(self._entry_dir(key), f"artifact-{name}.json")
+
+    def load_artifact(self, key, name):
+        """Return a JSON artifact stored with an index (None if missing)"""
+        try:
+            with open(self._artifact_path(key, name), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_artifact(self, key, name, data):
+        """
+        Atomically store a JSON artifact with an already cached index
+        Returns False if the index is not in the cache (or was just evicted)
+        """
+        if not self.contains(key):
+            return False
+        path = self._artifact_path(key, name)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+        return True
+
+    def _entries(self):
+        """List (last_used, size, key) for every complete entry"""
+        entries = []
+        for key in os.listdir(self.cache_dir):
+            if key.startswith("."):
+                continue
+            entry_dir = self._entry_dir(key)
+            try:
+                last_used = os.path.getmtime(os.path.join(entry_dir, METADATA_FILE))
+            except OSError:
+                continue
+            entries.append((last_used, _dir_size(entry_dir), key))
+        return entries
+
+    def remove(self, key):
+        """Delete one entry, renaming it aside first so readers never see a partial delete"""
+        trash_dir = os.path.join(self.cache_dir, f".trash-{key}-{time.time_ns()}")
+        try:
+            os.rename(self._entry_dir(key), trash_dir)
+        except OSError:
+            return False
+        shutil.rmtree(trash_dir, ignore_errors=True)
+        return True
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            if self.remove(key):
+                total -= size
+                self._count('evictions')
+
+    def clear(self):
+        """Remove every cached index"""
+        for _, _, key in self._entries():
+            self.remove(key)
+
+    def stats(self):
+        """Return hit/miss counters plus current entry count and size"""
+        entries = self._entries()
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['entries'] = len(entries)
+        stats['bytes'] = sum(size for _, size, _ in entries)
+        return stats
@@ -0,0 +1,206 @@
+"""
+Size-adaptive FAISS index factory
+==================================
+Picks the FAISS index type from the number of vectors:
+
+- flat   exact search, best for single videos (the LangChain default)
+- hnsw   graph index, fast approximate search for long lectures and corpora
+- ivfpq  inverted lists + product quantization, compact for very large corpora
+
+Two quantized storage types trade a little recall for memory at any size:
+
+- sq8    exact scan over 8-bit scalar-quantized vectors (1 byte/dim, 4x smaller)
+- pq     exact scan over product-quantized codes (dim/8 bytes per vector, 32x smaller)
+
+The deployment-wide default is YT_RAG_INDEX_TYPE ("auto" unless set).
+Thresholds and search knobs (nprobe, efSearch) can be overridden per call or
+through environment variables. benchmarks/quantization.py reports the
+recall/memory/latency trade-off of every type.
+"""
+
+import os
+import uuid
+
+import numpy as np
+from langchain_core.documents import Document
+
+from lazy_imports import lazy_module
+
+faiss = lazy_module("faiss")
+
+INDEX_TYPES = ("auto", "flat", "hnsw", "ivfpq", "sq8", "pq")
+DEFAULT_INDEX_TYPE = os.getenv("YT_RAG_INDEX_TYPE", "auto")
+
+FLAT_MAX_VECTORS = int(os.getenv("YT_RAG_FLAT_MAX_VECTORS", "20000"))
+HNSW_MAX_VECTORS = int(os.getenv("YT_RAG_HNSW_MAX_VECTORS", "1000000"))
+
+DEFAULT_HNSW_M = int(os.getenv("YT_RAG_HNSW_M", "32"))
+DEFAULT_EF_CONSTRUCTION = int(os.getenv("YT_RAG_HNSW_EF_CONSTRUCTION", "80"))
+DEFAULT_EF_SEARCH = int(os.getenv("YT_RAG_HNSW_EF_SEARCH", "64"))
+DEFAULT_NPROBE = int(os.getenv("YT_RAG_IVF_NPROBE", "16"))
+DEFAULT_PQ_BITS = 8
+
+# IVF/PQ training uses at most this many vectors per centroid
+TRAINING_SAMPLES_PER_LIST = 64
+
+
+def _training_sample(vectors, size, seed):
+    n = len(vectors)
+    if size >= n:
+        return vectors
+    return vectors[np.random.default_rng(seed).choice(n, size=size, replace=False)]
+
+
+def choose_index_type(n_vectors, flat_max=FLAT_MAX_VECTORS, hnsw_max=HNSW_MAX_VECTORS):
+    """Pick an index type for a corpus of n_vectors"""
+    if n_vectors <= flat_max:
+        return "flat"
+    if n_vectors <= hnsw_max:
+        return "hnsw"
+    return "ivfpq"
+
+
+def _pq_subquantizers(dim):
+    """Largest sub-quantizer count <= dim / 8 that divides dim (384 -> 48)"""
+    for m in range(max(1, dim // 8), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+def apply_search_params(index, nprobe=DEFAULT_NPROBE, ef_search=DEFAULT_EF_SEARCH):
+    """Set query-time knobs; safe to call on any index type (e.g. after loading)"""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = min(nprobe, ivf.nlist)
+    if hasattr(index, "hnsw"):
+        index.hnsw.efSearch = ef_search
+    return index
+
+
+def create_index(vectors, index_type=DEFAULT_INDEX_TYPE, hnsw_m=DEFAULT_HNSW_M, ef_construction=DEFAULT_EF_CONSTRUCTION,
+                 ef_search=DEFAULT_EF_SEARCH, nprobe=DEFAULT_NPROBE, seed=0):
+    """
+    Build and fill a FAISS index for an (n, dim) float32 array
+    "pq" and "ivfpq" need at least 256 vectors to train their codebooks;
+    smaller inputs get "sq8" instead
+    Returns: (index, resolved index type)
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type: {index_type} (expected one of {', '.join(INDEX_TYPES)})")
+    if index_type == "auto":
+        index_type = choose_index_type(n)
+    if index_type in ("pq", "ivfpq") and n < 2 ** DEFAULT_PQ_BITS:
+        index_type = "sq8"
+
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(dim)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, hnsw_m)
+        index.hnsw.efConstruction = ef_construction
+    elif index_type == "sq8":
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_L2)
+        # Only per-dimension min/max are learned, a sample is plenty
+        index.train(_training_sample(vectors, 2 ** DEFAULT_PQ_BITS * TRAINING_SAMPLES_PER_LIST, seed))
+    elif index_type == "pq":
+        index = faiss.IndexPQ(dim, _pq_subquantizers(dim), DEFAULT_PQ_BITS)
+        index.train(_training_sample(vectors, 2 ** DEFAULT_PQ_BITS * TRAINING_SAMPLES_PER_LIST, seed))
+    else:
+        # ~4 * sqrt(n) lists, and never more lists than training points allow
+        nlist = max(1, min(int(4 * np.sqrt(n)), n // 39))
+        quantizer = faiss.IndexFlatL2(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, _pq_subquantizers(dim), DEFAULT_PQ_BITS)
+        sample_size = max(nlist * TRAINING_SAMPLES_PER_LIST, 2 ** DEFAULT_PQ_BITS * 39)
+        index.train(_training_sample(vectors, sample_size, seed))
+
+    index.add(vectors)
+    apply_search_params(index, nprobe=nprobe, ef_search=ef_search)
+    return index, index_type
+
+
+def describe_index(index):
+    """
+    Index type, size, search knobs and estimated memory footprint
+    Returns: dict suitable for process_video metadata
+    """
+    n, dim = index.ntotal, index.d
+    ivf = faiss.try_extract_index_ivf(index)
+    info = {'index_vectors': n}
+
+    if ivf is not None:
+        pq_bytes = getattr(ivf, "code_size", dim * 4)
+        info['index_type'] = "ivfpq" if isinstance(faiss.downcast_index(ivf), faiss.IndexIVFPQ) else "ivf"
+        info['index_nprobe'] = ivf.nprobe
+        info['index_nlist'] = ivf.nlist
+        # codes + 8-byte ids per vector, plus the coarse centroids
+        info['index_memory_bytes'] = n * (pq_bytes + 8) + ivf.nlist * dim * 4
+    elif hasattr(index, "hnsw"):
+        links = index.hnsw.nb_neighbors(0) if n else 0
+        info['index_type'] = "hnsw"
+        info['index_ef_search'] = index.hnsw.efSearch
+        # raw vectors + neighbour links (4 bytes each, level 0 dominates)
+        info['index_memory_bytes'] = n * (dim * 4 + links * 4)
+    else:
+        concrete = faiss.downcast_index(index)
+        if isinstance(concrete, faiss.IndexScalarQuantizer):
+            info['index_type'] = "sq8"
+            info['index_memory_bytes'] = n * concrete.code_size
+        elif isinstance(concrete, faiss.IndexPQ):
+            pq = concrete.pq
+            info['index_type'] = "pq"
+            # codes plus the float32 codebooks (2^nbits centroids per sub-vector)
+            info['index_memory_bytes'] = n * concrete.code_size + pq.ksub * dim * 4
+        else:
+            info['index_type'] = "flat"
+            info['index_memory_bytes'] = n * dim * 4
+    return info
+
+
+def search_parameters(index, selector):
+    """FAISS search parameters carrying an ID selector and the index's own knobs"""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        return faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nprobe)
+    if hasattr(index, "hnsw"):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch)
+    return faiss.SearchParameters(sel=selector)
+
+
+def build_vector_store(texts, vectors, embeddings, metadatas=None, index_type=DEFAULT_INDEX_TYPE, **index_kwargs):
+    """Create a LangChain FAISS store around a size-appropriate index"""
+    from langchain_community.docstore.in_memory import InMemoryDocstore
+    from langchain_community.vectorstores import FAISS
+
+    index, _ = create_index(vectors, index_type=index_type, **index_kwargs)
+
+    metadatas = metadatas or [{} for _ in texts]
+    ids = [str(uuid.uuid4()) for _ in texts]
+    docstore = InMemoryDocstore({
+        doc_id: Document(id=doc_id, page_content=text, metadata=metadata)
+        for doc_id, text, metadata in zip(ids, texts, metadatas)
+    })
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=dict(enumerate(ids))
+    )
+
+
+def add_to_vector_store(vector_store, texts, vectors, metadatas=None):
+    """
+    Append texts and their vectors to a store made by build_vector_store
+    Only for indexes that need no further training (flat, hnsw)
+    """
+    metadatas = metadatas or [{} for _ in texts]
+    ids = [str(uuid.uuid4()) for _ in texts]
+    offset = vector_store.index.ntotal
+    vector_store.index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+    vector_store.docstore.add({
+        doc_id: Document(id=doc_id, page_content=text, metadata=metadata)
+        for doc_id, text, metadata in zip(ids, texts, metadatas)
+    })
+    vector_store.index_to_docstore_id.update({offset + row: doc_id for row, doc_id in enumerate(ids)})
+    return vector_store
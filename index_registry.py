@@ -0,0 +1,251 @@
+"""
+Process-wide registry of shared video indexes
+==============================================
+Every browser session processing the same video with the same chunking and
+embedding model gets the same read-only retriever (and, per LLM setting,
+the same RAG chain and precomputed summary) instead of its own copy.
+
+- Concurrent requests for one key share a single build (single-flight);
+  progress events of that build are forwarded to every waiting caller.
+- Callers hold an IndexLease; entries are reference-counted and only
+  become evictable once every lease was released (or garbage collected,
+  e.g. when a Streamlit session expires).
+- Up to max_idle_entries unreferenced entries are kept for reuse, least
+  recently released first out.
+"""
+
+import os
+import threading
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import Future, wait
+
+DEFAULT_MAX_IDLE_ENTRIES = int(os.getenv("YT_RAG_SHARED_IDLE_INDEXES", "8"))
+# How often a caller waiting for someone else's summary build checks in
+SUMMARY_POLL_SECONDS = 0.5
+
+
+class _Entry:
+    def __init__(self, retriever, metadata):
+        self.retriever = retriever
+        self.metadata = metadata
+        self.refs = 0
+        self.chains = {}
+        self.chains_lock = threading.Lock()
+        # settings -> Future of the summary built (or being built) for them
+        self.summaries = {}
+        self.summaries_lock = threading.Lock()
+
+
+class IndexLease:
+    """
+    One caller's hold on a shared index
+    Treat retriever and metadata as read-only; release() when done
+    """
+
+    def __init__(self, registry, key, entry, shared):
+        self.key = key
+        self.retriever = entry.retriever
+        self.metadata = entry.metadata
+        # True when the index was already built (or being built) for someone else
+        self.shared = shared
+        self._entry = entry
+        self._registry = registry
+        # Leases dropped without release() are only queued: the garbage
+        # collector may run while this thread already holds the registry lock
+        self._finalizer = weakref.finalize(self, registry._pending.append, (key, entry))
+
+    def chain(self, chain_factory, *settings):
+        """
+        Shared chain over this index for one set of LLM settings
+        chain_factory(retriever, *settings) is only called the first time
+        """
+        entry = self._entry
+        with entry.chains_lock:
+            chain = entry.chains.get(settings)
+            if chain is None:
+                chain = chain_factory(entry.retriever, *settings)
+                entry.chains[settings] = chain
+            return chain
+
+    def summary(self, build, *settings, progress=None):
+        """
+        Shared summary of this index for one set of LLM settings
+        build(retriever) is only called the first time; concurrent callers
+        with the same settings wait for it instead of summarizing the video
+        again (calling progress() now and then, which may raise to stop
+        waiting). Builds for other settings run alongside. A failed build is
+        forgotten, so a waiting or later caller builds it again
+        """
+        entry = self._entry
+        while True:
+            with entry.summaries_lock:
+                flight = entry.summaries.get(settings)
+                leader = flight is None
+                if leader:
+                    flight = Future()
+                    entry.summaries[settings] = flight
+
+            if leader:
+                try:
+                    summary = build(entry.retriever)
+                except BaseException as e:
+                    with entry.summaries_lock:
+                        entry.summaries.pop(settings, None)
+                    flight.set_exception(e)
+                    raise
+                flight.set_result(summary)
+                return summary
+
+            while not flight.done():
+                wait([flight], timeout=SUMMARY_POLL_SECONDS)
+                if not flight.done() and progress is not None:
+                    progress()
+            if flight.exception() is None:
+                return flight.result()
+
+    def release(self):
+        """Drop this hold on the index (safe to call more than once)"""
+        if self._finalizer.detach() is not None:
+            self._registry._release(self.key, self._entry)
+
+    @property
+    def released(self):
+        return not self._finalizer.alive
+
+
+class IndexRegistry:
+    """Reference-counted, single-flight map of key -> (retriever, metadata)"""
+
+    def __init__(self, max_idle_entries=DEFAULT_MAX_IDLE_ENTRIES):
+        self.max_idle_entries = max_idle_entries
+        self._entries = {}
+        self._idle = OrderedDict()
+        self._in_flight = {}
+        self._listeners = {}
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._counters = {'builds': 0, 'reused': 0, 'coalesced': 0, 'evictions': 0, 'errors': 0}
+
+    def acquire(self, key, build, progress=None):
+        """
+        Lease the index for key, building it with build(progress) if needed
+        build must return (retriever, metadata); progress(stage, done, total)
+        receives the build's events even when another caller started it
+        Raises whatever build raises
+        Returns: IndexLease
+        """
+        with self._lock:
+            self._drain_pending()
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._counters['reused'] += 1
+                return self._lease(key, entry, shared=True)
+
+            flight = self._in_flight.get(key)
+            if flight is not None:
+                self._counters['coalesced'] += 1
+                leader = False
+            else:
+                flight = Future()
+                self._in_flight[key] = flight
+                self._listeners[key] = []
+                leader = True
+            if progress is not None:
+                self._listeners[key].append(progress)
+
+        if not leader:
+            entry = flight.result()
+            with self._lock:
+                return self._lease(key, entry, shared=True)
+
+        try:
+            retriever, metadata = build(lambda *event: self._broadcast(key, event))
+            entry = _Entry(retriever, metadata)
+            with self._lock:
+                self._counters['builds'] += 1
+                self._entries[key] = entry
+                lease = self._lease(key, entry, shared=False)
+            flight.set_result(entry)
+            return lease
+
+        except Exception as e:
+            with self._lock:
+                self._counters['errors'] += 1
+            flight.set_exception(e)
+            raise
+
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+                self._listeners.pop(key, None)
+
+    def _broadcast(self, key, event):
+        """
+        Forward a build progress event to every waiting caller
+        A listener that raises (e.g. its job was cancelled) is dropped; the
+        build is only aborted once no listener is left
+        """
+        with self._lock:
+            listeners = list(self._listeners.get(key, ()))
+        error = None
+        for listener in listeners:
+            try:
+                listener(*event)
+            except Exception as e:
+                error = e
+                with self._lock:
+                    remaining = self._listeners.get(key, [])
+                    if listener in remaining:
+                        remaining.remove(listener)
+        if error is not None and not self._listeners.get(key):
+            raise error
+
+    def _lease(self, key, entry, shared):
+        """Hand out a lease (caller holds the lock)"""
+        entry.refs += 1
+        self._idle.pop(key, None)
+        return IndexLease(self, key, entry, shared)
+
+    def _release(self, key, entry):
+        with self._lock:
+            self._drain_pending()
+            self._decref(key, entry)
+
+    def _drain_pending(self):
+        """Apply releases queued by garbage-collected leases (caller holds the lock)"""
+        while self._pending:
+            self._decref(*self._pending.popleft())
+
+    def _decref(self, key, entry):
+        """Caller holds the lock"""
+        entry.refs -= 1
+        if entry.refs > 0 or self._entries.get(key) is not entry:
+            return
+        self._idle[key] = entry
+        while len(self._idle) > self.max_idle_entries:
+            old_key, _ = self._idle.popitem(last=False)
+            del self._entries[old_key]
+            self._counters['evictions'] += 1
+
+    def evict_idle(self):
+        """Drop every unreferenced entry; returns how many were dropped"""
+        with self._lock:
+            self._drain_pending()
+            count = len(self._idle)
+            for key in self._idle:
+                del self._entries[key]
+            self._idle.clear()
+            self._counters['evictions'] += count
+            return count
+
+    def stats(self):
+        """Return build/reuse counters plus live and idle entry counts"""
+        with self._lock:
+            self._drain_pending()
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['idle'] = len(self._idle)
+            stats['leases'] = sum(entry.refs for entry in self._entries.values())
+            stats['in_flight'] = len(self._in_flight)
+        return stats
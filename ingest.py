@@ -0,0 +1,189 @@
+"""
+Bulk ingestion CLI
+===================
+Pre-builds and persists FAISS indexes for a list of videos so users never
+wait on the first click.
+
+Transcripts are fetched with a thread pool (I/O bound), then chunked and
+embedded in a process pool (CPU bound). Videos whose index is already in the
+index cache are skipped, so an interrupted run can simply be restarted.
+
+USAGE:
+    python ingest.py videos.txt --fetch-workers 8 --embed-workers 4
+
+videos.txt holds one YouTube URL or video ID per line (# starts a comment).
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from index_cache import make_index_key
+from youtube_processor import (
+    EMBEDDING_MODEL_ID,
+    create_segment_chunks,
+    create_vector_store,
+    extract_video_id_from_url,
+    get_index_cache,
+    get_transcript_segments,
+)
+
+
+def read_video_ids(path):
+    """Read video IDs/URLs from a file, skipping blanks, comments and duplicates"""
+    video_ids = []
+    seen = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            video_id = extract_video_id_from_url(line)
+            if not video_id:
+                print(f"⚠️  Skipping unrecognised entry: {line}", file=sys.stderr)
+                continue
+            if video_id not in seen:
+                seen.add(video_id)
+                video_ids.append(video_id)
+    return video_ids
+
+
+def build_index(video_id, segments, metadata, chunk_size, chunk_overlap):
+    """
+    Chunk, embed and persist one transcript (runs in a worker process)
+    Returns: status dict for the video
+    """
+    start = time.perf_counter()
+    chunks = create_segment_chunks(segments, chunk_size, chunk_overlap, video_id=video_id)
+    metadata = dict(metadata, chunks=len(chunks))
+    vector_store, _ = create_vector_store(chunks)
+    get_index_cache().save(
+        make_index_key(video_id, chunk_size, chunk_overlap, EMBEDDING_MODEL_ID),
+        vector_store,
+        metadata
+    )
+    return {
+        'video_id': video_id,
+        'status': 'done',
+        'chunks': len(chunks),
+        'embed_seconds': time.perf_counter() - start,
+    }
+
+
+def ingest(video_ids, chunk_size=800, chunk_overlap=100, fetch_workers=8, embed_workers=2,
+           status_file=None, force=False):
+    """
+    Ingest many videos in parallel
+    Returns: (list of per-video status dicts, summary dict)
+    """
+    start = time.perf_counter()
+    index_cache = get_index_cache()
+    statuses = []
+
+    def record(status):
+        statuses.append(status)
+        label = {'done': '✅', 'skipped': '⏭️ ', 'failed': '❌'}[status['status']]
+        detail = status.get('error') or f"{status.get('chunks', 0)} chunks"
+        print(f"{label} {status['video_id']}: {status['status']} ({detail})", flush=True)
+        if status_file:
+            with open(status_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(dict(status, timestamp=time.time())) + "\n")
+
+    # Resume: anything already in the index cache is done
+    todo = []
+    for video_id in video_ids:
+        key = make_index_key(video_id, chunk_size, chunk_overlap, EMBEDDING_MODEL_ID)
+        if not index_cache.contains(key):
+            todo.append(video_id)
+        elif force:
+            index_cache.remove(key)
+            todo.append(video_id)
+        else:
+            record({'video_id': video_id, 'status': 'skipped'})
+
+    # spawn, not fork: the fetch threads are already running when workers start
+    mp_context = multiprocessing.get_context("spawn")
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=embed_workers, mp_context=mp_context) as embed_pool:
+        fetches = {fetch_pool.submit(get_transcript_segments, video_id): video_id for video_id in todo}
+        builds = {}
+
+        # Hand each transcript to the embed pool as soon as it arrives
+        for future in as_completed(fetches):
+            video_id = fetches[future]
+            success, segments, metadata = future.result()
+            if not success:
+                record({'video_id': video_id, 'status': 'failed', 'error': segments})
+                continue
+            build = embed_pool.submit(build_index, video_id, segments, metadata, chunk_size, chunk_overlap)
+            builds[build] = video_id
+
+        for future in as_completed(builds):
+            try:
+                record(future.result())
+            except Exception as e:
+                record({'video_id': builds[future], 'status': 'failed', 'error': str(e)})
+
+    elapsed = time.perf_counter() - start
+    done = [s for s in statuses if s['status'] == 'done']
+    total_chunks = sum(s['chunks'] for s in done)
+    summary = {
+        'videos': len(video_ids),
+        'done': len(done),
+        'skipped': sum(1 for s in statuses if s['status'] == 'skipped'),
+        'failed': sum(1 for s in statuses if s['status'] == 'failed'),
+        'chunks': total_chunks,
+        'elapsed_seconds': elapsed,
+        'videos_per_minute': len(done) / elapsed * 60 if elapsed else 0.0,
+        'chunks_per_second': total_chunks / elapsed if elapsed else 0.0,
+    }
+    return statuses, summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-build FAISS indexes for many YouTube videos")
+    parser.add_argument("video_file", help="file with one YouTube URL or video ID per line")
+    parser.add_argument("--chunk-size", type=int, default=800)
+    parser.add_argument("--chunk-overlap", type=int, default=100)
+    parser.add_argument("--fetch-workers", type=int, default=8,
+                        help="threads fetching transcripts")
+    parser.add_argument("--embed-workers", type=int, default=max(1, min(4, (os.cpu_count() or 2) // 2)),
+                        help="processes chunking and embedding")
+    parser.add_argument("--status-file", default=None,
+                        help="append per-video status as JSON lines to this file")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild indexes that are already cached")
+    args = parser.parse_args(argv)
+
+    video_ids = read_video_ids(args.video_file)
+    print("=" * 70)
+    print(f"🎥 Ingesting {len(video_ids)} videos")
+    print("=" * 70)
+
+    _, summary = ingest(
+        video_ids,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        fetch_workers=args.fetch_workers,
+        embed_workers=args.embed_workers,
+        status_file=args.status_file,
+        force=args.force,
+    )
+
+    print("\n" + "=" * 70)
+    print("📊 Summary")
+    print("=" * 70)
+    print(f"   - Done: {summary['done']} | Skipped: {summary['skipped']} | Failed: {summary['failed']}")
+    print(f"   - Chunks embedded: {summary['chunks']:,}")
+    print(f"   - Elapsed: {summary['elapsed_seconds']:.1f}s")
+    print(f"   - Throughput: {summary['videos_per_minute']:.1f} videos/min, "
+          f"{summary['chunks_per_second']:.1f} chunks/sec")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
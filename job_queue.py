@@ -0,0 +1,203 @@
+"""
+Background ingestion jobs
+==========================
+Runs long jobs (process_video) on a bounded worker pool so the Streamlit
+script thread only submits and polls. Every job gets an ID; its status,
+latest progress event and result can be polled from any thread, and a job
+can be cancelled while queued or (cooperatively) while running.
+
+Limits can be set through environment variables:
+    YT_RAG_JOB_WORKERS      jobs running at the same time (default 2)
+    YT_RAG_JOB_QUEUE_DEPTH  jobs waiting for a worker (default 16)
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+DEFAULT_JOB_WORKERS = int(os.getenv("YT_RAG_JOB_WORKERS", "2"))
+DEFAULT_JOB_QUEUE_DEPTH = int(os.getenv("YT_RAG_JOB_QUEUE_DEPTH", "16"))
+# Finished jobs are kept this long (seconds) so their result can be collected
+DEFAULT_JOB_TTL = 3600
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """Raised by submit when the queue already holds max_queued jobs"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job's progress callback once it was cancelled"""
+
+
+class Job:
+    """One submitted job; read it through JobManager.status"""
+
+    def __init__(self, job_id, name):
+        self.id = job_id
+        self.name = name
+        self.state = QUEUED
+        self.progress = None
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self.cancel_event = threading.Event()
+
+    def report(self, event):
+        """Progress callback handed to the job function; stops it once cancelled"""
+        self.progress = event
+        if self.cancel_event.is_set():
+            raise JobCancelled(f"Job {self.id} was cancelled")
+
+    def snapshot(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'state': self.state,
+            'progress': self.progress,
+            'error': self.error,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    Bounded pool of background jobs
+    max_workers jobs run at once and at most max_queued wait for a worker;
+    submitting beyond that raises JobQueueFull instead of piling up work
+    """
+
+    def __init__(self, max_workers=DEFAULT_JOB_WORKERS, max_queued=DEFAULT_JOB_QUEUE_DEPTH,
+                 ttl_seconds=DEFAULT_JOB_TTL):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="yt-rag-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, name=None, **kwargs):
+        """
+        Queue fn(*args, progress_callback=job.report, **kwargs)
+        fn should pass progress events to progress_callback; raising from it
+        (JobCancelled) is how a running job notices cancellation
+        Returns: job ID
+        """
+        with self._lock:
+            self._prune()
+            queued = sum(1 for job in self._jobs.values() if job.state == QUEUED)
+            if queued >= self.max_queued:
+                raise JobQueueFull(f"{queued} jobs are already waiting (limit {self.max_queued})")
+            job = Job(uuid.uuid4().hex, name or getattr(fn, "__name__", "job"))
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def _run(self, job, fn, args, kwargs):
+        with self._lock:
+            if job.cancel_event.is_set():
+                return
+            job.state = RUNNING
+            job.started_at = time.time()
+        try:
+            result = fn(*args, progress_callback=job.report, **kwargs)
+            error = None
+        except Exception as e:
+            result, error = None, str(e)
+        with self._lock:
+            job.finished_at = time.time()
+            if job.cancel_event.is_set():
+                # Functions that swallow JobCancelled still end up cancelled
+                job.state = CANCELLED
+            elif error is not None:
+                job.state, job.error = FAILED, error
+            else:
+                job.state, job.result = DONE, result
+
+    def status(self, job_id):
+        """Snapshot dict of the job, or None for an unknown (or expired) ID"""
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(job_id)
+            return job.snapshot() if job is not None else None
+
+    def result(self, job_id, pop=False):
+        """
+        Return value of a finished job (None while it is still running)
+        pop hands the result over: the manager stops referencing it (and
+        whatever it holds, e.g. an index lease) and later calls return None
+        """
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(job_id)
+            if job is None or job.state != DONE:
+                return None
+            result = job.result
+            if pop:
+                job.result = None
+            return result
+
+    def wait(self, job_id, timeout=None):
+        """Block until a job finished (or timeout seconds passed); returns its status"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        wait([job.future], timeout=timeout)
+        return self.status(job_id)
+
+    def cancel(self, job_id):
+        """
+        Cancel a queued or running job
+        Running jobs stop at their next progress event
+        Returns: True if the job was still active
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state in FINISHED_STATES:
+                return False
+            job.cancel_event.set()
+            if job.state == QUEUED:
+                job.future.cancel()
+                job.state = CANCELLED
+                job.finished_at = time.time()
+            return True
+
+    def _prune(self):
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.state in FINISHED_STATES and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self):
+        with self._lock:
+            counts = {state: 0 for state in (QUEUED, RUNNING) + FINISHED_STATES}
+            for job in self._jobs.values():
+                counts[job.state] += 1
+            counts['max_workers'] = self.max_workers
+            counts['max_queued'] = self.max_queued
+            return counts
+
+    def shutdown(self, cancel_running=False):
+        if cancel_running:
+            with self._lock:
+                for job in self._jobs.values():
+                    job.cancel_event.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
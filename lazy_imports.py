@@ -0,0 +1,61 @@
+"""
+Deferred imports of heavy dependencies
+=======================================
+FAISS, the Gemini client and the embedding stack take seconds to import.
+Modules that only need them inside functions bind them with lazy_module,
+so importing youtube_processor (and the app's first paint) doesn't pay for
+them; the real import happens on first attribute access.
+
+The placeholder already carries the module's dunder attributes (__file__,
+__spec__, ...), so code that merely scans sys.modules - inspect.getmodule,
+Streamlit's REPL check - doesn't trigger the import.
+
+benchmarks/import_time.py checks that these stay unloaded after import.
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+
+_lock = threading.RLock()
+
+
+class _DeferredModule(types.ModuleType):
+    """Stands in for a module in sys.modules until one of its attributes is used"""
+
+    # Class attribute: reading it never triggers the import
+    _deferred = True
+
+    def __getattr__(self, attr):
+        # Only called for attributes the placeholder doesn't have yet
+        with _lock:
+            if self.__dict__.get('_deferred', True):
+                if sys.modules.get(self.__name__) is self:
+                    del sys.modules[self.__name__]
+                module = importlib.import_module(self.__name__)
+                self.__dict__.update(module.__dict__)
+                self._deferred = False
+        return object.__getattribute__(self, attr)
+
+
+def lazy_module(name):
+    """
+    Return module name, importing it only when one of its attributes is used
+    Raises ModuleNotFoundError right away if the module isn't installed
+    """
+    with _lock:
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+        spec = importlib.util.find_spec(name)
+        if spec is None:
+            raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+        module = _DeferredModule(name)
+        module.__spec__ = spec
+        module.__file__ = spec.origin
+        module.__loader__ = spec.loader
+        module.__package__ = spec.parent
+        sys.modules[name] = module
+        return module
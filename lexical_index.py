@@ -0,0 +1,139 @@
+"""
+BM25 lexical retrieval
+=======================
+A compact in-memory BM25 inverted index over transcript chunks, for
+keyword-style questions and short videos where loading the embedding model
+and embedding every chunk is not worth it. Postings are numpy arrays
+(document ids + term frequencies), so an index over a long lecture stays a
+few hundred KB.
+
+HybridRetriever fuses BM25 with a dense retriever by weighted reciprocal
+rank, which needs no score calibration between the two.
+"""
+
+import re
+from collections import Counter, defaultdict
+from typing import Any
+
+import numpy as np
+from langchain_core.retrievers import BaseRetriever
+
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+
+# Standard reciprocal rank fusion constant
+RRF_K = 60
+
+STOPWORDS = frozenset((
+    "a an and are as at be but by for from has have he her his i in is it its of on or "
+    "she so that the their them they this to was we were what when where which who why "
+    "will with you your do does did how can could would should about into than then there"
+).split())
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Lower-cased word tokens without stopwords"""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents"""
+
+    def __init__(self, documents, k1=DEFAULT_K1, b=DEFAULT_B):
+        self.documents = list(documents)
+        self.k1 = k1
+        self.b = b
+
+        postings = defaultdict(list)
+        lengths = np.zeros(len(self.documents), dtype=np.float32)
+        for doc_id, document in enumerate(self.documents):
+            counts = Counter(tokenize(document.page_content))
+            lengths[doc_id] = sum(counts.values())
+            for term, count in counts.items():
+                postings[term].append((doc_id, count))
+
+        n = len(self.documents)
+        self._postings = {}
+        for term, entries in postings.items():
+            ids, tfs = zip(*entries)
+            idf = np.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            self._postings[term] = (np.asarray(ids, dtype=np.int32), np.asarray(tfs, dtype=np.float32), idf)
+        average = lengths.mean() if n else 0.0
+        # Per-document part of the BM25 denominator, computed once
+        self._norms = k1 * (1 - b + b * lengths / average) if average else np.full(n, k1, dtype=np.float32)
+
+    def scores(self, query):
+        """BM25 score of every document for a query"""
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            ids, tfs, idf = posting
+            scores[ids] += idf * tfs * (self.k1 + 1) / (tfs + self._norms[ids])
+        return scores
+
+    def search(self, query, k=10):
+        """Top-k (document, score) pairs with a positive score, best first"""
+        scores = self.scores(query)
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.documents[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def memory_bytes(self):
+        """Approximate size of the postings and per-document arrays"""
+        postings = sum(ids.nbytes + tfs.nbytes for ids, tfs, _ in self._postings.values())
+        return postings + self._norms.nbytes
+
+    def stats(self):
+        return {
+            'documents': len(self.documents),
+            'terms': len(self._postings),
+            'index_memory_bytes': self.memory_bytes(),
+        }
+
+
+class BM25Retriever(BaseRetriever):
+    """Top-k BM25 retriever for the RAG chain"""
+
+    index: Any
+    k: int = 10
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        return [document for document, _ in self.index.search(query, self.k)]
+
+
+def _document_key(document):
+    return document.page_content, document.metadata.get('start_index')
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Weighted reciprocal rank fusion of a BM25 and a dense retriever
+    lexical_weight 0.5 weighs both equally; 1.0 is BM25 only
+    """
+
+    lexical: Any
+    dense: Any
+    k: int = 10
+    lexical_weight: float = 0.5
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        ranked = (
+            (self.lexical_weight, self.lexical.invoke(query)),
+            (1 - self.lexical_weight, self.dense.invoke(query)),
+        )
+        fused = {}
+        documents = {}
+        for weight, results in ranked:
+            for rank, document in enumerate(results):
+                key = _document_key(document)
+                documents.setdefault(key, document)
+                fused[key] = fused.get(key, 0.0) + weight / (RRF_K + rank + 1)
+        best = sorted(fused, key=fused.get, reverse=True)[:self.k]
+        return [documents[key] for key in best]
@@ -0,0 +1,102 @@
+"""
+Progressive ingestion
+======================
+Multi-hour transcripts take minutes to embed. In progressive mode chunks
+are embedded and added to the index batch_size at a time, in transcript
+order, and a ProgressiveRetriever over the partial index is handed out as
+soon as the first batch is searchable:
+
+- questions are answered from whatever part of the video is indexed so far;
+  coverage() says how much that is, so answers can report it
+- only one batch of vectors is held outside the index at a time
+- complete() swaps in the final retriever once the whole video is indexed,
+  so chains built on the partial retriever keep working afterwards
+
+Can be set through environment variables:
+    YT_RAG_PROGRESSIVE_INGEST   "1" to ingest progressively by default
+    YT_RAG_INGEST_BATCH_CHUNKS  chunks embedded and indexed per batch (default 64)
+"""
+
+import os
+import threading
+from typing import Any
+
+from langchain_core.retrievers import BaseRetriever
+from pydantic import PrivateAttr
+
+DEFAULT_PROGRESSIVE_INGEST = os.getenv("YT_RAG_PROGRESSIVE_INGEST", "0") == "1"
+DEFAULT_INGEST_BATCH_CHUNKS = int(os.getenv("YT_RAG_INGEST_BATCH_CHUNKS", "64"))
+
+# Index types vectors can be appended to without (re)training
+STREAMABLE_INDEX_TYPES = ("flat", "hnsw")
+
+
+def chunk_end_time(chunks):
+    """Transcript time (seconds) up to which chunks reach"""
+    return max((chunk.metadata.get('end_time') or 0 for chunk in chunks), default=0)
+
+
+class ProgressiveRetriever(BaseRetriever):
+    """
+    Retriever over an index that is still being filled
+    Searches and appends to the index take turns on one lock
+    """
+
+    retriever: Any
+    total_chunks: int
+    duration: float = 0.0
+
+    _lock: Any = PrivateAttr()
+    _indexed_chunks: int = PrivateAttr(default=0)
+    _covered_seconds: float = PrivateAttr(default=0.0)
+    _complete: bool = PrivateAttr(default=False)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        if self._complete:
+            # Nothing is appended to the final index any more
+            return self.retriever.invoke(query)
+        with self._lock:
+            return self.retriever.invoke(query)
+
+    def extend(self, add, chunks):
+        """Run add() - which appends chunks to the index - between searches and count them as covered"""
+        with self._lock:
+            add()
+            self._indexed_chunks += len(chunks)
+            self._covered_seconds = max(self._covered_seconds, chunk_end_time(chunks))
+
+    def complete(self, retriever=None):
+        """Mark the whole video as indexed, optionally switching to the final retriever"""
+        with self._lock:
+            if retriever is not None:
+                self.retriever = retriever
+            self._indexed_chunks = self.total_chunks
+            self._covered_seconds = max(self._covered_seconds, self.duration)
+            self._complete = True
+
+    def coverage(self):
+        """
+        How much of the video the index holds right now
+        Returns: dict with indexed/total chunks, covered/total seconds,
+        'fraction' (by time when the duration is known) and 'complete'
+        """
+        with self._lock:
+            chunks, seconds, complete = self._indexed_chunks, self._covered_seconds, self._complete
+        if complete:
+            fraction = 1.0
+        elif self.duration:
+            fraction = min(1.0, seconds / self.duration)
+        else:
+            fraction = chunks / self.total_chunks if self.total_chunks else 0.0
+        return {
+            'indexed_chunks': chunks,
+            'total_chunks': self.total_chunks,
+            'covered_seconds': seconds,
+            'duration': self.duration,
+            'fraction': fraction,
+            'complete': complete,
+        }
@@ -0,0 +1,128 @@
+"""
+Query-embedding and retrieval memoization
+==========================================
+Repeated questions (and Streamlit reruns) skip both the encoder forward pass
+and the FAISS search. Query vectors are cached per embedding model; top-k
+results are cached per retriever, keyed by the index size so any change to
+the index invalidates them.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from pydantic import PrivateAttr
+
+DEFAULT_QUERY_CACHE_SIZE = 1024
+DEFAULT_RETRIEVAL_CACHE_SIZE = 256
+
+
+def normalize_query(text):
+    """Collapse whitespace so trivially different spellings share an entry"""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class LRUCache:
+    """Small thread-safe LRU map with hit/miss counters"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return self._data[key]
+            self._misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'entries': len(self._data),
+            }
+
+
+class QueryEmbeddingCache(Embeddings):
+    """Memoizes embed_query for one embedding model"""
+
+    def __init__(self, embeddings, max_entries=DEFAULT_QUERY_CACHE_SIZE):
+        self.embeddings = embeddings
+        self._cache = LRUCache(max_entries)
+
+    def embed_query(self, text):
+        key = normalize_query(text)
+        vector = self._cache.get(key)
+        if vector is None:
+            vector = self.embeddings.embed_query(key)
+            self._cache.put(key, vector)
+        return vector
+
+    def embed_documents(self, texts):
+        return self.embeddings.embed_documents(texts)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
+
+
+class MemoizedRetriever(BaseRetriever):
+    """Top-k similarity retriever over a FAISS store with an LRU of past results"""
+
+    vector_store: Any
+    query_embeddings: Any
+    k: int = 10
+    max_entries: int = DEFAULT_RETRIEVAL_CACHE_SIZE
+
+    _cache: LRUCache = PrivateAttr()
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._cache = LRUCache(self.max_entries)
+
+    def _index_identity(self):
+        # The retriever holds the store, so the index object can't be recycled;
+        # ntotal changes whenever vectors are added
+        index = self.vector_store.index
+        return id(index), index.ntotal
+
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        key = (self._index_identity(), normalize_query(query), self.k)
+        docs = self._cache.get(key)
+        if docs is None:
+            embedding = self.query_embeddings.embed_query(query)
+            docs = self.vector_store.similarity_search_by_vector(embedding, k=self.k)
+            self._cache.put(key, docs)
+        return list(docs)
+
+    def invalidate(self):
+        """Forget all cached results (e.g. after the index was rebuilt in place)"""
+        self._cache.clear()
+
+    def cache_stats(self):
+        return self._cache.stats()
@@ -0,0 +1,196 @@
+"""
+Speculative answers
+====================
+Almost every user clicks a quick action right after a video is processed,
+so their answers can be generated in the background before the click.
+
+- Generations run on a dedicated, process-wide job pool (max_workers LLM
+  calls at once across all sessions) and are capped by an hourly budget;
+  questions beyond the budget are simply not speculated.
+- A SpeculationBatch holds one video's speculative answers. take(question)
+  hands a finished answer over (waiting for one still being generated);
+  cancel() stops the rest, e.g. when the user moves to another video.
+- Answers nobody took are counted as wasted generations, so hit rate and
+  waste can be watched before raising the budget.
+
+Limits can be set through environment variables:
+    YT_RAG_SPECULATIVE_ANSWERS          "1" to speculate in the app by default
+    YT_RAG_SPECULATIVE_WORKERS          concurrent generations (default 2)
+    YT_RAG_SPECULATIVE_BUDGET_PER_HOUR  generations started per hour (default 120)
+"""
+
+import os
+import threading
+import time
+import weakref
+from collections import deque
+
+from job_queue import DONE, QUEUED, RUNNING, JobCancelled, JobManager, JobQueueFull
+
+# Whether the app speculates the quick actions by default
+DEFAULT_SPECULATIVE_ANSWERS = os.getenv("YT_RAG_SPECULATIVE_ANSWERS", "0") == "1"
+DEFAULT_SPECULATIVE_WORKERS = int(os.getenv("YT_RAG_SPECULATIVE_WORKERS", "2"))
+DEFAULT_SPECULATIVE_BUDGET = int(os.getenv("YT_RAG_SPECULATIVE_BUDGET_PER_HOUR", "120"))
+DEFAULT_SPECULATIVE_QUEUE_DEPTH = 32
+
+BUDGET_WINDOW_SECONDS = 3600
+
+
+class SpeculationBatch:
+    """One video's speculative answers; take() them or cancel() the batch"""
+
+    def __init__(self, speculator, jobs):
+        self._speculator = speculator
+        # Kept outside self so it can be settled after a session expired
+        self._state = {'jobs': jobs, 'taken': set()}
+        # Dropped batches are only queued: the garbage collector may run while
+        # this thread already holds the speculator's or the job manager's lock
+        self._finalizer = weakref.finalize(self, speculator._dropped.append, self._state)
+        self._finalizer.atexit = False
+
+    @property
+    def questions(self):
+        return list(self._state['jobs'])
+
+    def take(self, question, timeout=None):
+        """
+        Hand over the speculative answer to question
+        Waits (up to timeout seconds) if it is still being generated; one
+        still waiting for a worker is dropped, as asking now is just as fast
+        Returns: (answer, timings) or None if it wasn't speculated or failed
+        """
+        self._speculator._drain_dropped()
+        job_id = self._state['jobs'].get(question)
+        if job_id is None or question in self._state['taken'] or self.cancelled:
+            return None
+        jobs = self._speculator.jobs
+        if (jobs.status(job_id) or {}).get('state') == QUEUED and jobs.cancel(job_id):
+            self._speculator._count('cancelled_queued')
+            return None
+        status = jobs.wait(job_id, timeout=timeout)
+        if status is None or status['state'] != DONE:
+            return None
+        self._state['taken'].add(question)
+        self._speculator._count('hits')
+        answer, timings = jobs.result(job_id, pop=True)
+        return answer, dict(timings, speculative=True)
+
+    def ready(self):
+        """Questions whose speculative answer is finished and not taken yet"""
+        return [
+            question for question, job_id in self._state['jobs'].items()
+            if question not in self._state['taken']
+            and (self._speculator.jobs.status(job_id) or {}).get('state') == DONE
+        ]
+
+    def cancel(self):
+        """Stop generating and count untaken answers as wasted (safe to call more than once)"""
+        if self._finalizer.detach() is not None:
+            self._speculator._close(self._state)
+
+    @property
+    def cancelled(self):
+        return not self._finalizer.alive
+
+
+class Speculator:
+    """Process-wide pool and budget for speculative generations"""
+
+    def __init__(self, max_workers=DEFAULT_SPECULATIVE_WORKERS, budget_per_hour=DEFAULT_SPECULATIVE_BUDGET,
+                 max_queued=DEFAULT_SPECULATIVE_QUEUE_DEPTH):
+        self.budget_per_hour = budget_per_hour
+        self.jobs = JobManager(max_workers=max_workers, max_queued=max_queued)
+        self._starts = deque()
+        self._dropped = deque()
+        self._lock = threading.Lock()
+        self._counters = {'submitted': 0, 'generated': 0, 'served_from_cache': 0, 'failed': 0, 'hits': 0,
+                          'wasted': 0, 'aborted': 0, 'cancelled_queued': 0, 'budget_skipped': 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _reserve(self):
+        """Take one generation from the hourly budget; False when it is used up"""
+        now = time.time()
+        with self._lock:
+            while self._starts and self._starts[0] <= now - BUDGET_WINDOW_SECONDS:
+                self._starts.popleft()
+            if len(self._starts) >= self.budget_per_hour:
+                return False
+            self._starts.append(now)
+            return True
+
+    def start(self, generate, questions):
+        """
+        Start speculating answers to questions
+        generate(question, timings) must yield the answer's tokens (like
+        youtube_processor.stream_answer) and fill timings
+        Returns: SpeculationBatch
+        """
+        self._drain_dropped()
+        jobs = {}
+        for question in dict.fromkeys(questions):
+            if not self._reserve():
+                self._count('budget_skipped')
+                continue
+            try:
+                jobs[question] = self.jobs.submit(self._generate, generate, question, name="speculative-answer")
+            except JobQueueFull:
+                self._count('budget_skipped')
+                continue
+            self._count('submitted')
+        return SpeculationBatch(self, jobs)
+
+    def _generate(self, generate, question, progress_callback):
+        timings = {}
+        tokens = []
+        try:
+            for token in generate(question, timings):
+                tokens.append(token)
+                # Raises JobCancelled once the batch was cancelled: stop paying for tokens
+                progress_callback({'tokens': len(tokens)})
+        except JobCancelled:
+            self._count('aborted')
+            raise
+        except Exception:
+            self._count('failed')
+            raise
+        self._count('served_from_cache' if 'cache_hit' in timings else 'generated')
+        return "".join(tokens), timings
+
+    def _drain_dropped(self):
+        """Close batches that were garbage collected without cancel() (caller holds no lock)"""
+        while self._dropped:
+            self._close(self._dropped.popleft())
+
+    def _close(self, state):
+        """Cancel what is still pending of a batch and count untaken answers as wasted"""
+        for question, job_id in state['jobs'].items():
+            if question in state['taken']:
+                continue
+            status = self.jobs.status(job_id)
+            if status is None:
+                continue
+            if status['state'] == DONE:
+                _, timings = self.jobs.result(job_id, pop=True)
+                if 'cache_hit' not in timings:
+                    self._count('wasted')
+            elif status['state'] == QUEUED:
+                if self.jobs.cancel(job_id):
+                    self._count('cancelled_queued')
+            elif status['state'] == RUNNING:
+                # Counted as aborted once the generation notices
+                self.jobs.cancel(job_id)
+
+    def stats(self):
+        """Counters plus hit rate (taken / generated) and waste rate"""
+        self._drain_dropped()
+        with self._lock:
+            stats = dict(self._counters)
+            stats['budget_used'] = len(self._starts)
+        stats['budget_per_hour'] = self.budget_per_hour
+        answered = stats['generated'] + stats['served_from_cache']
+        stats['hit_rate'] = stats['hits'] / answered if answered else 0.0
+        stats['waste_rate'] = stats['wasted'] / stats['generated'] if stats['generated'] else 0.0
+        return stats
@@ -0,0 +1,206 @@
+"""
+Precomputed map-reduce summary tree
+====================================
+Summary-type questions ("summarize the whole video", "key insights") need
+the entire transcript, which the top-k retriever can't provide for a long
+video. Instead they are answered once, at ingest time:
+
+1. Map: consecutive chunks are merged into sections of about group_tokens
+   and every section is summarized (in parallel, bounded by max_concurrency).
+2. Reduce: runs of fanout summaries are combined into one, level by level,
+   until at most fanout are left.
+3. The top level is turned into the final answers (one per SUMMARY_KINDS).
+
+The tree is a plain JSON-serializable dict, so it can be stored next to the
+index it was built from and served without any LLM call afterwards.
+"""
+
+import os
+import time
+
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableLambda
+
+from context_builder import estimate_tokens, merge_spans
+
+# Bump whenever the prompts or the tree layout change so stored trees are rebuilt
+SUMMARY_VERSION = "1"
+
+DEFAULT_GROUP_TOKENS = int(os.getenv("YT_RAG_SUMMARY_GROUP_TOKENS", "3000"))
+DEFAULT_FANOUT = 6
+DEFAULT_SUMMARY_CONCURRENCY = int(os.getenv("YT_RAG_SUMMARY_CONCURRENCY", "4"))
+
+MAP_PROMPT = """
+Summarize this part ({start} - {end}) of a YouTube video transcript in a short paragraph.
+Keep the names, numbers, examples and claims that matter; do not add anything
+that is not in the text.
+
+Transcript:
+{text}
+"""
+
+REDUCE_PROMPT = """
+These are summaries of consecutive parts of one YouTube video, in order.
+Combine them into a single summary paragraph of the whole span, keeping the
+main points and their order.
+
+Summaries:
+{text}
+"""
+
+# Final answer per summary kind, built from the top level of the tree
+FINAL_PROMPTS = {
+    'summary': """
+You are a helpful assistant summarizing a YouTube video.
+Using ONLY these summaries of its consecutive parts, write a comprehensive,
+well-structured summary of the whole video covering all major points.
+
+Part summaries:
+{text}
+""",
+    'insights': """
+You are a helpful assistant analyzing a YouTube video.
+Using ONLY these summaries of its consecutive parts, list the most important
+key takeaways and insights of the whole video, each with a short explanation.
+
+Part summaries:
+{text}
+""",
+}
+
+SUMMARY_KINDS = tuple(FINAL_PROMPTS)
+
+
+def format_time(seconds):
+    """Seconds -> "M:SS" (or "H:MM:SS")"""
+    seconds = int(seconds or 0)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def group_chunks(chunks, group_tokens=DEFAULT_GROUP_TOKENS):
+    """
+    Split chunks (in transcript order) into consecutive sections of about group_tokens
+    Overlapping chunk text is merged so it appears once per section
+    Returns: list of {'text', 'start_time', 'end_time'}
+    """
+    ordered = sorted(chunks, key=lambda chunk: chunk.metadata.get('start_index') or 0)
+    groups = []
+    current = []
+    tokens = 0
+    for chunk in ordered:
+        chunk_tokens = estimate_tokens(chunk.page_content)
+        if current and tokens + chunk_tokens > group_tokens:
+            groups.append(current)
+            current, tokens = [], 0
+        current.append(chunk)
+        tokens += chunk_tokens
+    if current:
+        groups.append(current)
+
+    return [
+        {
+            'text': "\n\n".join(merge_spans(group)),
+            'start_time': group[0].metadata.get('start_time', 0),
+            'end_time': group[-1].metadata.get('end_time', 0),
+        }
+        for group in groups
+    ]
+
+
+def _plan_calls(sections, fanout):
+    """Total number of LLM calls a tree over this many sections needs"""
+    calls = sections
+    while sections > fanout:
+        sections = -(-sections // fanout)
+        calls += sections
+    return calls + len(FINAL_PROMPTS)
+
+
+def _run(chain, inputs, max_concurrency, on_done):
+    """Invoke chain on every input concurrently, calling on_done() as each finishes"""
+    outputs = [None] * len(inputs)
+    config = {'max_concurrency': max(1, max_concurrency)}
+    for i, output in chain.batch_as_completed(inputs, config=config):
+        outputs[i] = output
+        on_done()
+    return outputs
+
+
+def build_summary_tree(chunks, llm, group_tokens=DEFAULT_GROUP_TOKENS, fanout=DEFAULT_FANOUT,
+                       max_concurrency=DEFAULT_SUMMARY_CONCURRENCY, progress=None):
+    """
+    Summarize chunks bottom-up into a summary tree
+    At most max_concurrency LLM calls run at once; progress(done, total) is
+    called after every LLM call
+    Returns: tree dict - 'levels' (list of levels, each a list of
+    {'text', 'start_time', 'end_time'}; level 0 are the section summaries),
+    'answers' ({kind: text}), 'llm_calls' and 'build_seconds'
+    """
+    start = time.perf_counter()
+    fanout = max(2, fanout)
+    sections = group_chunks(chunks, group_tokens)
+    total = _plan_calls(len(sections), fanout)
+    done = 0
+
+    def on_done():
+        nonlocal done
+        done += 1
+        if progress is not None:
+            progress(done, total)
+
+    parser = StrOutputParser()
+    map_chain = PromptTemplate.from_template(MAP_PROMPT) | llm | parser
+    reduce_chain = PromptTemplate.from_template(REDUCE_PROMPT) | llm | parser
+
+    summaries = _run(
+        map_chain,
+        [{'text': s['text'], 'start': format_time(s['start_time']), 'end': format_time(s['end_time'])}
+         for s in sections],
+        max_concurrency,
+        on_done
+    )
+    level = [dict(section, text=summary) for section, summary in zip(sections, summaries)]
+    levels = [level]
+
+    while len(level) > fanout:
+        groups = [level[i:i + fanout] for i in range(0, len(level), fanout)]
+        summaries = _run(
+            reduce_chain,
+            [{'text': "\n\n".join(node['text'] for node in group)} for group in groups],
+            max_concurrency,
+            on_done
+        )
+        level = [
+            {'text': summary, 'start_time': group[0]['start_time'], 'end_time': group[-1]['end_time']}
+            for group, summary in zip(groups, summaries)
+        ]
+        levels.append(level)
+
+    top = "\n\n".join(
+        f"[{format_time(node['start_time'])} - {format_time(node['end_time'])}] {node['text']}" for node in level
+    )
+    finals = {kind: PromptTemplate.from_template(prompt) | llm | parser for kind, prompt in FINAL_PROMPTS.items()}
+    answers = _run(
+        RunnableLambda(lambda kind: finals[kind].invoke({'text': top})),
+        list(finals),
+        max_concurrency,
+        on_done
+    )
+
+    return {
+        'version': SUMMARY_VERSION,
+        'levels': levels,
+        'answers': dict(zip(finals, answers)),
+        'llm_calls': done,
+        'build_seconds': time.perf_counter() - start,
+    }
+
+
+def summary_answer(tree, kind):
+    """The precomputed answer of a tree for one of SUMMARY_KINDS (None if missing)"""
+    if not tree or tree.get('version') != SUMMARY_VERSION:
+        return None
+    return tree.get('answers', {}).get(kind)
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DIM = 16
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic bag-of-words vectors, so texts sharing words are close"""
+
+    def embed_query(self, text):
+        vector = np.zeros(DIM, dtype=np.float32)
+        vector[0] = len(text)
+        for word in text.split():
+            vector[1 + sum(map(ord, word)) % (DIM - 1)] += 1
+        return vector.tolist()
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+
+@pytest.fixture
+def embeddings():
+    return FakeEmbeddings()
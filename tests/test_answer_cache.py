@@ -0,0 +1,23 @@
+from answer_cache import SemanticAnswerCache, make_answer_scope
+
+
+def scope(**overrides):
+    settings = dict(retrieval_mode="dense", index_type="flat", max_context_tokens=1500)
+    settings.update(overrides)
+    return make_answer_scope("vid", 800, 100, "model", "gemini", 0.2, **settings)
+
+
+def test_scope_covers_retrieval_settings():
+    base = scope()
+    assert scope() == base
+    for change in ({'retrieval_mode': "hybrid"}, {'index_type': "sq8"}, {'index_type': "ivfpq"},
+                   {'max_context_tokens': 3000}):
+        assert scope(**change) != base
+
+
+def test_answers_are_not_served_across_index_types(embeddings):
+    cache = SemanticAnswerCache(embeddings, similarity_threshold=0.99)
+    cache.store(scope(), "What is the video about?", "answer")
+    assert cache.lookup(scope(), "what is the video about") == ("answer", 'exact', 1.0)
+    assert cache.lookup(scope(index_type="pq"), "What is the video about?") is None
+    assert cache.lookup(scope(max_context_tokens=500), "What is the video about?") is None
@@ -0,0 +1,25 @@
+import youtube_processor as yp
+
+URL = "https://example.com/" + "a" * 120
+
+
+def words(text):
+    return text.split()
+
+
+def test_long_caption_is_cut_at_word_boundaries():
+    segments = [{'text': " ".join(f"word{i}" for i in range(60)), 'start': 0.0, 'duration': 30.0}]
+    chunks = yp.create_segment_chunks(segments, chunk_size=50, chunk_overlap=0)
+    assert all(len(chunk.page_content) <= 50 for chunk in chunks)
+    assert [w for chunk in chunks for w in words(chunk.page_content)] == words(segments[0]['text'])
+
+
+def test_word_longer_than_a_chunk_is_kept_whole():
+    text = f"see the link {URL} for the slides and also {URL}"
+    segments = [{'text': text, 'start': 0.0, 'duration': 10.0}]
+    chunks = yp.create_segment_chunks(segments, chunk_size=50, chunk_overlap=0)
+    assert [w for chunk in chunks for w in words(chunk.page_content)] == words(text)
+    assert sum(chunk.page_content.count(URL) for chunk in chunks) == 2
+    for chunk in chunks:
+        start = chunk.metadata['start_index']
+        assert text[start:start + len(chunk.page_content)] == chunk.page_content
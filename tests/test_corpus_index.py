@@ -0,0 +1,25 @@
+import numpy as np
+from langchain_core.documents import Document
+
+from conftest import DIM
+from corpus_index import BRUTE_FORCE_MAX_VECTORS, CorpusIndex
+
+
+def test_exact_and_selector_search_agree_around_the_cutoff(embeddings):
+    rng = np.random.default_rng(0)
+    corpus = CorpusIndex(embeddings)
+    per_video = BRUTE_FORCE_MAX_VECTORS // 2 + 1
+    for v in range(3):
+        chunks = [Document(page_content=f"{v}-{i}") for i in range(per_video)]
+        corpus.add_video(f"video{v}", chunks, rng.standard_normal((per_video, DIM), dtype=np.float32))
+
+    query = rng.standard_normal((1, DIM), dtype=np.float32)
+    small = corpus._rows_for(["video0"])
+    large = corpus._rows_for(["video0", "video1"])
+    assert len(small) <= BRUTE_FORCE_MAX_VECTORS < len(large)
+    for rows in (small, large):
+        np.testing.assert_array_equal(corpus._exact_search(query, rows, 10), corpus._selector_search(query, rows, 10))
+
+    found = corpus.search_by_vector(query[0], k=10, video_ids=["video0", "video1"])
+    assert len(found) == 10
+    assert {doc.metadata['video_id'] for doc in found} <= {"video0", "video1"}
@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+
+from conftest import DIM
+from embedding_cache import KEY_BYTES, KEYS_FILE, VECTORS_FILE, EmbeddingStore
+
+
+def expected(embeddings, texts):
+    return np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+
+
+def test_vectors_survive_reopen(tmp_path, embeddings):
+    texts = ["a", "bb", "ccc"]
+    EmbeddingStore("model", cache_dir=str(tmp_path)).get_or_embed(texts, embeddings)
+
+    vectors, hits = EmbeddingStore("model", cache_dir=str(tmp_path)).get_or_embed(texts, embeddings)
+    assert hits == len(texts)
+    np.testing.assert_array_equal(vectors, expected(embeddings, texts))
+
+
+def test_torn_append_does_not_shift_later_rows(tmp_path, embeddings):
+    store = EmbeddingStore("model", cache_dir=str(tmp_path))
+    store.get_or_embed(["a", "bb"], embeddings)
+
+    # A process killed mid-append: one orphan vector row without its key,
+    # half of another row and a partial key
+    row_bytes = DIM * 4
+    with open(os.path.join(store.dir, VECTORS_FILE), "ab") as f:
+        f.write(np.full(DIM, 99, dtype=np.float32).tobytes())
+        f.write(b"\x01" * (row_bytes // 2))
+    with open(os.path.join(store.dir, KEYS_FILE), "ab") as f:
+        f.write(b"\x02" * (KEY_BYTES // 2))
+
+    other = EmbeddingStore("model", cache_dir=str(tmp_path))
+    texts = ["dddd", "a", "eeeee", "bb"]
+    vectors, hits = other.get_or_embed(texts, embeddings)
+    assert hits == 2
+    np.testing.assert_array_equal(vectors, expected(embeddings, texts))
+
+    # The store that was open during the crash reads the repaired files too
+    vectors, hits = store.get_or_embed(texts, embeddings)
+    assert hits == len(texts)
+    np.testing.assert_array_equal(vectors, expected(embeddings, texts))
+    assert os.path.getsize(os.path.join(store.dir, VECTORS_FILE)) == 4 * row_bytes
+    assert os.path.getsize(os.path.join(store.dir, KEYS_FILE)) == 4 * KEY_BYTES
@@ -0,0 +1,29 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Deferred by lazy_imports.py (or only imported inside functions); import
+# timing itself is left to benchmarks/import_time.py
+HEAVY_MODULES = ("faiss", "torch", "sentence_transformers", "langchain_google_genai")
+
+CHECK = """
+import json, sys
+import youtube_processor, app
+print(json.dumps([
+    name for name in %r
+    if name in sys.modules and not getattr(sys.modules[name], '_deferred', False)
+]))
+""" % (HEAVY_MODULES,)
+
+
+def test_import_app_keeps_heavy_modules_unloaded():
+    # BM25 mode doesn't warm up the embedding model in a background thread
+    env = dict(os.environ, YT_RAG_RETRIEVAL_MODE="bm25")
+    output = subprocess.run(
+        [sys.executable, "-c", CHECK], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    loaded = json.loads(output.strip().splitlines()[-1])
+    assert not loaded, f"imported eagerly by youtube_processor or app: {loaded}"
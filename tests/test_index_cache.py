@@ -0,0 +1,35 @@
+import os
+
+import numpy as np
+import pytest
+
+from conftest import DIM
+from index_cache import IndexCache
+from index_factory import build_vector_store
+
+
+@pytest.fixture
+def cache(tmp_path, embeddings):
+    cache = IndexCache(cache_dir=str(tmp_path))
+    texts = ["first chunk", "second chunk"]
+    vector_store = build_vector_store(texts, np.ones((2, DIM), dtype=np.float32), embeddings,
+                                      index_type="flat")
+    cache.save("key", vector_store, {'chunks': 2})
+    return cache
+
+
+def test_round_trip(cache, embeddings):
+    vector_store, metadata = cache.load("key", embeddings)
+    assert vector_store.index.ntotal == 2
+    assert metadata == {'chunks': 2}
+
+
+@pytest.mark.parametrize("name, keep_bytes", [("index.pkl", 10), ("index.pkl", 0), ("index.faiss", 20)])
+def test_truncated_entry_is_a_miss_and_removed(cache, embeddings, name, keep_bytes):
+    path = os.path.join(cache.cache_dir, "key", name)
+    with open(path, "r+b") as f:
+        f.truncate(keep_bytes)
+
+    assert cache.load("key", embeddings) is None
+    assert not cache.contains("key")
+    assert cache.stats()['corrupt'] == 1
@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from index_registry import IndexRegistry
+
+
+class Stop(Exception):
+    pass
+
+
+@pytest.fixture
+def lease():
+    registry = IndexRegistry()
+    lease = registry.acquire("video", lambda progress: ("retriever", {}))
+    yield lease
+    lease.release()
+
+
+def test_summaries_for_other_settings_do_not_wait(lease):
+    started, finish = threading.Event(), threading.Event()
+
+    def slow_build(retriever):
+        started.set()
+        finish.wait(5)
+        return "slow"
+
+    thread = threading.Thread(target=lease.summary, args=(slow_build, "model-a", 0.2))
+    thread.start()
+    assert started.wait(5)
+    try:
+        assert lease.summary(lambda retriever: "fast", "model-b", 0.2) == "fast"
+    finally:
+        finish.set()
+        thread.join(5)
+    assert lease.summary(lambda retriever: "rebuilt", "model-a", 0.2) == "slow"
+
+
+def test_waiter_can_stop_waiting(lease, monkeypatch):
+    monkeypatch.setattr("index_registry.SUMMARY_POLL_SECONDS", 0.01)
+    started, finish = threading.Event(), threading.Event()
+
+    def slow_build(retriever):
+        started.set()
+        finish.wait(5)
+        return "slow"
+
+    def cancelled():
+        raise Stop()
+
+    thread = threading.Thread(target=lease.summary, args=(slow_build, "model", 0.2))
+    thread.start()
+    assert started.wait(5)
+    try:
+        with pytest.raises(Stop):
+            lease.summary(slow_build, "model", 0.2, progress=cancelled)
+    finally:
+        finish.set()
+        thread.join(5)
+
+
+def test_failed_build_is_retried(lease):
+    def failing(retriever):
+        raise RuntimeError("LLM unavailable")
+
+    with pytest.raises(RuntimeError):
+        lease.summary(failing, "model", 0.2)
+    assert lease.summary(lambda retriever: "summary", "model", 0.2) == "summary"
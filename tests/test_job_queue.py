@@ -0,0 +1,23 @@
+import time
+
+from job_queue import DONE, JobManager
+
+
+def test_result_pop_hands_over_the_result():
+    jobs = JobManager(max_workers=1)
+    job_id = jobs.submit(lambda progress_callback: ["result"])
+    assert jobs.wait(job_id, timeout=5)['state'] == DONE
+    assert jobs.result(job_id) == ["result"]
+    assert jobs.result(job_id, pop=True) == ["result"]
+    assert jobs.result(job_id) is None
+    jobs.shutdown()
+
+
+def test_expired_jobs_are_pruned_on_status():
+    jobs = JobManager(max_workers=1, ttl_seconds=0.05)
+    job_id = jobs.submit(lambda progress_callback: "result")
+    jobs.wait(job_id, timeout=5)
+    time.sleep(0.1)
+    assert jobs.status(job_id) is None
+    assert jobs.stats()[DONE] == 0
+    jobs.shutdown()
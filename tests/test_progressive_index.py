@@ -0,0 +1,42 @@
+import pytest
+from langchain_core.documents import Document
+
+from embedding_backends import embedding_model_id
+from embedding_cache import EmbeddingStore
+import youtube_processor as yp
+
+MODEL = "test-hashing"
+
+
+@pytest.fixture
+def model(tmp_path, embeddings):
+    yp.register_embedding_model(MODEL, embeddings)
+    yp._embedding_stores[MODEL] = EmbeddingStore(embedding_model_id(MODEL), cache_dir=str(tmp_path))
+    return MODEL
+
+
+def make_chunks(n):
+    return [
+        Document(page_content=f"chunk{i} word{i % 7}", metadata={'start_index': i, 'end_time': 10.0 * (i + 1)})
+        for i in range(n)
+    ]
+
+
+def test_no_chunks(model):
+    vector_store, _ = yp.create_progressive_vector_store([], model, index_type="flat")
+    assert vector_store.index.ntotal == 0
+
+
+def test_partial_retriever_reports_coverage(model):
+    partials = []
+
+    def on_progress(stage, done=None, total=None, partial=None):
+        if partial is not None:
+            partials.append((done, partial.coverage()['fraction']))
+
+    vector_store, _ = yp.create_progressive_vector_store(
+        make_chunks(10), model, index_type="flat", on_progress=on_progress, batch_size=4
+    )
+    assert vector_store.index.ntotal == 10
+    assert [done for done, _ in partials] == [4, 8, 10]
+    assert partials[0][1] == pytest.approx(0.4)
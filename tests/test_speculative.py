@@ -0,0 +1,33 @@
+import gc
+import threading
+
+from job_queue import DONE
+from speculative import Speculator
+
+
+def generate(question, timings):
+    yield from question.split()
+
+
+def test_dropped_batch_is_closed_on_stats():
+    speculator = Speculator(max_workers=1, budget_per_hour=10)
+    batch = speculator.start(generate, ["what is it about"])
+    job_id = batch._state['jobs']["what is it about"]
+    assert speculator.jobs.wait(job_id, timeout=5)['state'] == DONE
+
+    def drop():
+        nonlocal batch
+        # Collected while this thread holds the speculator's lock
+        with speculator._lock:
+            del batch
+            gc.collect()
+
+    thread = threading.Thread(target=drop, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+    stats = speculator.stats()
+    assert stats['wasted'] == 1
+    assert speculator.jobs.result(job_id) is None
+    speculator.jobs.shutdown()
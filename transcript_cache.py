@@ -0,0 +1,166 @@
+"""
+Transcript cache with single-flight fetching
+=============================================
+Keeps raw transcript segments (text, start, duration) in memory and as
+gzip-compressed JSON on disk, both with a TTL. Concurrent requests for the
+same video_id share one upstream fetch instead of each calling YouTube.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from youtube_transcript_api import YouTubeTranscriptApi
+
+DEFAULT_CACHE_DIR = os.path.join(os.getenv("YT_RAG_CACHE_DIR", ".cache"), "transcripts")
+DEFAULT_TTL_SECONDS = float(os.getenv("YT_RAG_TRANSCRIPT_TTL_HOURS", "24")) * 3600
+DEFAULT_MAX_MEMORY_ENTRIES = 256
+
+
+def fetch_youtube_segments(video_id, languages=("en",)):
+    """Fetch transcript segments from YouTube as plain dicts"""
+    snippets = YouTubeTranscriptApi().fetch(video_id, languages=list(languages))
+    return [
+        {'text': s.text, 'start': s.start, 'duration': s.duration}
+        for s in snippets
+    ]
+
+
+class TranscriptCache:
+    """
+    Two-level (memory + disk) transcript cache
+
+    fetcher is any callable video_id -> list of segment dicts, so tests and
+    benchmarks can pass a local stub instead of the YouTube API.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 fetcher=fetch_youtube_segments, max_memory_entries=DEFAULT_MAX_MEMORY_ENTRIES):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.fetcher = fetcher
+        self.max_memory_entries = max_memory_entries
+        self._memory = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'fetches': 0, 'coalesced': 0, 'errors': 0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, video_id):
+        digest = hashlib.sha256(video_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json.gz")
+
+    def _fresh(self, fetched_at):
+        return time.time() - fetched_at < self.ttl_seconds
+
+    def _remember(self, video_id, fetched_at, segments):
+        """Store in the in-memory LRU (caller holds the lock)"""
+        self._memory[video_id] = (fetched_at, segments)
+        self._memory.move_to_end(video_id)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, video_id):
+        if not self.cache_dir:
+            return None
+        try:
+            with gzip.open(self._path(video_id), "rt", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if record.get('video_id') != video_id or not self._fresh(record['fetched_at']):
+            return None
+        return record['fetched_at'], record['segments']
+
+    def _write_disk(self, video_id, fetched_at, segments):
+        if not self.cache_dir:
+            return
+        record = {'video_id': video_id, 'fetched_at': fetched_at, 'segments': segments}
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=self.cache_dir)
+        try:
+            with gzip.open(os.fdopen(fd, "wb"), "wt", encoding="utf-8") as f:
+                json.dump(record, f, separators=(",", ":"))
+            os.replace(tmp_path, self._path(video_id))
+        except OSError:
+            # The disk cache is best-effort; the memory copy is still valid
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def get(self, video_id):
+        """
+        Return the transcript segments for a video
+        Segments are shared between callers - treat them as read-only
+        Raises whatever the fetcher raises if the video has no transcript
+        """
+        with self._lock:
+            entry = self._memory.get(video_id)
+            if entry is not None and self._fresh(entry[0]):
+                self._memory.move_to_end(video_id)
+                self._counters['memory_hits'] += 1
+                return entry[1]
+
+            # Single-flight: only the first caller fetches, the rest wait on it
+            flight = self._in_flight.get(video_id)
+            if flight is not None:
+                self._counters['coalesced'] += 1
+                leader = False
+            else:
+                flight = Future()
+                self._in_flight[video_id] = flight
+                leader = True
+
+        if not leader:
+            return flight.result()
+
+        try:
+            entry = self._read_disk(video_id)
+            if entry is not None:
+                counter = 'disk_hits'
+            else:
+                counter = 'fetches'
+                segments = self.fetcher(video_id)
+                entry = (time.time(), segments)
+                self._write_disk(video_id, *entry)
+
+            with self._lock:
+                self._counters[counter] += 1
+                self._remember(video_id, *entry)
+            flight.set_result(entry[1])
+            return entry[1]
+
+        except Exception as e:
+            with self._lock:
+                self._counters['errors'] += 1
+            flight.set_exception(e)
+            raise
+
+        finally:
+            with self._lock:
+                self._in_flight.pop(video_id, None)
+
+    def invalidate(self, video_id):
+        """Drop a video from both cache levels"""
+        with self._lock:
+            self._memory.pop(video_id, None)
+        if self.cache_dir:
+            try:
+                os.remove(self._path(video_id))
+            except OSError:
+                pass
+
+    def stats(self):
+        """Return hit/fetch counters and the in-memory entry count"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['memory_entries'] = len(self._memory)
+            stats['in_flight'] = len(self._in_flight)
+        return stats
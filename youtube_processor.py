@@ -1,18 +1,179 @@
 
-from youtube_transcript_api import YouTubeTranscriptApi
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import RunnableParallel, RunnablePassthrough, RunnableLambda
 from langchain_core.output_parsers import StrOutputParser
 from dotenv import load_dotenv
 from urllib.parse import urlparse, parse_qs
+import hashlib
+import json
+import os
+import threading
+import time
+
+from answer_cache import SemanticAnswerCache, make_answer_scope
+from context_builder import DEFAULT_CONTEXT_TOKENS, assemble_context, estimate_tokens
+from corpus_index import CorpusIndex
+from embedding_backends import DEFAULT_BACKEND, embedding_model_id, load_embeddings
+from embedding_cache import EmbeddingStore
+from index_cache import IndexCache, make_index_key
+from index_factory import (
+    DEFAULT_INDEX_TYPE, add_to_vector_store, apply_search_params, build_vector_store, choose_index_type, describe_index
+)
+from index_registry import IndexRegistry
+from job_queue import JobCancelled, JobManager
+from lexical_index import BM25Index, BM25Retriever, HybridRetriever
+from progressive_index import (
+    DEFAULT_INGEST_BATCH_CHUNKS, DEFAULT_PROGRESSIVE_INGEST, STREAMABLE_INDEX_TYPES, ProgressiveRetriever,
+    chunk_end_time
+)
+from retrieval_cache import MemoizedRetriever, QueryEmbeddingCache
+from speculative import Speculator
+from summary_tree import SUMMARY_VERSION, build_summary_tree, format_time
+from transcript_cache import TranscriptCache
 
 # Load environment variables
 load_dotenv()
 
+# Use the same lightweight model everywhere - only 22MB!
+EMBEDDING_MODEL_NAME = "paraphrase-MiniLM-L3-v2"
+# Cache identity of the model as served by this deployment's embedding backend
+EMBEDDING_MODEL_ID = embedding_model_id(EMBEDDING_MODEL_NAME)
+
+# Stages reported by process_video progress events ("loading" = index cache lookup)
+PROGRESS_STAGES = ("loading", "fetching", "chunking", "embedding", "indexing", "chain", "summarizing", "done")
+
+# How chunks are retrieved: "dense" (FAISS), "bm25" (lexical only, never loads
+# the embedding model) or "hybrid" (both, fused by reciprocal rank)
+RETRIEVAL_MODES = ("dense", "bm25", "hybrid")
+DEFAULT_RETRIEVAL_MODE = os.getenv("YT_RAG_RETRIEVAL_MODE", "dense")
+
+# Build the map-reduce summary tree while processing a video (see summary_tree)
+DEFAULT_PRECOMPUTE_SUMMARY = os.getenv("YT_RAG_PRECOMPUTE_SUMMARY", "0") == "1"
+
+# Default number of questions answered in parallel by answer_questions
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Process-wide embedding model registry (one loaded model per name)
+_embedding_models = {}
+_embedding_load_locks = {}
+_embedding_stats = {}
+_embedding_warmups = {}
+_embedding_registry_lock = threading.Lock()
+
+# Process-wide content-addressed embedding stores (one per model)
+_embedding_stores = {}
+
+# Process-wide query-embedding memoization (one per model)
+_query_embedding_caches = {}
+
+# Process-wide on-disk index cache (created on first use)
+_index_cache = None
+_index_cache_lock = threading.Lock()
+
+# Process-wide semantic answer cache (created on first use)
+_answer_cache = None
+_answer_cache_lock = threading.Lock()
+
+# Process-wide transcript cache (created on first use)
+_transcript_cache = None
+_transcript_cache_lock = threading.Lock()
+
+# Process-wide registry of indexes shared between sessions (created on first use)
+_index_registry = None
+_index_registry_lock = threading.Lock()
+
+# Process-wide background job pool for process_video (created on first use)
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+# Process-wide pool and budget for speculative answers (created on first use)
+_speculator = None
+_speculator_lock = threading.Lock()
+
+
+class SharedEmbeddings(Embeddings):
+    """
+    Thread-safe wrapper around a loaded embedding model shared by all sessions
+
+    HuggingFace fast tokenizers are not safe to call from several threads at
+    once ("Already borrowed"), so encode calls on one model are serialized.
+    """
+
+    def __init__(self, model_name, embeddings):
+        self.model_name = model_name
+        self.embeddings = embeddings
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self._lock:
+            return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        with self._lock:
+            return self.embeddings.embed_query(text)
+
+
+def get_embedding_model(model_name=EMBEDDING_MODEL_NAME):
+    """Return the shared embedding model, loading it once per process"""
+    model = _embedding_models.get(model_name)
+    if model is not None:
+        return model
+
+    with _embedding_registry_lock:
+        load_lock = _embedding_load_locks.setdefault(model_name, threading.Lock())
+
+    # Per-model lock: concurrent callers wait for a single load
+    with load_lock:
+        model = _embedding_models.get(model_name)
+        if model is None:
+            start = time.perf_counter()
+            model = SharedEmbeddings(model_name, load_embeddings(model_name))
+            stats = _embedding_stats.setdefault(model_name, {})
+            stats['backend'] = DEFAULT_BACKEND
+            stats['load_seconds'] = time.perf_counter() - start
+            stats['loaded_at'] = time.time()
+            _embedding_models[model_name] = model
+    return model
+
+
+def register_embedding_model(model_name, embeddings):
+    """Make an already constructed Embeddings object available under model_name"""
+    with _embedding_registry_lock:
+        model = SharedEmbeddings(model_name, embeddings)
+        _embedding_models[model_name] = model
+        _embedding_stats.setdefault(model_name, {})['load_seconds'] = 0.0
+    return model
+
+
+def warm_up_embedding_model(model_name=EMBEDDING_MODEL_NAME):
+    """
+    Load and warm up the embedding model in a background thread
+    Safe to call on every app rerun - only the first call starts a thread
+    Returns: the warm-up thread
+    """
+    def _warm_up():
+        model = get_embedding_model(model_name)
+        start = time.perf_counter()
+        model.embed_query("warm up")
+        _embedding_stats.setdefault(model_name, {})['warmup_seconds'] = time.perf_counter() - start
+
+    with _embedding_registry_lock:
+        thread = _embedding_warmups.get(model_name)
+        if thread is None:
+            thread = threading.Thread(target=_warm_up, name=f"embedding-warmup-{model_name}", daemon=True)
+            _embedding_warmups[model_name] = thread
+            thread.start()
+    return thread
+
+
+def get_embedding_model_stats(model_name=EMBEDDING_MODEL_NAME):
+    """Return load/warm-up timings for a model (empty if not loaded yet)"""
+    stats = dict(_embedding_stats.get(model_name, {}))
+    stats['loaded'] = model_name in _embedding_models
+    return stats
+
 
 def extract_video_id_from_url(url):
     """Extract video ID from YouTube URL or return as-is if already an ID"""
@@ -25,77 +186,290 @@ def extract_video_id_from_url(url):
         return url  # Already a video ID
 
 
-def get_transcript(video_id):
+def get_transcript_cache():
+    """Return the shared transcript cache"""
+    global _transcript_cache
+    with _transcript_cache_lock:
+        if _transcript_cache is None:
+            _transcript_cache = TranscriptCache()
+    return _transcript_cache
+
+
+def get_transcript_segments(video_id):
     """
-    Extract transcript from YouTube video
-    Returns: (success, transcript_text, metadata)
+    Extract raw transcript segments (text, start, duration) from YouTube video
+    Served from the transcript cache when possible
+    Returns: (success, segments_or_error, metadata)
     """
     try:
-        transcript_snippets = YouTubeTranscriptApi().fetch(video_id, languages=["en"])
-        transcript_list = [s.text for s in transcript_snippets]
-        transcript = " ".join(transcript_list)
+        segments = get_transcript_cache().get(video_id)
         
         metadata = {
-            'segments': len(transcript_snippets),
-            'total_words': len(transcript.split()),
-            'duration': transcript_snippets[-1].start if transcript_snippets else 0
+            'segments': len(segments),
+            'total_words': sum(len(s['text'].split()) for s in segments),
+            'duration': segments[-1]['start'] if segments else 0
         }
         
-        return True, transcript, metadata
+        return True, segments, metadata
         
     except Exception as e:
         return False, str(e), {}
 
 
-def create_chunks(transcript, chunk_size=800, chunk_overlap=100):
-    """Split transcript into chunks"""
+def get_transcript(video_id):
+    """
+    Extract transcript from YouTube video (served from the transcript cache when possible)
+    Returns: (success, transcript_text, metadata)
+    """
+    success, segments, metadata = get_transcript_segments(video_id)
+    if not success:
+        return False, segments, {}
+    
+    transcript = " ".join(s['text'] for s in segments)
+    return True, transcript, metadata
+
+
+def create_chunks(transcript, chunk_size=800, chunk_overlap=100, video_id=None):
+    """Split transcript into chunks (tagged with video_id and their character offset)"""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    
     splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size, 
-        chunk_overlap=chunk_overlap
+        chunk_overlap=chunk_overlap,
+        add_start_index=True
     )
-    chunks = splitter.create_documents([transcript])
+    metadata = {'video_id': video_id} if video_id else {}
+    chunks = splitter.create_documents([transcript], metadatas=[metadata])
     return chunks
 
 
-def create_vector_store(chunks):
-    """Create FAISS vector store with embeddings"""
-    # Use the same lightweight model - only 22MB!
-    embeddings = HuggingFaceEmbeddings(
-        model_name="paraphrase-MiniLM-L3-v2"
-    )
+def _segment_pieces(segments, chunk_size):
+    """
+    Yield (segment_index, text, offset) with no piece longer than chunk_size,
+    except a single word that is longer on its own (URLs, long tokens): it is
+    kept whole, as cutting it would change the text once pieces are rejoined
+    offset is the character position in the " "-joined transcript
+    """
+    offset = 0
+    for index, segment in enumerate(segments):
+        text = segment['text']
+        if len(text) <= chunk_size:
+            if text:
+                yield index, text, offset
+        else:
+            # Rare: one caption longer than a chunk - cut it at word boundaries
+            start = 0
+            while start < len(text):
+                end = min(len(text), start + chunk_size)
+                if end < len(text):
+                    space = text.rfind(" ", start, end + 1)
+                    if space > start:
+                        end = space
+                    else:
+                        # One word longer than a chunk: keep it whole
+                        space = text.find(" ", end)
+                        end = space if space != -1 else len(text)
+                raw = text[start:end]
+                if raw.strip():
+                    yield index, raw.strip(), offset + start + len(raw) - len(raw.lstrip())
+                start = end
+        offset += len(text) + 1
+
+
+def create_segment_chunks(segments, chunk_size=800, chunk_overlap=100, video_id=None):
+    """
+    Chunk transcript segments in a single linear pass
+    Chunks never split a caption (unless it alone exceeds chunk_size) or a word
+    (a word longer than chunk_size becomes an oversized chunk); overlap is
+    made of whole trailing segments. Each chunk records its character offset,
+    segment range and start/end time.
+    """
+    def make_chunk(window):
+        first, last = window[0][0], window[-1][0]
+        metadata = {'video_id': video_id} if video_id else {}
+        metadata.update({
+            'start_index': window[0][2],
+            'segment_start': first,
+            'segment_end': last,
+            'start_time': segments[first]['start'],
+            'end_time': segments[last]['start'] + segments[last].get('duration', 0)
+        })
+        return Document(page_content=" ".join(piece[1] for piece in window), metadata=metadata)
+    
+    chunks = []
+    window = []
+    length = 0
+    for piece in _segment_pieces(segments, chunk_size):
+        if window and length + 1 + len(piece[1]) > chunk_size:
+            chunks.append(make_chunk(window))
+            
+            # Carry whole trailing pieces (up to chunk_overlap chars) into the next chunk
+            kept = 0
+            keep_from = len(window)
+            while keep_from > 0:
+                extra = len(window[keep_from - 1][1]) + (1 if kept else 0)
+                if kept + extra > chunk_overlap:
+                    break
+                kept += extra
+                keep_from -= 1
+            window = window[keep_from:]
+            length = kept
+            
+            # The overlap must still leave room for the new piece
+            while window and length + 1 + len(piece[1]) > chunk_size:
+                dropped = window.pop(0)
+                length -= len(dropped[1]) + (1 if window else 0)
+        
+        length += len(piece[1]) + (1 if window else 0)
+        window.append(piece)
     
-    vector_store = FAISS.from_documents(chunks, embeddings)
-    retriever = vector_store.as_retriever(
-        search_type="similarity", 
-        search_kwargs={"k": 10}
+    if window:
+        chunks.append(make_chunk(window))
+    return chunks
+
+
+def get_embedding_store(model_name=EMBEDDING_MODEL_NAME):
+    """Return the shared content-addressed embedding store for a model (per backend)"""
+    with _embedding_registry_lock:
+        store = _embedding_stores.get(model_name)
+        if store is None:
+            store = EmbeddingStore(embedding_model_id(model_name))
+            _embedding_stores[model_name] = store
+    return store
+
+
+def create_vector_store(chunks, embedding_model=EMBEDDING_MODEL_NAME, index_type=DEFAULT_INDEX_TYPE, on_progress=None):
+    """
+    Create FAISS vector store with embeddings (only chunks never seen before are embedded)
+    index_type: "auto" (picked by chunk count), "flat", "hnsw", "ivfpq" or the
+    quantized "sq8" / "pq" (defaults to YT_RAG_INDEX_TYPE)
+    on_progress(stage, done, total) is called during "embedding" and "indexing"
+    """
+    embeddings = get_embedding_model(embedding_model)
+    
+    texts = [chunk.page_content for chunk in chunks]
+    vectors, _ = get_embedding_store(embedding_model).get_or_embed(
+        texts,
+        embeddings,
+        progress=(lambda done, total: on_progress("embedding", done, total)) if on_progress else None
+    )
+    if on_progress:
+        on_progress("indexing")
+    vector_store = build_vector_store(
+        texts,
+        vectors,
+        embeddings,
+        metadatas=[chunk.metadata for chunk in chunks],
+        index_type=index_type
     )
+    retriever = create_retriever(vector_store, embedding_model)
+    
+    return vector_store, retriever
+
+
+def create_progressive_vector_store(chunks, embedding_model=EMBEDDING_MODEL_NAME, index_type=DEFAULT_INDEX_TYPE,
+                                    on_progress=None, batch_size=DEFAULT_INGEST_BATCH_CHUNKS):
+    """
+    create_vector_store, but embedding and indexing batch_size chunks at a time
+    on_progress(stage, done, total, partial) gets the ProgressiveRetriever
+    over what is indexed so far with every "embedding" event after the
+    first batch; it switches to the final retriever once everything is in.
+    Index types that need training (sq8, pq, ivfpq) are streamed into a flat
+    index and rebuilt from the embedding store at the end.
+    """
+    if not chunks:
+        # Nothing to stream: build the (empty) store the one-shot way
+        return create_vector_store(chunks, embedding_model, index_type, on_progress)
+    
+    on_progress = on_progress or (lambda stage, done=None, total=None, partial=None: None)
+    embeddings = get_embedding_model(embedding_model)
+    store = get_embedding_store(embedding_model)
+    
+    final_type = choose_index_type(len(chunks)) if index_type == "auto" else index_type
+    stream_type = final_type if final_type in STREAMABLE_INDEX_TYPES else "flat"
+    
+    vector_store = None
+    partial = None
+    on_progress("embedding", 0, len(chunks))
+    for start in range(0, len(chunks), batch_size):
+        batch = chunks[start:start + batch_size]
+        texts = [chunk.page_content for chunk in batch]
+        metadatas = [chunk.metadata for chunk in batch]
+        vectors, _ = store.get_or_embed(texts, embeddings)
+        if vector_store is None:
+            vector_store = build_vector_store(texts, vectors, embeddings, metadatas=metadatas, index_type=stream_type)
+            partial = ProgressiveRetriever(
+                retriever=create_retriever(vector_store, embedding_model),
+                total_chunks=len(chunks),
+                duration=chunk_end_time(chunks)
+            )
+            partial.extend(lambda: None, batch)
+        else:
+            partial.extend(lambda: add_to_vector_store(vector_store, texts, vectors, metadatas), batch)
+        on_progress("embedding", start + len(batch), len(chunks), partial)
+    
+    on_progress("indexing")
+    if stream_type != final_type:
+        texts = [chunk.page_content for chunk in chunks]
+        vectors, _ = store.get_or_embed(texts, embeddings)
+        vector_store = build_vector_store(
+            texts, vectors, embeddings, metadatas=[chunk.metadata for chunk in chunks], index_type=final_type
+        )
+        retriever = create_retriever(vector_store, embedding_model)
+    else:
+        retriever = partial.retriever
+    partial.complete(retriever)
     
     return vector_store, retriever
 
 
+def get_query_embedding_cache(model_name=EMBEDDING_MODEL_NAME):
+    """Return the shared memoized query embedder for a model"""
+    with _embedding_registry_lock:
+        cache = _query_embedding_caches.get(model_name)
+    if cache is None:
+        embeddings = get_embedding_model(model_name)
+        with _embedding_registry_lock:
+            cache = _query_embedding_caches.setdefault(model_name, QueryEmbeddingCache(embeddings))
+    return cache
+
+
+def create_retriever(vector_store, embedding_model=EMBEDDING_MODEL_NAME):
+    """Create the top-k similarity retriever used by the RAG chain (results are memoized)"""
+    return MemoizedRetriever(
+        vector_store=vector_store,
+        query_embeddings=get_query_embedding_cache(embedding_model),
+        k=10
+    )
+
+
+def get_index_cache():
+    """Return the shared on-disk index cache"""
+    global _index_cache
+    with _index_cache_lock:
+        if _index_cache is None:
+            _index_cache = IndexCache()
+    return _index_cache
+
+
 def format_docs(retrieved_docs):
     """Format retrieved documents into context text"""
     context_text = "\n\n".join(doc.page_content for doc in retrieved_docs)
     return context_text
 
 
-def create_rag_chain(retriever, model_name="gemini-2.5-flash-lite", temperature=0.2):
-    """
-    Create the complete RAG chain
-    
-    Available models:
-    - "gemini-2.0-flash-exp" (RECOMMENDED - fastest, latest)
-    - "gemini-1.5-pro" (more powerful)
-    - "gemini-1.5-flash" (balanced)
-    """
-    # Initialize LLM
-    llm = ChatGoogleGenerativeAI(
-        model=model_name,
-        temperature=temperature
-    )
-    
-    # Create prompt template
-    prompt = PromptTemplate(
+def _call_usage(config):
+    """The per-call stats dict passed in by stream_answer/answer_questions (or None)"""
+    return (config or {}).get('configurable', {}).get('usage')
+
+
+def _usage_config(usage):
+    return {'configurable': {'usage': usage}}
+
+
+def create_prompt():
+    """Create the RAG prompt template"""
+    return PromptTemplate(
         template="""
         You are a helpful assistant summarizing a YouTube video transcript.
         Use ONLY the given transcript context to answer questions, 
@@ -113,10 +487,66 @@ def create_rag_chain(retriever, model_name="gemini-2.5-flash-lite", temperature=
         """,
         input_variables=['context', 'question']
     )
+
+
+def create_llm(model_name="gemini-2.5-flash-lite", temperature=0.2):
+    """Create the Gemini chat model used for answers and summaries"""
+    # Imported on first use: the Gemini client alone takes about a second to import
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    
+    return ChatGoogleGenerativeAI(
+        model=model_name,
+        temperature=temperature
+    )
+
+
+def create_rag_chain(retriever, model_name="gemini-2.5-flash-lite", temperature=0.2, llm=None,
+                     max_context_tokens=DEFAULT_CONTEXT_TOKENS):
+    """
+    Create the complete RAG chain
+    Pass llm to use a different chat model (e.g. a fake one in benchmarks)
+    Retrieved chunks are deduplicated and merged into at most
+    max_context_tokens of context (see context_builder)
+    Over a partially indexed video (ProgressiveRetriever) the context says
+    how much of it is covered, and so does the call's usage ('coverage')
+    
+    Available models:
+    - "gemini-2.0-flash-exp" (RECOMMENDED - fastest, latest)
+    - "gemini-1.5-pro" (more powerful)
+    - "gemini-1.5-flash" (balanced)
+    """
+    # Initialize LLM
+    if llm is None:
+        llm = create_llm(model_name, temperature)
+    
+    # Create prompt template
+    prompt = create_prompt()
+    
+    def build_context(retrieved_docs, config):
+        context, stats = assemble_context(retrieved_docs, max_context_tokens)
+        usage = _call_usage(config)
+        if usage is not None:
+            usage.update(stats)
+        coverage = retriever.coverage() if isinstance(retriever, ProgressiveRetriever) else None
+        if coverage is not None and coverage['fraction'] < 1:
+            if usage is not None:
+                usage['coverage'] = coverage
+            context = (
+                f"(Only the first {format_time(coverage['covered_seconds'])} of this "
+                f"{format_time(coverage['duration'])} video ({coverage['fraction']:.0%}) is indexed so far; "
+                f"say so if the answer may depend on the rest.)\n\n{context}"
+            )
+        return context
+    
+    def count_prompt_tokens(prompt_value, config):
+        usage = _call_usage(config)
+        if usage is not None:
+            usage['prompt_tokens'] = estimate_tokens(prompt_value.to_string())
+        return prompt_value
     
     # Create parallel chain
     parallel_chain = RunnableParallel({
-        'context': retriever | RunnableLambda(format_docs),
+        'context': retriever | RunnableLambda(build_context),
         'question': RunnablePassthrough()
     })
     
@@ -124,39 +554,534 @@ def create_rag_chain(retriever, model_name="gemini-2.5-flash-lite", temperature=
     parser = StrOutputParser()
     
     # Create main chain
-    main_chain = parallel_chain | prompt | llm | parser
+    main_chain = parallel_chain | prompt | RunnableLambda(count_prompt_tokens) | llm | parser
     
     return main_chain
 
 
-def process_video(video_id, chunk_size=800, chunk_overlap=100, model_name="gemini-2.5-flash-lite", temperature=0.2):
+def get_answer_cache():
+    """Return the shared semantic answer cache (uses the shared query embedder)"""
+    global _answer_cache
+    with _answer_cache_lock:
+        if _answer_cache is None:
+            _answer_cache = SemanticAnswerCache(get_query_embedding_cache())
+    return _answer_cache
+
+
+def _cached_answer(cache_scope, question, timings):
+    """Look up question in the answer cache and record the hit in timings"""
+    if cache_scope is None:
+        return None
+    hit = get_answer_cache().lookup(cache_scope, question)
+    if hit is None:
+        return None
+    answer, match_type, similarity = hit
+    timings['cache_hit'] = match_type
+    timings['similarity'] = similarity
+    return answer
+
+
+def stream_answer(main_chain, question, timings=None, cache_scope=None):
+    """
+    Stream an answer from the RAG chain token by token
+    Fills timings (if given) with 'time_to_first_token' and 'total_seconds',
+    plus 'cache_hit' when the answer came from the answer cache for cache_scope;
+    fresh answers also get the context stats and estimated 'prompt_tokens',
+    and 'coverage' while the video is only partially indexed (those answers
+    are not cached)
+    """
+    timings = timings if timings is not None else {}
+    start = time.perf_counter()
+    
+    answer = _cached_answer(cache_scope, question, timings)
+    if answer is not None:
+        timings['time_to_first_token'] = timings['total_seconds'] = time.perf_counter() - start
+        yield answer
+        return
+    
+    tokens = []
+    for token in main_chain.stream(question, config=_usage_config(timings)):
+        if 'time_to_first_token' not in timings:
+            timings['time_to_first_token'] = time.perf_counter() - start
+        tokens.append(token)
+        yield token
+    timings['total_seconds'] = time.perf_counter() - start
+    
+    # Answers from a partially indexed video would outlive the partial index
+    if cache_scope is not None and 'coverage' not in timings:
+        get_answer_cache().store(cache_scope, question, "".join(tokens))
+
+
+async def astream_answer(main_chain, question, timings=None, cache_scope=None):
+    """Async version of stream_answer"""
+    timings = timings if timings is not None else {}
+    start = time.perf_counter()
+    
+    answer = _cached_answer(cache_scope, question, timings)
+    if answer is not None:
+        timings['time_to_first_token'] = timings['total_seconds'] = time.perf_counter() - start
+        yield answer
+        return
+    
+    tokens = []
+    async for token in main_chain.astream(question, config=_usage_config(timings)):
+        if 'time_to_first_token' not in timings:
+            timings['time_to_first_token'] = time.perf_counter() - start
+        tokens.append(token)
+        yield token
+    timings['total_seconds'] = time.perf_counter() - start
+    
+    # Answers from a partially indexed video would outlive the partial index
+    if cache_scope is not None and 'coverage' not in timings:
+        get_answer_cache().store(cache_scope, question, "".join(tokens))
+
+
+def _split_cached(questions, cache_scope, cache_hits):
+    """
+    Resolve what we can from the answer cache
+    Returns: (results with None for misses, indexes of the misses)
+    """
+    results = [None] * len(questions)
+    for i, question in enumerate(questions):
+        hit = {}
+        answer = _cached_answer(cache_scope, question, hit)
+        if answer is not None:
+            results[i] = (True, answer, None)
+        if cache_hits is not None:
+            cache_hits.append(hit.get('cache_hit'))
+    return results, [i for i, result in enumerate(results) if result is None]
+
+
+def _merge_outputs(questions, results, missing, outputs, cache_scope, usages):
+    """Fill batch outputs into results and cache the successful answers (not those from a partial index)"""
+    for i, output in zip(missing, outputs):
+        if isinstance(output, Exception):
+            results[i] = (False, None, str(output))
+        else:
+            results[i] = (True, output, None)
+            if cache_scope is not None and 'coverage' not in usages[i]:
+                get_answer_cache().store(cache_scope, questions[i], output)
+    return results
+
+
+def _batch_config(usage, max_concurrency):
+    return dict(_usage_config(usage), max_concurrency=max(1, max_concurrency))
+
+
+def answer_questions(main_chain, questions, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                     cache_scope=None, cache_hits=None, usage=None):
+    """
+    Answer several questions concurrently through the RAG chain
+    At most max_concurrency LLM calls run at once; questions already in the
+    answer cache for cache_scope are served without an LLM call and their
+    match type ('exact'/'semantic', None for fresh answers) is appended to cache_hits
+    If usage is a list, one stats dict per question is appended to it
+    (context stats, 'prompt_tokens' and 'coverage' as in stream_answer;
+    empty for cached answers)
+    
+    Returns: list of (success, answer, error_message) in question order
+    """
+    questions = list(questions)
+    usages = [{} for _ in questions]
+    if usage is not None:
+        usage.extend(usages)
+    results, missing = _split_cached(questions, cache_scope, cache_hits)
+    if not missing:
+        return results
+    
+    outputs = main_chain.batch(
+        [questions[i] for i in missing],
+        config=[_batch_config(usages[i], max_concurrency) for i in missing],
+        return_exceptions=True
+    )
+    return _merge_outputs(questions, results, missing, outputs, cache_scope, usages)
+
+
+async def aanswer_questions(main_chain, questions, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                            cache_scope=None, cache_hits=None, usage=None):
+    """Async version of answer_questions"""
+    questions = list(questions)
+    usages = [{} for _ in questions]
+    if usage is not None:
+        usage.extend(usages)
+    results, missing = _split_cached(questions, cache_scope, cache_hits)
+    if not missing:
+        return results
+    
+    outputs = await main_chain.abatch(
+        [questions[i] for i in missing],
+        config=[_batch_config(usages[i], max_concurrency) for i in missing],
+        return_exceptions=True
+    )
+    return _merge_outputs(questions, results, missing, outputs, cache_scope, usages)
+
+
+def create_corpus(embedding_model=EMBEDDING_MODEL_NAME):
+    """Create an empty multi-video corpus index"""
+    return CorpusIndex(get_query_embedding_cache(embedding_model))
+
+
+def add_video_to_corpus(corpus, video_id, chunk_size=800, chunk_overlap=100, embedding_model=EMBEDDING_MODEL_NAME):
+    """
+    Fetch, chunk and embed one video into a shared corpus index
+    Returns: (success, metadata, error_message)
+    """
+    if corpus.has_video(video_id):
+        return True, {'video_id': video_id, 'already_indexed': True}, None
+    
+    success, segments, metadata = get_transcript_segments(video_id)
+    if not success:
+        return False, {}, f"Failed to get transcript: {segments}"
+    
+    chunks = create_segment_chunks(segments, chunk_size, chunk_overlap, video_id=video_id)
+    texts = [chunk.page_content for chunk in chunks]
+    vectors, _ = get_embedding_store(embedding_model).get_or_embed(texts, get_embedding_model(embedding_model))
+    corpus.add_video(video_id, chunks, vectors)
+    
+    metadata['video_id'] = video_id
+    metadata['chunks'] = len(chunks)
+    return True, metadata, None
+
+
+def create_corpus_rag_chain(corpus, video_ids=None, model_name="gemini-2.5-flash-lite", temperature=0.2):
+    """RAG chain over a corpus, scoped to video_ids (None = the whole corpus)"""
+    return create_rag_chain(corpus.as_retriever(video_ids), model_name, temperature)
+
+
+class ProgressTracker:
+    """
+    Times process_video stages and forwards progress events to a callback
+    
+    Each event is a dict: {'stage', 'done', 'total', 'elapsed'} where stage is
+    one of PROGRESS_STAGES and done/total are only set while embedding.
+    Once a preview is set (progressive ingestion) every later event also
+    carries it as 'preview'
+    """
+    
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.stage_seconds = {}
+        self.preview = None
+        self._start = time.perf_counter()
+        self._stage = None
+        self._stage_start = self._start
+    
+    def __call__(self, stage, done=None, total=None):
+        now = time.perf_counter()
+        if stage != self._stage:
+            self._close_stage(now)
+            self._stage = stage
+            self._stage_start = now
+        if self.callback is not None:
+            event = {'stage': stage, 'done': done, 'total': total, 'elapsed': now - self._start}
+            if self.preview is not None:
+                event['preview'] = self.preview
+            self.callback(event)
+    
+    def _close_stage(self, now):
+        if self._stage is not None:
+            self.stage_seconds[self._stage] = self.stage_seconds.get(self._stage, 0) + now - self._stage_start
+    
+    def finish(self):
+        """Close the current stage and emit the final 'done' event"""
+        self("done")
+        self._stage = None
+        return self.stage_seconds
+
+
+def create_bm25_retriever(chunks, k=10):
+    """Lexical-only retriever over chunks (needs no embedding model)"""
+    index = BM25Index(chunks)
+    return BM25Retriever(index=index, k=k), index
+
+
+def stored_documents(vector_store):
+    """Documents of a FAISS store in index row order"""
+    return [
+        vector_store.docstore.search(vector_store.index_to_docstore_id[row])
+        for row in range(vector_store.index.ntotal)
+    ]
+
+
+def _fetch_and_chunk(video_id, chunk_size, chunk_overlap, progress):
+    """Transcript segments -> chunks; returns (chunks, transcript metadata)"""
+    progress("fetching")
+    success, segments, metadata = get_transcript_segments(video_id)
+    if not success:
+        raise RuntimeError(f"Failed to get transcript: {segments}")
+    
+    progress("chunking")
+    chunks = create_segment_chunks(segments, chunk_size, chunk_overlap, video_id=video_id)
+    metadata['chunks'] = len(chunks)
+    return chunks, metadata
+
+
+def build_video_retriever(video_id, chunk_size=800, chunk_overlap=100, use_cache=True, index_type=DEFAULT_INDEX_TYPE,
+                          progress=None, retrieval_mode=DEFAULT_RETRIEVAL_MODE, progressive=DEFAULT_PROGRESSIVE_INGEST):
+    """
+    Build (or load from the index cache) the retriever for one video
+    progress(stage, done=None, total=None, partial=None) is called as each stage starts
+    retrieval_mode: "dense", "bm25" or "hybrid" (see RETRIEVAL_MODES)
+    progressive builds the dense index batch by batch and passes the partial
+    retriever along with the embedding events (see create_progressive_vector_store)
+    Raises RuntimeError if the video has no transcript
+    Returns: (retriever, metadata)
+    """
+    progress = progress or (lambda stage, done=None, total=None, partial=None: None)
+    if retrieval_mode not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown retrieval mode: {retrieval_mode} (expected one of {', '.join(RETRIEVAL_MODES)})")
+    
+    if retrieval_mode == "bm25":
+        # Lexical only: cheap enough to rebuild, so the index cache is not used
+        chunks, metadata = _fetch_and_chunk(video_id, chunk_size, chunk_overlap, progress)
+        progress("indexing")
+        retriever, index = create_bm25_retriever(chunks)
+        metadata['cache_hit'] = False
+        metadata['retrieval_mode'] = retrieval_mode
+        metadata['index_type'] = "bm25"
+        metadata['index_vectors'] = 0
+        metadata['index_memory_bytes'] = index.memory_bytes()
+        return retriever, metadata
+    
+    index_key = make_index_key(video_id, chunk_size, chunk_overlap, EMBEDDING_MODEL_ID, index_type=index_type)
+    cached = None
+    if use_cache:
+        progress("loading")
+        cached = get_index_cache().load(index_key, get_embedding_model())
+    
+    if cached is not None:
+        # Cache hit: skip transcript, chunking and embedding entirely
+        vector_store, metadata = cached
+        apply_search_params(vector_store.index)
+        retriever = create_retriever(vector_store)
+        metadata['cache_hit'] = True
+    else:
+        # Steps 1-2: Get transcript and chunk it along segment boundaries
+        chunks, metadata = _fetch_and_chunk(video_id, chunk_size, chunk_overlap, progress)
+        
+        # Step 3: Create vector store and store it for next time
+        if progressive:
+            vector_store, retriever = create_progressive_vector_store(chunks, index_type=index_type, on_progress=progress)
+        else:
+            vector_store, retriever = create_vector_store(chunks, index_type=index_type, on_progress=progress)
+        if use_cache:
+            get_index_cache().save(index_key, vector_store, metadata)
+        metadata['cache_hit'] = False
+    
+    metadata.update(describe_index(vector_store.index))
+    embedding_stats = get_embedding_model_stats()
+    metadata['embedding_model'] = EMBEDDING_MODEL_ID
+    metadata['embedding_load_seconds'] = embedding_stats.get('load_seconds', 0)
+    metadata['embedding_warmup_seconds'] = embedding_stats.get('warmup_seconds', 0)
+    metadata['retrieval_mode'] = retrieval_mode
+    
+    if retrieval_mode == "hybrid":
+        # BM25 over the very same documents the dense index returns
+        progress("indexing")
+        lexical, index = create_bm25_retriever(stored_documents(vector_store))
+        retriever = HybridRetriever(lexical=lexical, dense=retriever)
+        metadata['lexical_memory_bytes'] = index.memory_bytes()
+    return retriever, metadata
+
+
+def retriever_documents(retriever):
+    """Every chunk a video retriever searches over, in transcript order"""
+    if isinstance(retriever, HybridRetriever):
+        retriever = retriever.lexical
+    if isinstance(retriever, BM25Retriever):
+        documents = list(retriever.index.documents)
+    else:
+        documents = stored_documents(retriever.vector_store)
+    return sorted(documents, key=lambda doc: doc.metadata.get('start_index') or 0)
+
+
+def _summary_artifact(model_name, temperature):
+    """Index cache artifact name of the summary tree for one LLM setting"""
+    raw = json.dumps([SUMMARY_VERSION, model_name, round(float(temperature), 3)], separators=(",", ":"))
+    return "summary-" + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def build_video_summary(retriever, model_name="gemini-2.5-flash-lite", temperature=0.2, index_key=None,
+                        progress=None):
+    """
+    Map-reduce summary tree of the video behind retriever
+    With an index_key the tree is stored with that cached index and loaded
+    from there next time (bm25 indexes are not cached, so theirs is rebuilt)
+    progress(stage, done, total) receives "summarizing" events per LLM call
+    Returns: tree dict (see summary_tree.build_summary_tree) plus 'cache_hit'
+    """
+    progress = progress or (lambda stage, done=None, total=None: None)
+    name = _summary_artifact(model_name, temperature)
+    if index_key is not None:
+        tree = get_index_cache().load_artifact(index_key, name)
+        if tree is not None and tree.get('version') == SUMMARY_VERSION:
+            return dict(tree, cache_hit=True)
+    
+    tree = build_summary_tree(
+        retriever_documents(retriever),
+        create_llm(model_name, temperature),
+        progress=lambda done, total: progress("summarizing", done, total)
+    )
+    if index_key is not None:
+        get_index_cache().save_artifact(index_key, name, tree)
+    return dict(tree, cache_hit=False)
+
+
+def get_index_registry():
+    """Return the process-wide registry of shared video indexes"""
+    global _index_registry
+    with _index_registry_lock:
+        if _index_registry is None:
+            _index_registry = IndexRegistry()
+    return _index_registry
+
+
+def process_video(video_id, chunk_size=800, chunk_overlap=100, model_name="gemini-2.5-flash-lite", temperature=0.2,
+                  use_cache=True, index_type=DEFAULT_INDEX_TYPE, progress_callback=None,
+                  retrieval_mode=DEFAULT_RETRIEVAL_MODE, summarize=DEFAULT_PRECOMPUTE_SUMMARY,
+                  progressive=DEFAULT_PROGRESSIVE_INGEST):
     """
     Complete function to process video and return RAG chain
+    A previously built index for the same video and chunking is loaded from
+    the on-disk cache instead of being rebuilt (disable with use_cache=False)
+    progress_callback receives a ProgressTracker event dict as each stage runs;
+    per-stage timings are returned in metadata['stage_seconds']
+    retrieval_mode "bm25" never loads the embedding model (and so also skips
+    the semantic answer cache: metadata['answer_cache_scope'] is None)
+    summarize also builds the map-reduce summary tree for summary-type
+    questions (metadata['summary_tree']; it is stored with the cached index).
+    A failed summary doesn't fail processing - see metadata['summary_error']
+    progressive embeds and indexes the video in batches; after the first one
+    the progress events carry a 'preview': {'main_chain', 'coverage'} whose
+    chain answers from the part indexed so far (coverage() says how much)
+    
+    With use_cache the index and chain are shared with every other caller
+    using the same video, chunking and LLM settings (so is the summary). Keep
+    metadata['index_lease'] while main_chain is in use and release() it
+    afterwards (or just drop it) so the shared index can be evicted.
     
     Returns: (success, main_chain, metadata, error_message)
     """
+    lease = None
     try:
-        # Step 1: Get transcript
-        success, transcript, metadata = get_transcript(video_id)
-        if not success:
-            return False, None, {}, f"Failed to get transcript: {transcript}"
+        progress = ProgressTracker(progress_callback)
+        build_kwargs = {'index_type': index_type, 'retrieval_mode': retrieval_mode, 'progressive': progressive}
+        
+        def on_progress(stage, done=None, total=None, partial=None):
+            if partial is not None and progress.preview is None:
+                progress.preview = {
+                    'main_chain': create_rag_chain(partial, model_name, temperature),
+                    'coverage': partial.coverage
+                }
+            progress(stage, done, total)
         
-        # Step 2: Create chunks
-        chunks = create_chunks(transcript, chunk_size, chunk_overlap)
-        metadata['chunks'] = len(chunks)
+        if use_cache:
+            index_key = make_index_key(video_id, chunk_size, chunk_overlap, EMBEDDING_MODEL_ID, index_type=index_type)
+            lease = get_index_registry().acquire(
+                (retrieval_mode, index_key),
+                lambda broadcast: build_video_retriever(
+                    video_id, chunk_size, chunk_overlap, progress=broadcast, **build_kwargs
+                ),
+                progress=on_progress
+            )
+            metadata = dict(lease.metadata, shared_index=lease.shared)
+            progress("chain")
+            main_chain = lease.chain(create_rag_chain, model_name, temperature)
+        else:
+            lease = None
+            retriever, metadata = build_video_retriever(
+                video_id, chunk_size, chunk_overlap, use_cache=False, progress=on_progress, **build_kwargs
+            )
+            metadata['shared_index'] = False
+            progress("chain")
+            main_chain = create_rag_chain(retriever, model_name, temperature)
         
-        # Step 3: Create vector store
-        vector_store, retriever = create_vector_store(chunks)
+        if summarize:
+            progress("summarizing")
+            try:
+                if lease is not None:
+                    metadata['summary_tree'] = lease.summary(
+                        lambda shared_retriever: build_video_summary(
+                            shared_retriever, model_name, temperature, index_key=index_key, progress=progress
+                        ),
+                        model_name, temperature,
+                        progress=lambda: progress("summarizing")
+                    )
+                else:
+                    metadata['summary_tree'] = build_video_summary(
+                        retriever, model_name, temperature, progress=progress
+                    )
+            except JobCancelled:
+                raise
+            except Exception as e:
+                # Optional stage: summary questions fall back to the RAG chain
+                metadata['summary_error'] = str(e)
         
-        # Step 4: Create RAG chain
-        main_chain = create_rag_chain(retriever, model_name, temperature)
+        if retrieval_mode == "bm25":
+            metadata['answer_cache_scope'] = None
+        else:
+            metadata['embedding_cache_hit_rate'] = get_embedding_store().stats()['hit_rate']
+            metadata['answer_cache_scope'] = make_answer_scope(
+                video_id, chunk_size, chunk_overlap, EMBEDDING_MODEL_ID, model_name, temperature, retrieval_mode,
+                index_type, DEFAULT_CONTEXT_TOKENS
+            )
+        metadata['index_lease'] = lease
+        metadata['stage_seconds'] = progress.finish()
         
         return True, main_chain, metadata, None
         
     except Exception as e:
+        # E.g. cancelled after the index was leased: nobody will get to release it
+        if lease is not None:
+            lease.release()
         return False, None, {}, str(e)
 
 
+def get_job_manager():
+    """Return the shared background job pool"""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager()
+    return _job_manager
+
+
+def submit_process_video(video_id, **kwargs):
+    """
+    Run process_video in the background job pool
+    Poll get_job_manager().status(job_id); once its state is "done",
+    get_job_manager().result(job_id, pop=True) hands over the usual
+    process_video tuple (so the job record doesn't keep the index lease alive)
+    Raises job_queue.JobQueueFull when too many jobs are already waiting
+    Returns: job ID
+    """
+    return get_job_manager().submit(process_video, video_id, name=f"process_video:{video_id}", **kwargs)
+
+
+
+def get_speculator():
+    """Return the shared pool and budget for speculative answers"""
+    global _speculator
+    with _speculator_lock:
+        if _speculator is None:
+            _speculator = Speculator()
+    return _speculator
+
+
+def speculate_answers(main_chain, questions, cache_scope=None):
+    """
+    Start answering likely questions in the background, before they are asked
+    Answers go through stream_answer, so they also land in the answer cache
+    for cache_scope. take() them from the returned batch when the question is
+    asked and cancel() it when the video is no longer shown
+    Returns: speculative.SpeculationBatch
+    """
+    return get_speculator().start(
+        lambda question, timings: stream_answer(main_chain, question, timings, cache_scope=cache_scope),
+        questions
+    )
+
+
 # ============================================================================
 # EXAMPLE USAGE - Test your code
 # ============================================================================
@@ -173,7 +1098,13 @@ if __name__ == "__main__":
     print("-" * 70)
     
     # Process the video
-    success, main_chain, metadata, error = process_video(video_id)
+    success, main_chain, metadata, error = process_video(
+        video_id,
+        progress_callback=lambda event: print(
+            f"   ⏳ {event['stage']:<10} {event['elapsed']:6.2f}s"
+            + (f"  ({event['done']}/{event['total']} chunks)" if event['total'] else "")
+        )
+    )
     
     if success:
         print(f"✅ Video processed successfully!")
@@ -181,6 +1112,11 @@ if __name__ == "__main__":
         print(f"   - Segments: {metadata.get('segments', 0)}")
         print(f"   - Words: {metadata.get('total_words', 0):,}")
         print(f"   - Chunks: {metadata.get('chunks', 0)}")
+        print(f"   - Index cache hit: {metadata.get('cache_hit', False)}")
+        print(f"   - Index: {metadata.get('index_type')} ({metadata.get('index_memory_bytes', 0) / 1024:.0f} KB)")
+        stage_times = ", ".join(f"{k} {v:.2f}s" for k, v in metadata.get('stage_seconds', {}).items())
+        print(f"   - Stage timings: {stage_times}")
+        print(f"   - Embedding model load: {metadata.get('embedding_load_seconds', 0):.2f}s")
         
         # Test some questions
         print("\n" + "=" * 70)
@@ -196,8 +1132,12 @@ if __name__ == "__main__":
         for i, question in enumerate(questions, 1):
             print(f"\n🙋 Question {i}: {question}")
             print("-" * 70)
-            answer = main_chain.invoke(question)
-            print(f"🤖 Answer: {answer}\n")
+            timings = {}
+            print("🤖 Answer: ", end="", flush=True)
+            for token in stream_answer(main_chain, question, timings):
+                print(token, end="", flush=True)
+            print(f"\n   ⚡ First token: {timings.get('time_to_first_token', 0):.2f}s"
+                  f" | Total: {timings.get('total_seconds', 0):.2f}s\n")
     else:
         print(f"❌ Error: {error}")
         print("\n💡 Tips:")